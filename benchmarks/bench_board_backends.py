@@ -0,0 +1,93 @@
+"""
+Compare the dataclass Board against the structure-of-arrays ArrayBoard.
+
+Reports bytes per live board (measured with tracemalloc over many boards holding a
+mid-game position) and per-operation latency.
+
+    python benchmarks/bench_board_backends.py [--boards N] [--repeat N]
+"""
+import argparse
+import contextlib
+import os
+import random
+import timeit
+import tracemalloc
+
+from rootgame.engine.array_board import ArrayBoard
+from rootgame.engine.board import Board
+from rootgame.engine.building import BuildingType
+from rootgame.engine.game import Game
+from rootgame.engine.types import FactionName
+
+BACKENDS = {"dataclass": Board, "array": ArrayBoard}
+
+
+def midgame_board(board_cls, seed: int, num_actions: int):
+    random.seed(seed)
+    game = Game(board=board_cls())
+    rng = random.Random(seed)
+    for _ in range(num_actions):
+        actions = list(game.iter_legal_actions())
+        if not actions or not game.deck.cards:
+            break
+        game.apply_action(rng.choice(actions))
+    return game.board
+
+
+def bytes_per_board(board_cls, snapshot, num_boards: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    boards = []
+    for _ in range(num_boards):
+        board = board_cls()
+        board.restore(snapshot)
+        boards.append(board)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / num_boards
+
+
+def operations(board):
+    marquise = FactionName.MARQUISE_DE_CAT
+
+    def build_and_rollback():
+        with board.what_if():
+            board.build(clearing_id=7, building_type=BuildingType.WORKSHOP, owner=marquise)
+
+    snapshot = board.snapshot()
+    return {
+        "add+remove warriors": lambda: (board.add_warriors_at_clearing(5, marquise, 2), board.remove_warriors_at_clearing(5, marquise, 2)),
+        "move there and back": lambda: (board.move_warriors(marquise, 1, 0, 1), board.move_warriors(marquise, 1, 1, 0)),
+        "build (what-if)": build_and_rollback,
+        "get_clearing_ruler": lambda: board.get_clearing_ruler(5),
+        "can_move": lambda: board.can_move(marquise, 1, 0, 1),
+        "export_clearing_info": board.export_clearing_info,
+        "snapshot": board.snapshot,
+        "restore": lambda: board.restore(snapshot),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--boards", type=int, default=10000, help="boards kept alive for the memory measurement")
+    parser.add_argument("--repeat", type=int, default=20000, help="iterations per operation")
+    parser.add_argument("--actions", type=int, default=150, help="random actions played to reach the measured position")
+    args = parser.parse_args()
+
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for (name, board_cls) in BACKENDS.items():
+            board = midgame_board(board_cls, seed=0, num_actions=args.actions)
+            memory = bytes_per_board(board_cls, board.snapshot(), args.boards)
+            timings = {op: timeit.timeit(fn, number=args.repeat) / args.repeat * 1e6 for (op, fn) in operations(board).items()}
+            results[name] = (memory, timings)
+
+    names = list(BACKENDS)
+    print(f"{'':>22}" + "".join(f"{name:>14}" for name in names))
+    print(f"{'bytes/board':>22}" + "".join(f"{results[name][0]:>14.0f}" for name in names))
+    for op in results[names[0]][1]:
+        print(f"{op + ' (us)':>22}" + "".join(f"{results[name][1][op]:>14.2f}" for name in names))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure MCTS playouts/sec, the search player's view of engine speed.
+
+Plays MCTS (Marquise) against random (Eyrie) for a number of decisions and reports playouts/sec
+per decision and overall, along with how many visits were carried over by tree reuse.
+
+    python benchmarks/bench_mcts.py [--decisions N] [--iterations N | --time-budget S]
+"""
+import argparse
+
+from rootgame.engine.game import Game
+from rootgame.sim.mcts import MCTSPlayer, is_game_over
+from rootgame.sim.policies import RandomPolicy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--decisions", type=int, default=20, help="MCTS decisions to time")
+    parser.add_argument("--iterations", type=int, default=200, help="playouts per decision")
+    parser.add_argument("--time-budget", type=float, default=None, help="seconds per decision (overrides --iterations)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = Game(seed=args.seed)
+    iterations = None if args.time_budget is not None else args.iterations
+    players = [MCTSPlayer(seed=args.seed, iterations=iterations, time_budget=args.time_budget), RandomPolicy(seed=args.seed)]
+    search = players[0]
+
+    decisions = 0
+    while decisions < args.decisions and not is_game_over(game):
+        player = players[game.current_player.seat]
+        action = player.choose_action(game)
+        if action is None:
+            break
+        if player is search:
+            decisions += 1
+            stats = search.last_search
+            print(f"decision {decisions:>3}: {stats.playouts:>5} playouts in {stats.duration * 1000:7.1f}ms "
+                  f"({stats.playouts_per_sec:7.1f}/s, {stats.reused_visits} visits reused)")
+        game.apply_action(action)
+
+    total = search.total
+    print(f"{total.playouts} playouts in {total.duration:.2f}s: {total.playouts_per_sec:.1f} playouts/sec, "
+          f"{total.reused_visits} visits reused")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare drawing every frame from scratch against the incremental board renderers.
+
+Plays one random game, capturing the clearing state before each action, then times rendering
+that sequence with a new AsciiBoardRenderer per frame (the cost before the edge layer was
+cached), with one incremental renderer, with its cursor-addressed diff output, and as SVG
+documents and overlays from SvgBoardRenderer.
+
+    python benchmarks/bench_renderer.py [--actions N] [--repeat N]
+"""
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from rootgame.cli.map_renderer import make_renderer
+from rootgame.cli.svg_renderer import SvgBoardRenderer
+from rootgame.engine.game import Game
+
+
+def capture_frames(seed: int, num_actions: int) -> tuple[list, list]:
+    game = Game(seed=seed)
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(num_actions):
+        frames.append(game.get_clearing_state())
+        actions = list(game.iter_legal_actions())
+        if not actions or not game.deck.cards:
+            break
+        game.apply_action(rng.choice(actions))
+    return (game.get_board_edges(), frames)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--actions", type=int, default=300, help="actions (frames) in the game")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the frames")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        (edges, frames) = capture_frames(args.seed, args.actions)
+
+    def full():
+        return sum(len(make_renderer(edges).render(info)) for info in frames)
+
+    def incremental():
+        renderer = make_renderer(edges)
+        return sum(len(renderer.render(info)) for info in frames)
+
+    def diff():
+        renderer = make_renderer(edges)
+        return sum(len(renderer.render_diff(info)) for info in frames)
+
+    def svg():
+        renderer = SvgBoardRenderer()
+        return sum(len(renderer.render(info)) for info in frames)
+
+    def svg_overlay():
+        renderer = SvgBoardRenderer()
+        return sum(len(renderer.render_overlay(info)) for info in frames)
+
+    for (name, run) in (("full redraw", full), ("incremental", incremental), ("cursor diffs", diff),
+                        ("svg", svg), ("svg overlay", svg_overlay)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            size = run()
+        duration = time.perf_counter() - start
+        count = len(frames) * args.repeat
+        print(f"{name:>12}: {count / duration:9.0f} frames/sec, {size / len(frames):7.0f} bytes/frame")
+
+
+if __name__ == "__main__":
+    main()
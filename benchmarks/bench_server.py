@@ -0,0 +1,84 @@
+"""
+Measure the game server on localhost: many games played concurrently by random clients.
+
+Starts a GameServer in-process, opens one client connection per seat of every game, and has
+each client play random legal actions on its turns. Reports actions/sec as seen by the
+clients and the server's per-action latency.
+
+    python benchmarks/bench_server.py [--games N] [--actions N] [--unix PATH]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from rootgame.server.client import GameClient
+from rootgame.server.game_server import GameServer
+
+
+async def play_seat(client: GameClient, game_id: str, seat: int, actions: int, rng: random.Random) -> int:
+    # Plays until the game has had `actions` actions or ends; the other seat's actions arrive as events
+    played = 0
+    seen = 0
+    await client.request("join", game=game_id, seat=seat)
+    while seen < actions:
+        legal = await client.request("legal", game=game_id, limit=32)
+        if legal["actions"]:
+            response = await client.request("act", game=game_id, action=rng.choice(legal["actions"]))
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+            played += 1
+            seen += 1
+            if response["view"]["finished"]:
+                break
+        else:
+            event = await client.events.get()
+            seen += 1
+            if event.get("finished"):
+                break
+    return played
+
+
+async def run(args) -> None:
+    server = GameServer()
+    if args.unix:
+        await server.start_unix(args.unix)
+        connect = lambda: GameClient.connect_unix(args.unix)
+    else:
+        listener = await server.start_tcp("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        connect = lambda: GameClient.connect_tcp("127.0.0.1", port)
+
+    lobby = await connect()
+    game_ids = [(await lobby.request("create", seed=args.seed + idx))["game"] for idx in range(args.games)]
+    clients = [await connect() for _ in range(2 * args.games)]
+
+    start = time.perf_counter()
+    played = await asyncio.gather(*[
+        play_seat(clients[2 * idx + seat], game_id, seat, args.actions, random.Random(args.seed * 1000 + 2 * idx + seat))
+        for (idx, game_id) in enumerate(game_ids) for seat in range(2)])
+    duration = time.perf_counter() - start
+
+    stats = await lobby.request("stats")
+    for client in [lobby, *clients]:
+        await client.close()
+    await server.close()
+
+    latency = stats["latency"]
+    print(f"{args.games} games, {sum(played)} actions in {duration:.2f}s: {sum(played) / duration:.1f} actions/sec")
+    print(f"server latency: mean {latency['mean_ms']:.3f}ms, p50 {latency['p50_ms']:.3f}ms, "
+          f"p99 {latency['p99_ms']:.3f}ms, max {latency['max_ms']:.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=100, help="concurrent games")
+    parser.add_argument("--actions", type=int, default=100, help="actions per game")
+    parser.add_argument("--unix", metavar="PATH", default=None, help="use a Unix socket instead of TCP")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare Game.snapshot()/Game.restore() against copy.deepcopy(Game).
+
+    python benchmarks/bench_snapshot.py [--actions N] [--repeat N]
+"""
+import argparse
+import contextlib
+import copy
+import os
+import random
+import timeit
+
+from rootgame.engine.game import Game
+
+
+def midgame(seed: int, num_actions: int) -> Game:
+    # Play random legal actions to get a realistically populated board, hands and log
+    random.seed(seed)
+    game = Game()
+    rng = random.Random(seed)
+    for _ in range(num_actions):
+        actions = list(game.iter_legal_actions())
+        if not actions or not game.deck.cards:
+            break
+        game.apply_action(rng.choice(actions))
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--actions", type=int, default=150, help="random actions played before measuring")
+    parser.add_argument("--repeat", type=int, default=2000, help="iterations per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game = midgame(args.seed, args.actions)
+
+    snapshot = game.snapshot()
+    timings = {
+        "deepcopy": timeit.timeit(lambda: copy.deepcopy(game), number=args.repeat),
+        "snapshot": timeit.timeit(game.snapshot, number=args.repeat),
+        "restore": timeit.timeit(lambda: game.restore(snapshot), number=args.repeat),
+        "snapshot+restore": timeit.timeit(lambda: game.restore(game.snapshot()), number=args.repeat),
+    }
+
+    print(f"Game after {args.actions} actions (round {game.round}), {args.repeat} iterations")
+    for (name, total) in timings.items():
+        per_call = total / args.repeat * 1e6
+        speedup = timings["deepcopy"] / total
+        print(f"{name:>18}: {per_call:8.1f} us/call  ({speedup:5.1f}x vs deepcopy)")
+
+
+if __name__ == "__main__":
+    main()
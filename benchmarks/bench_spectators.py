@@ -0,0 +1,175 @@
+"""
+Measure spectator fan-out on localhost: concurrent games watched by many spectators, some slow.
+
+Starts a GameServer in-process and plays random games on it, each watched by every spectator.
+Fast spectators read everything and rebuild each game from its deltas and keyframes, checked
+against the server's view at the end. Slow spectators read through a small socket buffer with
+a delay per message, so the server has to drop deltas for them and resync them with keyframes.
+Reports delta and keyframe sizes, fan-out throughput and what the slow spectators missed.
+
+    python benchmarks/bench_spectators.py [--games N] [--spectators N] [--slow N]
+"""
+import argparse
+import asyncio
+import random
+import socket
+import time
+
+from rootgame.server.client import GameClient
+from rootgame.server.game_server import GameServer
+from rootgame.server.protocol import decode_message, encode_message
+from rootgame.server.spectator import KEYFRAME_EVERY, apply_delta
+
+SLOW_RCVBUF = 4096
+SEND_BUFFER = 16384  # without a cap, loopback buffers megabytes and slow spectators never back up
+
+
+async def play_game(clients: list[GameClient], game_id: str, rng: random.Random) -> int:
+    # Both seats from one task: whoever's turn it is takes a random legal action
+    for (seat, client) in enumerate(clients):
+        await client.request("join", game=game_id, seat=seat)
+    played = 0
+    current = 0
+    while True:
+        legal = await clients[current].request("legal", game=game_id, limit=32)
+        if not legal["actions"]:
+            current = legal["current_seat"]
+            continue
+        response = await clients[current].request("act", game=game_id, action=rng.choice(legal["actions"]))
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        played += 1
+        view = response["view"]
+        if view["finished"]:
+            return played
+        current = view["current_seat"]
+
+
+async def fast_spectator(client: GameClient, game_ids: list[str], done: asyncio.Event) -> dict:
+    views = {}
+    seqs = {}
+    for game_id in game_ids:
+        response = await client.request("spectate", game=game_id)
+        (views[game_id], seqs[game_id]) = (response["view"], response["seq"])
+    gaps = 0
+    while not (done.is_set() and client.events.empty()):
+        try:
+            message = await asyncio.wait_for(client.events.get(), 0.1)
+        except asyncio.TimeoutError:
+            continue
+        game_id = message["game"]
+        seq = apply_delta(views[game_id], seqs[game_id], message)
+        gaps += seq is None
+        seqs[game_id] = seq
+    return {"views": views, "gaps": gaps}
+
+
+async def slow_spectator(connect_sock, game_ids: list[str], delay: float, done: asyncio.Event) -> dict:
+    sock = connect_sock()
+    (reader, writer) = await asyncio.open_connection(sock=sock)  # default limit, so the reader doesn't read far ahead
+    views = {}
+    seqs = {}
+    for game_id in game_ids:
+        writer.write(encode_message({"op": "spectate", "game": game_id}))
+    await writer.drain()
+    counts = {"delta": 0, "keyframe": 0, "resyncs": 0}
+    while True:
+        try:
+            line = await asyncio.wait_for(reader.readline(), 1.0 if done.is_set() else 30.0)
+        except asyncio.TimeoutError:
+            break
+        if not line:
+            break
+        message = decode_message(line)
+        if "event" not in message:
+            (views[message["game"]], seqs[message["game"]]) = (message["view"], message["seq"])
+            continue
+        counts[message["event"]] += 1
+        # Off-schedule keyframes are the server resyncing this spectator after dropping its deltas
+        counts["resyncs"] += message["event"] == "keyframe" and message["seq"] % KEYFRAME_EVERY != 0
+        game_id = message["game"]
+        seqs[game_id] = apply_delta(views[game_id], seqs[game_id], message)
+        if seqs[game_id] is None:
+            raise RuntimeError(f"slow spectator missed a delta of {game_id} without a keyframe")
+        await asyncio.sleep(delay)
+    writer.close()
+    return {"views": views, "seqs": seqs, **counts}
+
+
+async def run(args) -> None:
+    server = GameServer(send_buffer=args.send_buffer)
+    listener = await server.start_tcp("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+
+    def connect_slow_sock():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SLOW_RCVBUF)
+        sock.connect(("127.0.0.1", port))
+        sock.setblocking(False)
+        return sock
+
+    lobby = await GameClient.connect_tcp("127.0.0.1", port)
+    game_ids = [(await lobby.request("create", seed=args.seed + idx))["game"] for idx in range(args.games)]
+    players = [[await GameClient.connect_tcp("127.0.0.1", port) for _ in range(2)] for _ in game_ids]
+    watchers = [await GameClient.connect_tcp("127.0.0.1", port) for _ in range(args.spectators)]
+
+    done = asyncio.Event()
+    fast = [asyncio.create_task(fast_spectator(client, game_ids, done)) for client in watchers]
+    slow = [asyncio.create_task(slow_spectator(connect_slow_sock, game_ids, args.slow_delay, done)) for _ in range(args.slow)]
+    await asyncio.sleep(0.2)  # let everyone subscribe
+
+    start = time.perf_counter()
+    played = await asyncio.gather(*[play_game(clients, game_id, random.Random(args.seed * 1000 + idx))
+                                    for (idx, (clients, game_id)) in enumerate(zip(players, game_ids))])
+    duration = time.perf_counter() - start
+
+    # Every fast spectator's copy must match the server's view once it has read everything
+    finals = {game_id: (await lobby.request("observe", game=game_id))["view"] for game_id in game_ids}
+    for client in watchers:
+        await client.request("stats")  # the response comes after every event already sent to it
+    done.set()
+    fast_results = await asyncio.gather(*fast)
+    slow_results = await asyncio.gather(*slow)
+    mismatched = sum(result["views"][game_id] != finals[game_id] for result in fast_results for game_id in game_ids)
+
+    stats = {game_id: await lobby.request("stats", game=game_id) for game_id in game_ids}
+    feeds = [stats[game_id]["feed"] for game_id in game_ids]
+    # Slow spectators end wherever they were last resynced; those that reached the end must match too
+    current = [(result["views"][game_id], game_id) for result in slow_results for game_id in game_ids
+               if result["seqs"][game_id] == stats[game_id]["seq"]]
+    slow_mismatched = sum(view != finals[game_id] for (view, game_id) in current)
+    for client in [lobby, *watchers, *(client for clients in players for client in clients)]:
+        await client.close()
+    await server.close()
+
+    deltas = sum(feed["deltas"] for feed in feeds)
+    delta_bytes = sum(feed["mean_delta_bytes"] * feed["deltas"] for feed in feeds)
+    keyframe_bytes = sum(feed["mean_keyframe_bytes"] * feed["keyframes"] for feed in feeds) / max(1, sum(feed["keyframes"] for feed in feeds))
+    sent = sum(feed["sent"] for feed in feeds)
+    print(f"{args.games} games, {sum(played)} actions in {duration:.2f}s, "
+          f"{args.spectators} fast + {args.slow} slow spectators: {sent / duration:.0f} messages/sec sent")
+    print(f"delta: {delta_bytes / max(1, deltas):.0f} bytes mean vs keyframe {keyframe_bytes:.0f} bytes "
+          f"({keyframe_bytes * max(1, deltas) / max(1, delta_bytes):.1f}x smaller)")
+    print(f"fast spectators: {sum(result['gaps'] for result in fast_results)} gaps, "
+          f"{mismatched} of {len(fast_results) * len(game_ids)} final views differ from the server")
+    if slow_results:
+        print(f"slow spectators: {sum(feed['dropped'] for feed in feeds)} messages dropped by the server, "
+              f"read {sum(r['delta'] for r in slow_results)} deltas and {sum(r['keyframe'] for r in slow_results)} keyframes, "
+              f"{sum(r['resyncs'] for r in slow_results)} resyncs; {len(current)} of {len(slow_results) * len(game_ids)} "
+              f"views current at the end, {slow_mismatched} differ from the server")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=10, help="concurrent games")
+    parser.add_argument("--spectators", type=int, default=50, help="fast spectators, each watching every game")
+    parser.add_argument("--slow", type=int, default=5, help="slow spectators, each watching every game")
+    parser.add_argument("--slow-delay", type=float, default=0.005, help="seconds a slow spectator takes per message")
+    parser.add_argument("--send-buffer", type=int, default=SEND_BUFFER, help="server socket send buffer per connection, in bytes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
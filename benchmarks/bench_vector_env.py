@@ -0,0 +1,61 @@
+"""
+Measure VectorEnv throughput: game steps/sec for batches of games stepped in lockstep.
+
+Each step picks a uniformly random legal action index for every game from the legal-action
+masks, so the time covers applying actions, auto-resets, observation encoding and masks.
+Also prints the memory the masks take: the fixed space needs ~48 KB per game (~196 MB at
+N=4096), the legal-list space (--space legal) a few hundred bytes.
+
+    python benchmarks/bench_vector_env.py [--sizes 1 64 4096] [--steps N] [--workers N] [--space fixed|legal]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from rootgame.sim.action_space import DiscreteActionSpace
+from rootgame.sim.vector_env import LegalListActionSpace, make_vector_env
+
+SPACES = {"fixed": DiscreteActionSpace, "legal": LegalListActionSpace}
+
+
+def random_legal_actions(masks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    # One uniformly chosen legal index per row, without materializing anything mask-sized
+    (rows, cols) = np.nonzero(masks)
+    counts = np.bincount(rows, minlength=len(masks))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return cols[starts + (rng.random(len(masks)) * counts).astype(np.int64)]
+
+
+def bench(num_games: int, steps: int, workers: int, seed: int, space: str) -> tuple[float, int, int]:
+    rng = np.random.default_rng(seed)
+    with make_vector_env(num_games, num_workers=workers, seed=seed, action_space=SPACES[space]()) as env:
+        (_obs, masks) = env.reset()
+        mask_bytes = masks.nbytes
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(steps):
+            (_obs, _rewards, dones, masks) = env.step(random_legal_actions(masks, rng))
+            episodes += int(dones.sum())
+        duration = time.perf_counter() - start
+    return (num_games * steps / duration, episodes, mask_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 64, 4096], help="batch sizes (games per env)")
+    parser.add_argument("--steps", type=int, default=None, help="steps per size (default: about 20k game steps, at least 5)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes to shard each env over")
+    parser.add_argument("--space", choices=sorted(SPACES), default="fixed", help="fixed action space or the first legal actions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_games in args.sizes:
+        steps = args.steps if args.steps is not None else max(5, 20000 // num_games)
+        (steps_per_sec, episodes, mask_bytes) = bench(num_games, steps, args.workers, args.seed, args.space)
+        print(f"N={num_games:>5}: {steps} steps, {steps_per_sec:9.1f} game steps/sec, {episodes} games finished, "
+              f"masks {mask_bytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Check the engine's state-tracking invariants under seeded random play, on both board backends.
+
+After every action of every game:
+  - undo restores the snapshot (including RNG and dice state) and Zobrist hash exactly, and
+    replaying the action then reaches the same state again
+  - the incremental Zobrist hashes of the game and board equal their from-scratch values
+  - changes_since reports every clearing field that really changed, for the action and its undo
+  - no what-if is left open
+Exits non-zero on the first violation.
+
+    python benchmarks/check_invariants.py [--games N] [--actions N] [--seed N]
+"""
+import argparse
+import random
+import sys
+import time
+
+from rootgame.engine.array_board import ArrayBoard
+from rootgame.engine.board import CLEARING_FIELDS, Board, ClearingField
+from rootgame.engine.game import Game
+from rootgame.engine.rng import derive_seed
+from rootgame.sim.mcts import is_game_over
+
+
+def clearing_fields(board) -> list[tuple]:
+    # Each clearing's fields in CLEARING_FIELDS order, built from the public exports rather than the backend's internals
+    fields = []
+    for (clearing_id, info) in board.export_clearing_info().items():
+        fields.append(({faction: count for (faction, count) in info.warriors.items() if count},
+                       list(info.tiles),
+                       {faction: sorted(tokens) for (faction, tokens) in info.tokens.items() if tokens},
+                       board.get_clearing_ruler(clearing_id)))
+    return fields
+
+
+def check_changes(board, version: int, before: list[tuple], after: list[tuple], context: str) -> None:
+    # Changes that were undone again may be reported too, so only missing reports are errors
+    changes = board.changes_since(version)
+    for (clearing_id, (old, new)) in enumerate(zip(before, after)):
+        for (field, old_value, new_value) in zip(CLEARING_FIELDS, old, new):
+            if(old_value != new_value and not field & changes.get(clearing_id, ClearingField(0))):
+                raise AssertionError(f"{context}: {field.name} of clearing {clearing_id} changed but changes_since missed it")
+
+
+def check_game(factory, seed: int, num_actions: int) -> int:
+    game = Game(board=factory(), seed=seed)
+    board = game.board
+    rng = random.Random(seed)
+    for step in range(num_actions):
+        if(is_game_over(game)):
+            return step
+        action = game.sample_legal_action(rng)
+        if(action is None):
+            return step
+        context = f"{factory.__name__} seed={seed} step={step} {action!r}"
+
+        snapshot = game.snapshot()
+        zobrist = game.zobrist
+        fields = clearing_fields(board)
+        version = board.version
+
+        record = game.apply_action(action, record_undo=True)
+        applied = game.snapshot()
+        applied_fields = clearing_fields(board)
+        check_changes(board, version, fields, applied_fields, context)
+        if(game.zobrist != game.compute_zobrist() or board.zobrist != board.compute_zobrist()):
+            raise AssertionError(f"{context}: incremental Zobrist hash differs from compute_zobrist")
+        if(board.what_if_depth or board.journal is not None):
+            raise AssertionError(f"{context}: a what-if was left open")
+
+        version = board.version
+        game.undo(record)
+        check_changes(board, version, applied_fields, clearing_fields(board), f"{context} (undo)")
+        if(game.snapshot() != snapshot or game.zobrist != zobrist):
+            raise AssertionError(f"{context}: undo did not restore the state exactly")
+
+        game.apply_action(action)
+        if(game.snapshot() != applied):
+            raise AssertionError(f"{context}: replaying the action after undo reached a different state")
+    return num_actions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=10, help="games per board backend")
+    parser.add_argument("--actions", type=int, default=400, help="actions per game at most")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i is seeded from it")
+    args = parser.parse_args()
+
+    for factory in (Board, ArrayBoard):
+        start = time.perf_counter()
+        try:
+            checked = sum(check_game(factory, derive_seed(args.seed, game_index), args.actions) for game_index in range(args.games))
+        except AssertionError as error:
+            print(f"FAILED {error}")
+            sys.exit(1)
+        print(f"{factory.__name__:>10}: {args.games} games, {checked} actions checked in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, TextIO
+
+from rootgame.cli.map_renderer import AsciiBoardRenderer, make_renderer
+from rootgame.engine.game import Game
+from rootgame.engine.replay import replay_log
+from rootgame.sim.runner import run_jobs
+from rootgame.shared.shared_types import ClearingInfo
+
+# Renders recorded games (the binary logs from `rootgame-sim --record`) as ASCII map frames.
+#
+# Text files hold the frames in order, each under a one-line status header:
+#
+#   --- frame 3 | action 41 | round 2 | eyrie_dynasties DAYLIGHT
+#   <map>
+#
+# Casts are asciicast v2: a JSON header line, then one [seconds, "o", data] event per frame, the
+# frames `interval` seconds apart. The first event draws the whole screen; the rest only rewrite
+# the status line and the map cells that changed (AsciiBoardRenderer.render_diff).
+
+GRANULARITIES = ("action", "phase", "round")
+FORMATS = {"text": ".txt", "cast": ".cast"}
+STATUS_ROWS = 1  # rows above the map in casts
+
+
+def frame_key(game: Game, granularity: str) -> object:
+    # A frame is rendered whenever this changes; None renders every state
+    if granularity == "round":
+        return game.round
+    if granularity == "phase":
+        return (game.round, game.current_player.seat, game.current_phase)
+    return None
+
+
+def status_line(game: Game, frame: int, actions: int) -> str:
+    return (f"frame {frame} | action {actions} | round {game.round} | "
+            f"{game.current_player.faction.faction_name.value} {game.current_phase.name}")
+
+
+@dataclass
+class ExportResult:
+    source: str
+    output: str
+    frames: int = 0
+    actions: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class ExportReport:
+    results: list[ExportResult] = field(default_factory=list)
+    workers: int = 1
+    wall_time: float = 0.0
+
+    @property
+    def total_frames(self) -> int:
+        return sum(result.frames for result in self.results)
+
+    @property
+    def frames_per_sec(self) -> float:
+        return self.total_frames / self.wall_time if self.wall_time else 0.0
+
+
+# ----------------------------
+# Frame writers
+# ----------------------------
+
+class ClearingStateCache:
+    """A game's clearing state, re-exported only for the clearings the board reports changed."""
+
+    def __init__(self, game: Game) -> None:
+        self.game = game
+        self.version = game.board.version
+        self.info: Dict[int, ClearingInfo] = game.get_clearing_state()
+
+    def refresh(self) -> Dict[int, ClearingInfo]:
+        changes = self.game.board.changes_since(self.version)
+        if changes:
+            self.info.update(self.game.get_clearing_state(changes))
+        self.version = self.game.board.version
+        return self.info
+
+
+class TextFrameWriter:
+    def __init__(self, out: TextIO, renderer: AsciiBoardRenderer) -> None:
+        self.out = out
+        self.renderer = renderer
+
+    def write(self, game: Game, info: Dict[int, ClearingInfo], frame: int, actions: int) -> None:
+        self.out.write(f"--- {status_line(game, frame, actions)}\n")
+        self.out.write(self.renderer.render(info))
+        self.out.write("\n\n")
+
+
+class CastFrameWriter:
+    def __init__(self, out: TextIO, renderer: AsciiBoardRenderer, interval: float, title: str) -> None:
+        self.out = out
+        self.renderer = renderer
+        self.interval = interval
+        header = {"version": 2, "width": renderer.width, "height": STATUS_ROWS + renderer.height + 1, "title": title}
+        out.write(json.dumps(header) + "\n")
+
+    def write(self, game: Game, info: Dict[int, ClearingInfo], frame: int, actions: int) -> None:
+        bottom = STATUS_ROWS + self.renderer.height + 1
+        data = (self.renderer.render_diff(info, top=STATUS_ROWS + 1)
+                + f"\x1b[1;1H\x1b[2K{status_line(game, frame, actions)}\x1b[{bottom};1H")
+        self.out.write(json.dumps([round(frame * self.interval, 3), "o", data]) + "\n")
+
+
+# ----------------------------
+# Single game
+# ----------------------------
+
+def export_log(source: str, output: str, granularity: str = "action", fmt: str = "text", interval: float = 0.5, verify: bool = False) -> ExportResult:
+    """
+    Replay the binary log at `source` and write its frames to `output`.
+
+    A frame is rendered for the starting position and then, by `granularity`, after every
+    action, at the start of every phase (a new round, seat or turn phase), or at the start of
+    every round. The final position always gets a frame. With `verify`, the replay checks the
+    log's legality, checkpoints and scores as replay_log does.
+    """
+    result = ExportResult(source=source, output=output)
+    start = time.perf_counter()
+    with open(source, "rb") as stream, open(output, "w") as out:
+        writer = None
+        clearings: ClearingStateCache | None = None
+        last_key = None
+        states = 0  # states replayed so far, so the one on_state gets follows states - 1 actions
+        pending: Game | None = None  # the latest state, if it hasn't had a frame yet
+
+        def emit(game: Game) -> None:
+            nonlocal writer, clearings
+            if writer is None:
+                renderer = make_renderer(game.get_board_edges())
+                if fmt == "cast":
+                    writer = CastFrameWriter(out, renderer, interval, os.path.basename(source))
+                else:
+                    writer = TextFrameWriter(out, renderer)
+                clearings = ClearingStateCache(game)
+            writer.write(game, clearings.refresh(), result.frames, states - 1)
+            result.frames += 1
+
+        def on_state(game: Game) -> None:
+            nonlocal last_key, states, pending
+            states += 1
+            key = frame_key(game, granularity)
+            if result.frames == 0 or key is None or key != last_key:
+                emit(game)
+                last_key = key
+                pending = None
+            else:
+                pending = game
+
+        replay = replay_log(stream, verify=verify, on_state=on_state)
+        if pending is not None:
+            emit(pending)
+        result.actions = replay.actions
+    result.duration = time.perf_counter() - start
+    return result
+
+
+def _export_log_args(args: tuple) -> ExportResult:
+    return export_log(*args)
+
+
+# ----------------------------
+# Parallel driver
+# ----------------------------
+
+def find_logs(paths: list[str]) -> list[str]:
+    # Files as given; directories contribute their .rgl files
+    logs = []
+    for path in paths:
+        if os.path.isdir(path):
+            logs.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith(".rgl"))
+        else:
+            logs.append(path)
+    return logs
+
+
+def export_logs(
+    sources: list[str],
+    output_dir: str,
+    granularity: str = "action",
+    fmt: str = "text",
+    interval: float = 0.5,
+    verify: bool = False,
+    workers: int | None = None,
+    on_result=None,
+) -> ExportReport:
+    """
+    Export each log to `output_dir` (named after the log, with .txt or .cast) across a process
+    pool, one worker per core by default. `on_result` is called with each ExportResult as it is done.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [(source, os.path.join(output_dir, os.path.splitext(os.path.basename(source))[0] + FORMATS[fmt]),
+             granularity, fmt, interval, verify) for source in sources]
+    report = ExportReport(workers=workers)
+
+    start = time.perf_counter()
+    report.results = run_jobs(_export_log_args, jobs, workers, on_result)
+    report.wall_time = time.perf_counter() - start
+
+    return report
+
+
+def format_report(report: ExportReport) -> str:
+    return "\n".join([
+        f"Games:       {len(report.results)} on {report.workers} worker(s)",
+        f"Frames:      {report.total_frames}",
+        f"Wall time:   {report.wall_time:.2f}s",
+        f"Frames/sec:  {report.frames_per_sec:.1f}",
+    ])
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="rootgame-frames", description="Render recorded games as ASCII map frames.")
+    parser.add_argument("logs", nargs="+", help="binary logs, or directories of them")
+    parser.add_argument("-o", "--output", default="frames", help="directory to write the frames to")
+    parser.add_argument("--every", choices=GRANULARITIES, default="action", help="how often to render a frame")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="text", help="text frames or an asciicast stream")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between frames in casts")
+    parser.add_argument("--verify", action="store_true", help="check each log while replaying it")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    on_result = None if args.quiet else (
+        lambda result: print(f"{result.source} -> {result.output}: {result.frames} frames, "
+                             f"{result.actions} actions, {result.duration * 1000:.1f}ms", flush=True))
+    report = export_logs(
+        find_logs(args.logs),
+        args.output,
+        granularity=args.every,
+        fmt=args.format,
+        interval=args.interval,
+        verify=args.verify,
+        workers=args.workers,
+        on_result=on_result,
+    )
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,9 @@ def main():
                 print(f"{j}: {action}")
 
             chosen_action = None
-            while(not(game.is_action_legal(chosen_action))):
+            while(not(legality := game.is_action_legal(chosen_action))):
+                if(chosen_action is not None):
+                    print(f"Illegal action: {legality.message}")
                 chosen_action = input(f"Choose an action: ")
 
                 if(chosen_action == "END PHASE"):
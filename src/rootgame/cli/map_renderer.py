@@ -57,20 +57,119 @@ class AsciiBoardRenderer:
         self.positions = positions
         self.edges = {self._norm_edge(a, b) for a, b in edges}
 
-    def render(self, info_by_clearing: Dict[int, ClearingInfo]) -> str:
-        canvas = [[" " for _ in range(self.width)] for _ in range(self.height)]
+        # The edges never change, so they are drawn once; frames are this layer with the node
+        # boxes on top, and only boxes whose clearing changed are redrawn
+        self._canvas = self._draw_edges()
+        self._rows = ["".join(row).rstrip() for row in self._canvas]
+        self._stale_rows: set = set()  # canvas rows redrawn since render() last rebuilt them
+        self._node_keys: Dict[int, tuple] = {}  # node_id -> what its box currently shows
+        self._node_lines: Dict[int, List[str]] = {}
+        self._overlapped_by = self._find_overlaps()
+
+        # Cursor-addressed output: the canvas as last sent, and the columns redrawn since in each row
+        self._shown: Optional[List[List[str]]] = None
+        self._touched: Dict[int, Tuple[int, int]] = {}
 
-        # 1) edges first
-        for a, b in sorted(self.edges):
-            self._draw_edge(canvas, a, b)
+    def render(self, info_by_clearing: Dict[int, ClearingInfo]) -> str:
+        self._update(info_by_clearing)
+        for y in self._stale_rows:
+            self._rows[y] = "".join(self._canvas[y]).rstrip()
+        self._stale_rows.clear()
+        return "\n".join(self._rows).rstrip()
 
-        # 2) nodes second (nodes overwrite edge artifacts inside their boxes)
-        for node_id, (x, y) in self.positions.items():
+    def render_diff(self, info_by_clearing: Dict[int, ClearingInfo], top: int = 1) -> str:
+        """
+        Terminal escapes that turn the frame last produced by render_diff into this one, moving
+        the cursor to and rewriting only the changed cells; the map's first row is terminal
+        row `top`. The first call (and the first after reset_diff) clears the screen and draws
+        the whole map. The cursor is left on the line below the map.
+        """
+        self._update(info_by_clearing)
+        out: List[str] = []
+        if self._shown is None:
+            out.append("\x1b[2J")
+            for y, row in enumerate(self._canvas):
+                text = "".join(row).rstrip()
+                if text:
+                    out.append(f"\x1b[{top + y};1H{text}")
+            self._shown = [row[:] for row in self._canvas]
+        else:
+            for y, (lo, hi) in sorted(self._touched.items()):
+                old, new = self._shown[y], self._canvas[y]
+                for x0, x1 in self._changed_runs(old[lo:hi], new[lo:hi]):
+                    out.append(f"\x1b[{top + y};{lo + x0 + 1}H{''.join(new[lo + x0:lo + x1])}")
+                old[lo:hi] = new[lo:hi]
+        self._touched.clear()
+        if out:
+            out.append(f"\x1b[{top + self.height};1H")
+        return "".join(out)
+
+    def reset_diff(self) -> None:
+        """Make the next render_diff redraw the whole screen, e.g. after other output."""
+        self._shown = None
+        self._touched.clear()
+
+    def _update(self, info_by_clearing: Dict[int, ClearingInfo]) -> None:
+        """Redraw the node boxes whose clearing changed, noting the rows touched for both render and render_diff."""
+        redraw: set = set()
+        for node_id in self.positions:
             info = info_by_clearing.get(node_id, ClearingInfo())
-            lines = self._format_node_lines(node_id, info)
-            self._draw_node(canvas, x, y, lines)
+            key = self._node_key(info)
+            if self._node_keys.get(node_id) != key:
+                self._node_keys[node_id] = key
+                self._node_lines[node_id] = self._format_node_lines(node_id, info)
+                redraw.add(node_id)
+                # a box drawn over this one has to be drawn over it again
+                redraw.update(self._overlapped_by[node_id])
+
+        for node_id in self.positions:  # in drawing order
+            if node_id in redraw:
+                x, y = self.positions[node_id]
+                rows = self._draw_node(self._canvas, x, y, self._node_lines[node_id])
+                for row in rows:
+                    lo, hi = self._touched.get(row, (x, x + self.NODE_W))
+                    self._touched[row] = (min(lo, x), max(hi, x + self.NODE_W))
+                self._stale_rows.update(rows)
+
+    @staticmethod
+    def _node_key(info: ClearingInfo) -> tuple:
+        # Exactly what a node box shows; a snapshot, since the info may share lists with the board
+        return (
+            info.suit,
+            tuple(sorted(info.warriors.items())),
+            tuple(info.tiles),
+            tuple(sorted((name, len(items)) for name, items in info.tokens.items())),
+        )
+
+    def _find_overlaps(self) -> Dict[int, List[int]]:
+        # node_id -> the nodes drawn after it whose boxes cover part of its box
+        order = list(self.positions)
+        overlaps: Dict[int, List[int]] = {node_id: [] for node_id in order}
+        for i, a in enumerate(order):
+            ax0, ay0, ax1, ay1 = self._node_rect(a)
+            for b in order[i + 1:]:
+                bx0, by0, bx1, by1 = self._node_rect(b)
+                if ax0 <= bx1 and bx0 <= ax1 and ay0 <= by1 and by0 <= ay1:
+                    overlaps[a].append(b)
+        return overlaps
 
-        return "\n".join("".join(row).rstrip() for row in canvas).rstrip()
+    @staticmethod
+    def _changed_runs(old: List[str], new: List[str], gap: int = 4) -> List[Tuple[int, int]]:
+        # [x0, x1) spans of differing cells; runs closer than `gap` are merged, as rewriting a few
+        # unchanged cells is shorter than another cursor move
+        runs: List[Tuple[int, int]] = []
+        start = last = -1
+        for x, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                if start >= 0 and x - last > gap:
+                    runs.append((start, last + 1))
+                    start = -1
+                if start < 0:
+                    start = x
+                last = x
+        if start >= 0:
+            runs.append((start, last + 1))
+        return runs
 
     # ---------------- Node formatting ----------------
 
@@ -113,17 +212,23 @@ class AsciiBoardRenderer:
             bottom,
         ]
 
-    def _draw_node(self, canvas: List[List[str]], x: int, y: int, lines: List[str]) -> None:
+    def _draw_node(self, canvas: List[List[str]], x: int, y: int, lines: List[str]) -> range:
         if x < 0 or y < 0:
-            return
+            return range(0)
         if x + self.NODE_W > self.width or y + self.NODE_H > self.height:
-            return
+            return range(0)
         for dy, line in enumerate(lines):
-            for dx, ch in enumerate(line):
-                canvas[y + dy][x + dx] = ch
+            canvas[y + dy][x:x + len(line)] = line
+        return range(y, y + len(lines))
 
     # ---------------- Edges ----------------
 
+    def _draw_edges(self) -> List[List[str]]:
+        canvas = [[" " for _ in range(self.width)] for _ in range(self.height)]
+        for a, b in sorted(self.edges):
+            self._draw_edge(canvas, a, b)
+        return canvas
+
     def _draw_edge(self, canvas: List[List[str]], a: int, b: int) -> None:
         a_rect = self._node_rect(a)
         b_rect = self._node_rect(b)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from rootgame.cli.map_renderer import POSITIONS
+from rootgame.engine.board import AUTUMN_BOARD_BUILDING_LIMITS, AUTUMN_BOARD_EDGES, AUTUMN_BOARD_SUITS
+from rootgame.shared.shared_types import ClearingInfo
+
+
+# ----------------------------
+# Style
+# ----------------------------
+
+# POSITIONS are top-left character cells of the ASCII node boxes; a box's centre cell maps to
+# CELL_W x CELL_H pixels
+CELL_W = 10
+CELL_H = 20
+NODE_CENTER = (8, 3)  # centre cell of a 17x7 ASCII box
+RADIUS = 46
+MARGIN = 24
+SLOT = 20  # building slot side
+PIECE_GAP = 4
+
+SUIT_COLOURS = {"fox": "#d9534f", "rabbit": "#f0c419", "mouse": "#f0883e", "bird": "#5bc0de"}
+FACTION_COLOURS = {"M": "#e07b24", "E": "#2f6db5"}
+BUILDING_LABELS = {"sawmill": "S", "workshop": "W", "recruiter": "R", "roost": "N"}
+BUILDING_OWNERS = {"sawmill": "M", "workshop": "M", "recruiter": "M", "roost": "E"}
+TOKEN_LABELS = {"keep": "K", "wood": "w"}
+
+STYLE = (
+    "<style>"
+    ".edge{stroke:#6b5b45;stroke-width:6}"
+    ".clearing{stroke:#3b3024;stroke-width:3}"
+    ".slot{fill:#fffaf0;stroke:#3b3024;stroke-width:1.5}"
+    ".label{font:bold 14px sans-serif;fill:#3b3024;text-anchor:middle}"
+    ".piece{font:bold 11px sans-serif;fill:#fff;text-anchor:middle;dominant-baseline:central}"
+    + "".join(f".f{owner}{{fill:{colour}}}" for owner, colour in FACTION_COLOURS.items())
+    + ".fX{fill:#777}"
+    "</style>"
+)
+
+
+def row_offsets(count: int, size: int) -> List[float]:
+    # Left edges of `count` pieces of width `size`, centred on 0
+    total = count * size + (count - 1) * PIECE_GAP
+    return [-total / 2 + i * (size + PIECE_GAP) for i in range(count)]
+
+
+# ----------------------------
+# SVG Renderer
+# ----------------------------
+
+class SvgBoardRenderer:
+    """
+    The board as SVG, showing what AsciiBoardRenderer shows: each clearing's suit, warriors,
+    buildings and tokens, on the same layout.
+
+    Everything that never changes (edges, clearing shapes in their suit colours, building-slot
+    outlines, clearing numbers) is laid out once, into `static_layer`. A frame adds only the
+    overlay of pieces, built per clearing and cached until that clearing changes, so rendering
+    a frame for many viewers is string concatenation.
+    """
+
+    def __init__(
+        self,
+        positions: Dict[int, Tuple[int, int]] = POSITIONS,
+        edges: Iterable[Tuple[int, int]] = AUTUMN_BOARD_EDGES,
+        suits: Sequence[str] = AUTUMN_BOARD_SUITS,
+        building_limits: Sequence[int] = AUTUMN_BOARD_BUILDING_LIMITS,
+    ) -> None:
+        self.centers = {
+            node_id: ((x + NODE_CENTER[0]) * CELL_W, (y + NODE_CENTER[1]) * CELL_H)
+            for node_id, (x, y) in positions.items()
+        }
+        self.edges = sorted({(a, b) if a <= b else (b, a) for a, b in edges})
+        self.suits = suits
+        self.building_limits = building_limits
+        self.width = max(cx for cx, _ in self.centers.values()) + RADIUS + MARGIN
+        self.height = max(cy for _, cy in self.centers.values()) + RADIUS + MARGIN
+
+        self.static_layer = self._build_static_layer()
+        self._head = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {self.width} {self.height}" '
+            f'width="{self.width}" height="{self.height}">' + STYLE + self.static_layer
+        )
+        self._fragments: Dict[int, Tuple[tuple, str]] = {}  # node_id -> (key, overlay of that clearing)
+
+    def render(self, info_by_clearing: Dict[int, ClearingInfo]) -> str:
+        """A complete SVG document for this frame."""
+        return self._head + self.render_overlay(info_by_clearing) + "</svg>"
+
+    def render_overlay(self, info_by_clearing: Dict[int, ClearingInfo]) -> str:
+        """Only the pieces, as one <g>, for clients that already hold the static layer."""
+        parts = []
+        for node_id in self.centers:
+            info = info_by_clearing.get(node_id, ClearingInfo())
+            key = self._clearing_key(info)
+            cached = self._fragments.get(node_id)
+            if cached is None or cached[0] != key:
+                cached = (key, self._format_pieces(node_id, key))
+                self._fragments[node_id] = cached
+            parts.append(cached[1])
+        return '<g class="overlay">' + "".join(parts) + "</g>"
+
+    def render_html(self, info_by_clearing: Dict[int, ClearingInfo], title: str = "Root") -> str:
+        return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{title}</title></head>"
+                f"<body>{self.render(info_by_clearing)}</body></html>")
+
+    # ---------------- Static layer ----------------
+
+    def _build_static_layer(self) -> str:
+        parts = ['<g class="static">']
+        for a, b in self.edges:
+            (ax, ay), (bx, by) = self.centers[a], self.centers[b]
+            parts.append(f'<line class="edge" x1="{ax}" y1="{ay}" x2="{bx}" y2="{by}"/>')
+
+        for node_id, (cx, cy) in self.centers.items():
+            suit = str(self.suits[node_id]) if node_id < len(self.suits) else ""
+            colour = SUIT_COLOURS.get(suit, "#ddd")
+            parts.append(f'<circle class="clearing" cx="{cx}" cy="{cy}" r="{RADIUS}" fill="{colour}"/>')
+            parts.append(f'<text class="label" x="{cx}" y="{cy - RADIUS - 6}">{node_id:02d} {suit.upper()}</text>')
+            limit = self.building_limits[node_id] if node_id < len(self.building_limits) else 0
+            for left in row_offsets(limit, SLOT):
+                parts.append(f'<rect class="slot" x="{cx + left:g}" y="{cy - 30}" width="{SLOT}" height="{SLOT}" rx="3"/>')
+        parts.append("</g>")
+        return "".join(parts)
+
+    # ---------------- Overlay ----------------
+
+    @staticmethod
+    def _clearing_key(info: ClearingInfo) -> tuple:
+        # What the overlay of a clearing shows; a snapshot, since the info may share lists with the board
+        return (
+            tuple(sorted((owner, count) for owner, count in info.warriors.items() if count)),
+            tuple(str(tile) for tile in info.tiles),
+            tuple(sorted((owner, str(token), count)
+                         for owner, tokens in info.tokens.items()
+                         for token, count in Counter(tokens).items())),
+        )
+
+    def _format_pieces(self, node_id: int, key: tuple) -> str:
+        (warriors, tiles, tokens) = key
+        cx, cy = self.centers[node_id]
+        parts = []
+
+        # Buildings fill the slots left to right
+        limit = self.building_limits[node_id] if node_id < len(self.building_limits) else len(tiles)
+        for left, tile in zip(row_offsets(max(limit, len(tiles)), SLOT), tiles):
+            owner = BUILDING_OWNERS.get(tile, "X")
+            x, y = cx + left, cy - 30
+            parts.append(f'<rect class="f{owner}" x="{x:g}" y="{y}" width="{SLOT}" height="{SLOT}" rx="3"/>'
+                         f'<text class="piece" x="{x + SLOT / 2:g}" y="{y + SLOT / 2:g}">{BUILDING_LABELS.get(tile, tile[:1].upper())}</text>')
+
+        # Warriors: one counter per faction
+        for left, (owner, count) in zip(row_offsets(len(warriors), SLOT), warriors):
+            x, y = cx + left + SLOT / 2, cy + 6
+            parts.append(f'<circle class="f{owner if owner in FACTION_COLOURS else "X"}" cx="{x:g}" cy="{y}" r="{SLOT / 2:g}"/>'
+                         f'<text class="piece" x="{x:g}" y="{y}">{count}</text>')
+
+        # Tokens: one square per owner and kind, labelled with the kind and count
+        for left, (owner, token, count) in zip(row_offsets(len(tokens), SLOT), tokens):
+            x, y = cx + left, cy + 20
+            label = TOKEN_LABELS.get(token, token[:1]) + (str(count) if count > 1 else "")
+            parts.append(f'<rect class="f{owner if owner in FACTION_COLOURS else "X"}" x="{x:g}" y="{y}" width="{SLOT}" height="{SLOT - 4}"/>'
+                         f'<text class="piece" x="{x + SLOT / 2:g}" y="{y + (SLOT - 4) / 2:g}">{label}</text>')
+        return "".join(parts)
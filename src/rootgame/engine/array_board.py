@@ -0,0 +1,470 @@
+from array import array
+from contextlib import contextmanager
+from typing import Iterable
+
+from rootgame.shared.shared_types import ClearingInfo
+from rootgame.engine.board import (AUTUMN_BOARD_EDGES, AUTUMN_BOARD_SUITS, AUTUMN_BOARD_BUILDING_LIMITS,
+                                   AUTUMN_ADJACENCY_MASKS, AUTUMN_SUIT_MASKS, CLEARING_FIELDS, WARRIORS_FIELD,
+                                   BUILDINGS_FIELD, TOKENS_FIELD, RULER_FIELD, ClearingField, Token, resolve_ruler)
+from rootgame.engine.bitboard import Bitboards
+from rootgame.engine.legality import LEGAL, Legality, Rejection, reject
+from rootgame.engine.building import BuildingType
+from rootgame.engine.types import FactionName, Suit
+from rootgame.engine.rng import DiceStream, new_seed
+from rootgame.engine.zobrist import count_key, recount_key
+
+# Index tables shared by every ArrayBoard
+FACTIONS = list(FactionName)
+FACTION_INDEX = {faction: idx for (idx, faction) in enumerate(FACTIONS)}
+FACTION_LETTERS = [faction[0].upper() for faction in FACTIONS]
+BUILDING_TYPES = list(BuildingType)
+BUILDING_TYPE_INDEX = {building_type: idx for (idx, building_type) in enumerate(BUILDING_TYPES)}
+TOKENS = list(Token)
+TOKEN_INDEX = {token: idx for (idx, token) in enumerate(TOKENS)}
+WOOD_INDEX = TOKEN_INDEX[Token.WOOD]
+
+NUM_CLEARINGS = len(AUTUMN_BOARD_SUITS)
+NUM_FACTIONS = len(FACTIONS)
+NUM_TOKENS = len(TOKENS)
+MAX_BUILDING_SLOTS = max(AUTUMN_BOARD_BUILDING_LIMITS)
+
+NO_ENTRY = -1
+
+def build_adjacency():
+    # Same neighbour order as Board, so both backends enumerate moves identically
+    adjacent: list[list[int]] = [[] for _ in range(NUM_CLEARINGS)]
+    for (a, b) in AUTUMN_BOARD_EDGES:
+        adjacent[a].append(b)
+        adjacent[b].append(a)
+    return tuple(tuple(clearing_adjacent) for clearing_adjacent in adjacent)
+
+ADJACENT_CLEARINGS = build_adjacency()
+
+class ArrayBoard:
+    """
+    Structure-of-arrays board backend with the same API as Board.
+
+    Warriors, tokens, building slots and rulers live in flat typed arrays indexed by
+    clearing (and faction/slot/token); topology and suits are module-level and shared.
+    """
+
+    # While set, every mutation appends an inverse operation (fn, *args) so it can be rolled back
+    journal: list | None = None
+
+    # Zobrist hash of the pieces on the board, with the same keys as Board (see zobrist.py)
+    zobrist: int = 0
+
+    # Change tracking, as on Board: bumped by every change to a clearing
+    version: int = 0
+
+    def __init__(self, dice: DiceStream | None = None):
+        self.dice = dice if dice is not None else DiceStream(new_seed())  # Battle rolls; a Game hands in its own stream
+        # warriors[clearing * NUM_FACTIONS + faction]
+        self.warriors = array("H", [0]) * (NUM_CLEARINGS * NUM_FACTIONS)
+        # tokens[(clearing * NUM_FACTIONS + faction) * NUM_TOKENS + token]
+        self.tokens = array("H", [0]) * (NUM_CLEARINGS * NUM_FACTIONS * NUM_TOKENS)
+        # building_*[clearing * MAX_BUILDING_SLOTS + slot], filled in build order
+        self.building_types = array("b", [NO_ENTRY]) * (NUM_CLEARINGS * MAX_BUILDING_SLOTS)
+        self.building_owners = array("b", [NO_ENTRY]) * (NUM_CLEARINGS * MAX_BUILDING_SLOTS)
+        self.building_used = array("b", [0]) * (NUM_CLEARINGS * MAX_BUILDING_SLOTS)
+        self.building_counts = array("b", [0]) * NUM_CLEARINGS
+        # presence[clearing * NUM_FACTIONS + faction] = warriors + buildings, kept in step with every change
+        self.presence = array("H", [0]) * (NUM_CLEARINGS * NUM_FACTIONS)
+        self.rulers = array("b", [NO_ENTRY]) * NUM_CLEARINGS
+        self.bitboards = Bitboards(AUTUMN_ADJACENCY_MASKS, AUTUMN_SUIT_MASKS)
+        self.journal = None
+        self.clearing_versions = [0] * NUM_CLEARINGS
+        self.field_versions = [[0] * len(CLEARING_FIELDS) for _ in range(NUM_CLEARINGS)]
+        self.what_if_depth = 0
+
+    # Clearing
+    def is_valid_clearing(self, clearing_id: int):
+        return clearing_id >= 0 and clearing_id < NUM_CLEARINGS
+
+    def get_clearing_ids(self):
+        return range(NUM_CLEARINGS)
+
+    def get_adjacent_clearings(self, clearing_id: int):
+        return ADJACENT_CLEARINGS[clearing_id]
+
+    def get_clearing_suit(self, clearing_id: int):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return AUTUMN_BOARD_SUITS[clearing_id]
+
+    def get_clearing_ruler(self, clearing_id: int):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            ruler = self.rulers[clearing_id]
+            return None if ruler == NO_ENTRY else FACTIONS[ruler]
+
+    # Bitboard Queries (sets of clearings as bitmasks, see bitboard.py)
+    def get_ruled_mask(self, faction: FactionName) -> int:
+        return self.bitboards.ruled[faction]
+
+    def get_warrior_mask(self, faction: FactionName) -> int:
+        return self.bitboards.warriors[faction]
+
+    def get_suit_mask(self, suit: Suit) -> int:
+        return self.bitboards.suit_masks[suit]
+
+    def get_ruled_neighbours(self, clearing_id: int, faction: FactionName) -> int:
+        return self.bitboards.ruled_neighbours(clearing_id, faction)
+
+    def get_move_destinations(self, faction: FactionName, source_clearing: int) -> int:
+        return self.bitboards.move_destinations(faction, source_clearing)
+
+    def get_contested_clearings(self, faction: FactionName) -> int:
+        return self.bitboards.contested(faction)
+
+    def get_ruled_component(self, clearing_id: int, faction: FactionName) -> int:
+        return self.bitboards.components[faction].get_component(clearing_id)
+
+    def get_connected_wood(self, clearing_id: int, faction: FactionName) -> int:
+        return self.bitboards.components[faction].get_connected_wood(clearing_id)
+
+    def rebuild_bitboards(self):
+        self.bitboards.clear()
+        for clearing_id in range(NUM_CLEARINGS):
+            for faction_idx in range(NUM_FACTIONS):
+                wood = self.tokens[(clearing_id * NUM_FACTIONS + faction_idx) * NUM_TOKENS + WOOD_INDEX]
+                if(wood):
+                    self.bitboards.adjust_wood(clearing_id, FACTIONS[faction_idx], wood)
+            ruler = self.rulers[clearing_id]
+            self.bitboards.set_ruler(clearing_id, None, None if ruler == NO_ENTRY else FACTIONS[ruler])
+            for faction_idx in range(NUM_FACTIONS):
+                if(self.warriors[clearing_id * NUM_FACTIONS + faction_idx]):
+                    self.bitboards.set_has_warriors(clearing_id, FACTIONS[faction_idx], True)
+
+    def adjust_presence(self, clearing_id: int, faction_idx: int, delta: int):
+        self.presence[clearing_id * NUM_FACTIONS + faction_idx] += delta
+        self.update_ruler(clearing_id)
+
+    def update_ruler(self, clearing_id: int):
+        start = clearing_id * NUM_FACTIONS
+        ruler = resolve_ruler(zip(FACTIONS, self.presence[start:start + NUM_FACTIONS]))
+        old_ruler = self.rulers[clearing_id]
+        self.rulers[clearing_id] = NO_ENTRY if ruler is None else FACTION_INDEX[ruler]
+        if(self.rulers[clearing_id] != old_ruler):
+            self.touch(clearing_id, RULER_FIELD)
+        self.bitboards.set_ruler(clearing_id, None if old_ruler == NO_ENTRY else FACTIONS[old_ruler], ruler)
+
+    # Change Tracking
+    def touch(self, clearing_id: int, field: int):
+        # `field` is a position in CLEARING_FIELDS. Speculative changes don't count, as end_what_if undoes them exactly
+        if(self.what_if_depth):
+            return
+        self.version += 1
+        self.clearing_versions[clearing_id] = self.version
+        self.field_versions[clearing_id][field] = self.version
+
+    def changes_since(self, version: int) -> dict[int, ClearingField]:
+        # Clearings changed after `version` (an earlier value of self.version), with the kinds of field that changed
+        changes: dict[int, ClearingField] = {}
+        for (clearing_id, clearing_version) in enumerate(self.clearing_versions):
+            if(clearing_version > version):
+                fields = ClearingField(0)
+                for (field, field_version) in zip(CLEARING_FIELDS, self.field_versions[clearing_id]):
+                    if(field_version > version):
+                        fields |= field
+                changes[clearing_id] = fields
+        return changes
+
+    # Journal Operations
+    def rollback(self, ops: list):
+        # Undo journaled operations, most recent first
+        for op in reversed(ops):
+            op[0](*op[1:])
+
+    def begin_what_if(self):
+        # Start journaling speculative changes; returns the outer journal to hand back to end_what_if
+        outer_journal = self.journal
+        self.journal = []
+        self.what_if_depth += 1
+        return outer_journal
+
+    def end_what_if(self, outer_journal):
+        # Roll back every change made since begin_what_if
+        ops = self.journal
+        self.journal = None
+        self.rollback(ops)
+        self.journal = outer_journal
+        self.what_if_depth -= 1
+
+    @contextmanager
+    def what_if(self):
+        # `with board.what_if():` rolls back the block's changes on the way out, even if it raises
+        outer_journal = self.begin_what_if()
+        try:
+            yield
+        finally:
+            self.end_what_if(outer_journal)
+
+    # Building Operations
+    def build(self, clearing_id: int, building_type: BuildingType, owner: FactionName):
+        if(self.can_build_at_clearing(clearing_id)):
+            slot = clearing_id * MAX_BUILDING_SLOTS + self.building_counts[clearing_id]
+            self.rehash_buildings(clearing_id, BUILDING_TYPE_INDEX[building_type], FACTION_INDEX[owner], False, 1)
+            self.building_types[slot] = BUILDING_TYPE_INDEX[building_type]
+            self.building_owners[slot] = FACTION_INDEX[owner]
+            self.building_used[slot] = 0
+            self.building_counts[clearing_id] += 1
+            self.touch(clearing_id, BUILDINGS_FIELD)
+            self.adjust_presence(clearing_id, self.building_owners[slot], 1)
+            if(self.journal is not None):
+                self.journal.append((self.pop_building, clearing_id))
+
+    def pop_building(self, clearing_id: int):
+        slot = clearing_id * MAX_BUILDING_SLOTS + self.building_counts[clearing_id] - 1
+        owner = self.building_owners[slot]
+        self.rehash_buildings(clearing_id, self.building_types[slot], owner, bool(self.building_used[slot]), -1)
+        self.building_counts[clearing_id] -= 1
+        self.building_types[slot] = NO_ENTRY
+        self.building_owners[slot] = NO_ENTRY
+        self.building_used[slot] = 0
+        self.touch(clearing_id, BUILDINGS_FIELD)
+        self.adjust_presence(clearing_id, owner, -1)
+
+    def find_building(self, clearing_id: int, building_type: BuildingType, unused_only: bool = False) -> int | None:
+        type_idx = BUILDING_TYPE_INDEX[building_type]
+        base = clearing_id * MAX_BUILDING_SLOTS
+        for slot in range(self.building_counts[clearing_id]):
+            if(self.building_types[base + slot] == type_idx and not (unused_only and self.building_used[base + slot])):
+                return slot
+        return None
+
+    def clearing_has_building(self, clearing_id: int, building_type: BuildingType) -> bool:
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return self.find_building(clearing_id, building_type) is not None
+        return False
+
+    def get_building_count_at_clearing(self, clearing_id: int, building_type: BuildingType) -> int:
+        if(not self.is_valid_clearing(clearing_id=clearing_id)):
+            return 0
+        type_idx = BUILDING_TYPE_INDEX[building_type]
+        base = clearing_id * MAX_BUILDING_SLOTS
+        return sum(1 for slot in range(self.building_counts[clearing_id]) if self.building_types[base + slot] == type_idx)
+
+    def can_build_at_clearing(self, clearing_id: int) -> bool:
+        return self.is_valid_clearing(clearing_id=clearing_id) and self.building_counts[clearing_id] < AUTUMN_BOARD_BUILDING_LIMITS[clearing_id]
+
+    def get_buildings_at_clearing(self, clearing_id: int) -> list[tuple[BuildingType, FactionName, bool]]:
+        if(not self.is_valid_clearing(clearing_id=clearing_id)):
+            return []
+        base = clearing_id * MAX_BUILDING_SLOTS
+        return [(BUILDING_TYPES[self.building_types[slot]], FACTIONS[self.building_owners[slot]], bool(self.building_used[slot]))
+                for slot in range(base, base + self.building_counts[clearing_id])]
+
+    def mark_all_buildings_unused(self):
+        for clearing_id in range(NUM_CLEARINGS):
+            base = clearing_id * MAX_BUILDING_SLOTS
+            for slot in range(self.building_counts[clearing_id]):
+                if(self.building_used[base + slot]):
+                    self.set_building_used(clearing_id, slot, False)
+
+    def set_building_used(self, clearing_id: int, building_idx: int, used: bool):
+        slot = clearing_id * MAX_BUILDING_SLOTS + building_idx
+        if(self.journal is not None):
+            self.journal.append((self.set_building_used, clearing_id, building_idx, bool(self.building_used[slot])))
+        if(bool(self.building_used[slot]) != used):
+            self.rehash_buildings(clearing_id, self.building_types[slot], self.building_owners[slot], not used, -1)
+            self.rehash_buildings(clearing_id, self.building_types[slot], self.building_owners[slot], used, 1)
+            self.touch(clearing_id, BUILDINGS_FIELD)
+        self.building_used[slot] = used
+
+    def rehash_buildings(self, clearing_id: int, type_idx: int, owner_idx: int, used: bool, delta: int):
+        # Called before adding/removing `delta` such buildings, with the current count still on the board
+        base = clearing_id * MAX_BUILDING_SLOTS
+        count = sum(1 for slot in range(base, base + self.building_counts[clearing_id])
+                    if self.building_types[slot] == type_idx and self.building_owners[slot] == owner_idx and bool(self.building_used[slot]) == used)
+        self.zobrist ^= recount_key(count, count + delta, "building", clearing_id, BUILDING_TYPES[type_idx], FACTIONS[owner_idx], used)
+
+    def get_unused_buildings_of_type(self, building_type: BuildingType):
+        type_idx = BUILDING_TYPE_INDEX[building_type]
+        unused_buildings: dict[int, int] = {}
+        for clearing_id in range(NUM_CLEARINGS):
+            base = clearing_id * MAX_BUILDING_SLOTS
+            for slot in range(base, base + self.building_counts[clearing_id]):
+                if(self.building_types[slot] == type_idx and not self.building_used[slot]):
+                    unused_buildings[clearing_id] = unused_buildings.get(clearing_id, 0) + 1
+        return unused_buildings
+
+    def use_building_at_clearing(self, clearing_id: int, building_type: BuildingType):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            slot = self.find_building(clearing_id, building_type, unused_only=True)
+            if(slot is not None):
+                self.set_building_used(clearing_id, slot, True)
+
+    # Warrior Operations
+    def get_warrior_count(self, clearing_id: int, faction: FactionName) -> int:
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return self.warriors[clearing_id * NUM_FACTIONS + FACTION_INDEX[faction]]
+        return 0
+
+    def set_warriors(self, clearing_id: int, faction_idx: int, count: int):
+        idx = clearing_id * NUM_FACTIONS + faction_idx
+        if(self.journal is not None):
+            self.journal.append((self.set_warriors, clearing_id, faction_idx, self.warriors[idx]))
+        delta = count - self.warriors[idx]
+        self.zobrist ^= recount_key(self.warriors[idx], count, "warriors", clearing_id, FACTIONS[faction_idx])
+        self.warriors[idx] = count
+        if(delta):
+            self.touch(clearing_id, WARRIORS_FIELD)
+            self.adjust_presence(clearing_id, faction_idx, delta)
+            self.bitboards.set_has_warriors(clearing_id, FACTIONS[faction_idx], count > 0)
+
+    def add_warriors_at_clearing(self, clearing_id: int, faction: FactionName, num_warriors: int):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            faction_idx = FACTION_INDEX[faction]
+            self.set_warriors(clearing_id, faction_idx, self.warriors[clearing_id * NUM_FACTIONS + faction_idx] + num_warriors)
+
+    def remove_warriors_at_clearing(self, clearing_id: int, faction: FactionName, num_warriors: int):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            faction_idx = FACTION_INDEX[faction]
+            current = self.warriors[clearing_id * NUM_FACTIONS + faction_idx]
+            self.set_warriors(clearing_id, faction_idx, current - min(num_warriors, current))
+
+    def move_warriors(self, faction: FactionName, numWarriors: int, source_clearing: int, dest_clearing: int):
+        if(self.is_valid_clearing(clearing_id=source_clearing) and self.is_valid_clearing(clearing_id=dest_clearing)):
+            self.remove_warriors_at_clearing(source_clearing, faction, numWarriors)
+            self.add_warriors_at_clearing(dest_clearing, faction, numWarriors)
+
+    def can_move(self, faction: FactionName, numWarriors: int, source_clearing: int, dest_clearing: int) -> Legality:
+        if(not self.is_valid_clearing(source_clearing) or not self.is_valid_clearing(dest_clearing)):
+            return reject(Rejection.INVALID_CLEARING)
+        if(numWarriors <= 0):
+            return reject(Rejection.NO_WARRIORS_TO_MOVE)
+        if(not self.bitboards.is_adjacent(source_clearing, dest_clearing)):
+            return reject(Rejection.NOT_ADJACENT)
+        if(self.get_warrior_count(source_clearing, faction) < numWarriors):
+            return reject(Rejection.INSUFFICIENT_WARRIORS)
+        if(not self.bitboards.rules(faction, source_clearing) and not self.bitboards.rules(faction, dest_clearing)):
+            return reject(Rejection.NOT_RULED_MOVE)
+
+        return LEGAL
+
+    def can_battle(self, attacker: FactionName, defender: FactionName, clearing_id: int) -> Legality:
+        if(not self.is_valid_clearing(clearing_id)):
+            return reject(Rejection.INVALID_CLEARING)
+        if(attacker == defender):
+            return reject(Rejection.SELF_BATTLE)
+
+        if(not self.bitboards.has_warriors(attacker, clearing_id) or not self.bitboards.has_warriors(defender, clearing_id)):
+            return reject(Rejection.NO_WARRIORS_TO_BATTLE)
+
+        return LEGAL
+
+    def battle(self, attacker: FactionName, defender: FactionName, clearing_id: int):
+        rolls = [self.dice.roll(), self.dice.roll()]
+
+        attack_hits = min(max(rolls), self.get_warrior_count(clearing_id, attacker))
+        defense_hits = min(min(rolls), self.get_warrior_count(clearing_id, defender))
+
+        self.remove_warriors_at_clearing(clearing_id, attacker, defense_hits)
+        self.remove_warriors_at_clearing(clearing_id, defender, attack_hits)
+
+        # Placeholder for vp scored from battle
+        return 0
+
+    # Token Operations
+    def set_token_count(self, clearing_id: int, faction_idx: int, token_idx: int, count: int):
+        idx = (clearing_id * NUM_FACTIONS + faction_idx) * NUM_TOKENS + token_idx
+        if(self.journal is not None):
+            self.journal.append((self.set_token_count, clearing_id, faction_idx, token_idx, self.tokens[idx]))
+        if(token_idx == WOOD_INDEX):
+            self.bitboards.adjust_wood(clearing_id, FACTIONS[faction_idx], count - self.tokens[idx])
+        self.zobrist ^= recount_key(self.tokens[idx], count, "token", clearing_id, FACTIONS[faction_idx], TOKENS[token_idx])
+        if(self.tokens[idx] != count):
+            self.touch(clearing_id, TOKENS_FIELD)
+        self.tokens[idx] = count
+
+    def get_token_count_at_clearing(self, clearing_id: int, token: Token, owner: FactionName) -> int:
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return self.tokens[(clearing_id * NUM_FACTIONS + FACTION_INDEX[owner]) * NUM_TOKENS + TOKEN_INDEX[token]]
+        return 0
+
+    def add_token_at_clearing(self, clearing_id: int, token: Token, owner: FactionName):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            count = self.get_token_count_at_clearing(clearing_id, token, owner)
+            self.set_token_count(clearing_id, FACTION_INDEX[owner], TOKEN_INDEX[token], count + 1)
+
+    def remove_token_at_clearing(self, clearing_id: int, token: Token, owner: FactionName) -> bool:
+        count = self.get_token_count_at_clearing(clearing_id, token, owner)
+        if(count == 0):
+            return False
+        self.set_token_count(clearing_id, FACTION_INDEX[owner], TOKEN_INDEX[token], count - 1)
+        return True
+
+    # Zobrist Hashing
+    def compute_zobrist(self) -> int:
+        # From scratch; the incremental `zobrist` should always equal this
+        zobrist = 0
+        for clearing_id in range(NUM_CLEARINGS):
+            for faction_idx in range(NUM_FACTIONS):
+                idx = clearing_id * NUM_FACTIONS + faction_idx
+                zobrist ^= count_key(self.warriors[idx], "warriors", clearing_id, FACTIONS[faction_idx])
+                for token_idx in range(NUM_TOKENS):
+                    zobrist ^= count_key(self.tokens[idx * NUM_TOKENS + token_idx], "token", clearing_id, FACTIONS[faction_idx], TOKENS[token_idx])
+            base = clearing_id * MAX_BUILDING_SLOTS
+            kinds: dict[tuple, int] = {}
+            for slot in range(base, base + self.building_counts[clearing_id]):
+                kind = (BUILDING_TYPES[self.building_types[slot]], FACTIONS[self.building_owners[slot]], bool(self.building_used[slot]))
+                kinds[kind] = kinds.get(kind, 0) + 1
+            for ((building_type, owner, used), count) in kinds.items():
+                zobrist ^= count_key(count, "building", clearing_id, building_type, owner, used)
+        return zobrist
+
+    # Snapshot Operations
+    def snapshot(self):
+        return (self.warriors.tobytes(), self.tokens.tobytes(), self.building_types.tobytes(), self.building_owners.tobytes(),
+                self.building_used.tobytes(), self.building_counts.tobytes(), self.presence.tobytes(), self.rulers.tobytes())
+
+    def restore(self, snapshot):
+        old = self.snapshot()
+        for (values, data) in zip((self.warriors, self.tokens, self.building_types, self.building_owners,
+                                   self.building_used, self.building_counts, self.presence, self.rulers), snapshot):
+            values[:] = array(values.typecode, data)
+        self.touch_restored(old)
+        self.rebuild_bitboards()
+        self.zobrist = self.compute_zobrist()
+
+    def touch_restored(self, old_snapshot):
+        # Touch what restore changed, comparing each clearing's rows with the snapshot of the state it replaced
+        (warriors, tokens, building_types, building_owners, building_used, _counts, _presence, rulers) = old_snapshot
+        old_rows = ((WARRIORS_FIELD, array("H", warriors), self.warriors, NUM_FACTIONS),
+                    (TOKENS_FIELD, array("H", tokens), self.tokens, NUM_FACTIONS * NUM_TOKENS),
+                    (BUILDINGS_FIELD, array("b", building_types), self.building_types, MAX_BUILDING_SLOTS),
+                    (BUILDINGS_FIELD, array("b", building_owners), self.building_owners, MAX_BUILDING_SLOTS),
+                    (BUILDINGS_FIELD, array("b", building_used), self.building_used, MAX_BUILDING_SLOTS),
+                    (RULER_FIELD, array("b", rulers), self.rulers, 1))
+        for clearing_id in range(NUM_CLEARINGS):
+            for (field, old_values, values, width) in old_rows:
+                start = clearing_id * width
+                if(old_values[start:start + width] != values[start:start + width]):
+                    self.touch(clearing_id, field)
+
+    # Misc Operations
+    def export_clearing_info(self, clearing_ids: Iterable[int] | None = None):
+        # Every clearing, or only `clearing_ids` (e.g. those in changes_since)
+        clearing_info: dict[int, ClearingInfo] = {}
+
+        for clearing_id in (range(NUM_CLEARINGS) if clearing_ids is None else clearing_ids):
+            info = ClearingInfo()
+            base = clearing_id * MAX_BUILDING_SLOTS
+            info.tiles = [BUILDING_TYPES[type_idx] for type_idx in self.building_types[base:base + self.building_counts[clearing_id]]]
+
+            start = clearing_id * NUM_FACTIONS
+            info.warriors = {FACTION_LETTERS[faction_idx]: count for (faction_idx, count) in enumerate(self.warriors[start:start + NUM_FACTIONS]) if count}
+
+            token_row = self.tokens[start * NUM_TOKENS:(start + NUM_FACTIONS) * NUM_TOKENS]
+            if(any(token_row)):
+                for faction_idx in range(NUM_FACTIONS):
+                    counts = token_row[faction_idx * NUM_TOKENS:(faction_idx + 1) * NUM_TOKENS]
+                    if(any(counts)):
+                        info.tokens[FACTION_LETTERS[faction_idx]] = [token for (token, count) in zip(TOKENS, counts) for _ in range(count)]
+
+            info.suit = AUTUMN_BOARD_SUITS[clearing_id]
+            clearing_info[clearing_id] = info
+
+        return clearing_info
+
+    def get_edges(self):
+        return AUTUMN_BOARD_EDGES
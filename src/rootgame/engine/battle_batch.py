@@ -0,0 +1,68 @@
+from typing import Sequence
+
+import numpy as np
+
+from rootgame.engine.rng import GAMMA, MIX1, MIX2, DiceStream
+from rootgame.engine.types import FactionName
+
+# Batched Board.battle for many games at once (e.g. one pending battle in each game of a rollout batch).
+#
+# Each game's dice come from its counter-based DiceStream, the one Board.battle rolls from, so every roll
+# of the batch is computed in one vectorized SplitMix64 call and each stream is then moved on by its two
+# rolls: a batch leaves the games exactly where the scalar path would and gives the same results.
+
+def splitmix64_array(keys: np.ndarray, counters: np.ndarray) -> np.ndarray:
+    # rng.splitmix64 over uint64 arrays; uint64 arithmetic wraps mod 2**64 as the scalar version masks
+    z = keys + (counters + np.uint64(1)) * np.uint64(GAMMA)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX2)
+    return z ^ (z >> np.uint64(31))
+
+def roll_battle_dice(streams: Sequence[DiceStream], out: np.ndarray | None = None) -> np.ndarray:
+    # (N, 2) rolls of 0-3, row i the next two rolls of streams[i]. A stream may appear only once, as
+    # every row is computed from the counters the streams had before the call
+    if(len({id(stream) for stream in streams}) != len(streams)):
+        raise ValueError("The same dice stream appears twice in one batch; resolve those battles separately")
+    if(out is None):
+        out = np.empty((len(streams), 2), dtype=np.int8)
+    keys = np.fromiter((stream.key for stream in streams), dtype=np.uint64, count=len(streams))
+    counters = np.fromiter((stream.counter for stream in streams), dtype=np.uint64, count=len(streams))
+    counters = counters[:, None] + np.arange(2, dtype=np.uint64)
+    out[:] = splitmix64_array(keys[:, None], counters) & np.uint64(3)
+    for stream in streams:
+        stream.counter += 2
+    return out
+
+def battle_losses(rolls: np.ndarray, attackers: np.ndarray, defenders: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (attacker losses, defender losses) per battle for (N, 2) rolls and the warriors on each side.
+
+    The attacker deals the higher roll and the defender the lower, each capped by its own warriors;
+    losses are also capped by the warriors there are to lose.
+    """
+    attack_hits = np.minimum(rolls.max(axis=1), attackers)
+    defense_hits = np.minimum(rolls.min(axis=1), defenders)
+    return (np.minimum(defense_hits, attackers), np.minimum(attack_hits, defenders))
+
+def resolve_battles(boards: Sequence, attackers: Sequence[FactionName], defenders: Sequence[FactionName],
+                    clearing_ids: Sequence[int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve battle i on boards[i] (either backend) and return the losses of both sides per battle.
+
+    Equivalent to calling boards[i].battle(attackers[i], defenders[i], clearing_ids[i]) for each i.
+    Warriors are removed through the boards' own methods, so journaling and undo work as usual.
+    Each board (and so each dice stream) may appear only once; ValueError otherwise, before any change.
+    """
+    attacker_counts = np.fromiter((board.get_warrior_count(clearing_id, faction) for (board, faction, clearing_id) in zip(boards, attackers, clearing_ids)),
+                                  dtype=np.int16, count=len(boards))
+    defender_counts = np.fromiter((board.get_warrior_count(clearing_id, faction) for (board, faction, clearing_id) in zip(boards, defenders, clearing_ids)),
+                                  dtype=np.int16, count=len(boards))
+    rolls = roll_battle_dice([board.dice for board in boards])
+    (attacker_losses, defender_losses) = battle_losses(rolls, attacker_counts, defender_counts)
+
+    # Applied exactly as the scalar path applies them (zero losses included) so boards end up identical
+    for (board, attacker, defender, clearing_id, attacker_lost, defender_lost) in zip(
+            boards, attackers, defenders, clearing_ids, attacker_losses.tolist(), defender_losses.tolist()):
+        board.remove_warriors_at_clearing(clearing_id, attacker, attacker_lost)
+        board.remove_warriors_at_clearing(clearing_id, defender, defender_lost)
+    return (attacker_losses, defender_losses)
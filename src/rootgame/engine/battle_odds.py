@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import cache
+import itertools
+
+from rootgame.engine.eyrie_dynasties import EyrieDynasties
+from rootgame.engine.marquise_de_cat import MarquiseDeCat
+from rootgame.engine.types import FactionName
+
+# Exact outcome distributions for Board.battle: two dice each showing 0-3 hits, the attacker deals
+# the higher roll and the defender the lower, each capped by the warriors they have in the clearing.
+# Hits beyond a side's warriors are lost, so losses are also capped by the warriors being hit.
+
+DIE_FACES = 4  # hits 0-3
+ROLLS = list(itertools.product(range(DIE_FACES), repeat=2))
+
+# Largest warrior count either side of a battle can have
+MAX_WARRIORS = max(MarquiseDeCat.warrior_limit, EyrieDynasties.warrior_limit)
+
+@dataclass(frozen=True, slots=True)
+class BattleOdds:
+    """
+    Distribution of (attacker losses, defender losses) for one battle between `attackers` and `defenders` warriors.
+
+    Probabilities are exact Fractions; the expectations are floats for use in evaluation.
+    """
+    attackers: int
+    defenders: int
+    outcomes: dict[tuple[int, int], Fraction]
+    attacker_losses: tuple[Fraction, ...]  # P(attacker loses k warriors), k = 0..3
+    defender_losses: tuple[Fraction, ...]
+    expected_attacker_losses: float
+    expected_defender_losses: float
+
+    def probability(self, attacker_losses: int, defender_losses: int) -> Fraction:
+        return self.outcomes.get((attacker_losses, defender_losses), Fraction(0))
+
+@cache
+def battle_odds(attackers: int, defenders: int) -> BattleOdds:
+    counts: dict[tuple[int, int], int] = {}
+    for rolls in ROLLS:
+        attack_hits = min(max(rolls), attackers)
+        defense_hits = min(min(rolls), defenders)
+        outcome = (min(defense_hits, attackers), min(attack_hits, defenders))
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    outcomes = {outcome: Fraction(count, len(ROLLS)) for (outcome, count) in counts.items()}
+    attacker_losses = [Fraction(0)] * DIE_FACES
+    defender_losses = [Fraction(0)] * DIE_FACES
+    for ((attacker_lost, defender_lost), probability) in outcomes.items():
+        attacker_losses[attacker_lost] += probability
+        defender_losses[defender_lost] += probability
+
+    return BattleOdds(
+        attackers=attackers,
+        defenders=defenders,
+        outcomes=outcomes,
+        attacker_losses=tuple(attacker_losses),
+        defender_losses=tuple(defender_losses),
+        expected_attacker_losses=float(sum(k * p for (k, p) in enumerate(attacker_losses))),
+        expected_defender_losses=float(sum(k * p for (k, p) in enumerate(defender_losses))),
+    )
+
+# Every reachable pairing, precomputed: BATTLE_ODDS[attackers][defenders]
+BATTLE_ODDS: tuple[tuple[BattleOdds, ...], ...] = tuple(
+    tuple(battle_odds(attackers, defenders) for defenders in range(MAX_WARRIORS + 1))
+    for attackers in range(MAX_WARRIORS + 1)
+)
+
+# (expected attacker losses, expected defender losses), for evaluation loops that only need the means
+EXPECTED_LOSSES: tuple[tuple[tuple[float, float], ...], ...] = tuple(
+    tuple((odds.expected_attacker_losses, odds.expected_defender_losses) for odds in row)
+    for row in BATTLE_ODDS
+)
+
+def get_battle_odds(attackers: int, defenders: int) -> BattleOdds:
+    if(attackers <= MAX_WARRIORS and defenders <= MAX_WARRIORS):
+        return BATTLE_ODDS[attackers][defenders]
+    return battle_odds(attackers, defenders)
+
+def get_clearing_battle_odds(board, attacker: FactionName, defender: FactionName, clearing_id: int) -> BattleOdds:
+    # Odds for a battle in a clearing as it stands (either board backend)
+    return get_battle_odds(board.get_warrior_count(clearing_id, attacker), board.get_warrior_count(clearing_id, defender))
@@ -0,0 +1,267 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import BinaryIO, Iterator
+import hashlib
+import struct
+
+from rootgame.engine.actions import *
+from rootgame.engine.building import BuildingType
+from rootgame.engine.player import Player
+from rootgame.engine.rng import MAX_SEED
+from rootgame.engine.types import DecreeOption, FactionName
+
+# Binary game log, version 1
+#
+#   header:  b"RTGL" | version u8 | seed u64 | num_players u8 | faction index u8 per seat
+#   records: tag u8 followed by the tag's fields as unsigned LEB128 varints
+#
+# Action records use the tags in ACTION_CODECS. Two more record kinds are reserved:
+#   CHECKPOINT_TAG: actions so far (varint) | 8-byte state digest of the game after that action
+#   END_TAG:        final score per seat (varint)
+# Readers stop at END_TAG or at the end of the stream, dropping a record cut off by the end, so a
+# log cut short is still readable up to its last whole record. Anything else malformed raises
+# BinaryLogError.
+
+MAGIC = b"RTGL"
+VERSION = 1
+HEADER = struct.Struct("<4sBQB")
+
+END_TAG = 0x00
+CHECKPOINT_TAG = 0xFF
+DIGEST_SIZE = 8
+
+FACTIONS = list(FactionName)
+
+class BinaryLogError(Exception):
+    pass
+
+class TruncatedRecord(BinaryLogError):
+    # The data ends inside a record
+    pass
+
+# Field kinds
+INT = "int"        # non-negative int
+INTS = "ints"      # list of non-negative ints (length first)
+MOVE = "move"      # MoveAction, as its three ints
+PLAYER = "player"  # Player, as the seat index
+
+# Tags are part of the format: never renumber, only append
+ACTION_CODECS: list[tuple[int, type, tuple[tuple[str, object], ...]]] = [
+    (0x01, EndPhaseAction, ()),
+    (0x02, DrawCardAction, (("num_cards", INT),)),
+    (0x03, DiscardCardAction, (("card_ids", INTS),)),
+    (0x04, BattleAction, (("clearing_id", INT), ("attacker", PLAYER), ("defender", PLAYER))),
+    (0x05, MoveAction, (("num_warriors", INT), ("source_clearing", INT), ("destination_clearing", INT))),
+    (0x06, PlayCardAction, (("card_id", INT),)),
+    (0x07, RecruitAction, (("clearing_id", INT), ("num_units", INT))),
+    (0x10, AddWoodToSawmillsAction, ()),
+    (0x11, MarchAction, (("move_one", MOVE), ("move_two", MOVE))),
+    (0x12, MarquiseRecruitAction, ()),
+    (0x13, MarquiseBuildAction, (("clearing_id", INT), ("building_type", BuildingType))),
+    (0x14, MarquiseOverworkAction, (("clearing_id", INT), ("card_idx", INT))),
+    (0x15, MarquiseCraftAction, (("card_idx", INT),)),
+    (0x16, MarquiseExtraTurnAction, (("card_idx", INT),)),
+    (0x20, EyrieAddToDecreeAction, (("card_id", INT), ("decree_option", DecreeOption))),
+    (0x21, EyrieRecruitAction, (("clearing_id", INT),)),
+    (0x22, EyrieMoveAction, (("num_warriors", INT), ("source_clearing", INT), ("destination_clearing", INT))),
+    (0x23, EyrieBuildAction, (("clearing_id", INT),)),
+    (0x24, EyrieTurmoilAction, ()),
+    (0x25, EyrieCraftAction, (("card_idx", INT),)),
+]
+
+TAG_BY_TYPE = {action_type: (tag, fields) for (tag, action_type, fields) in ACTION_CODECS}
+TYPE_BY_TAG = {tag: (action_type, fields) for (tag, action_type, fields) in ACTION_CODECS}
+ENUM_MEMBERS = {kind: list(kind) for (_, _, fields) in ACTION_CODECS for (_, kind) in fields if isinstance(kind, type) and issubclass(kind, Enum)}
+ENUM_INDEX = {kind: {member: idx for (idx, member) in enumerate(members)} for (kind, members) in ENUM_MEMBERS.items()}
+
+# Varints
+def write_varint(out: bytearray, value: int):
+    if(value < 0):
+        raise BinaryLogError(f"Can't encode negative value {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if(pos >= len(data)):
+            raise TruncatedRecord("Log ends inside a varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if(byte < 0x80):
+            return (value, pos)
+        shift += 7
+
+# Actions
+def encode_action(out: bytearray, action: Action, players: list[Player]):
+    if(type(action) not in TAG_BY_TYPE):
+        raise BinaryLogError(f"No binary encoding for {type(action).__name__}")
+    (tag, fields) = TAG_BY_TYPE[type(action)]
+    out.append(tag)
+    for (name, kind) in fields:
+        value = getattr(action, name)
+        if(kind is INT):
+            write_varint(out, value)
+        elif(kind is INTS):
+            write_varint(out, len(value))
+            for item in value:
+                write_varint(out, item)
+        elif(kind is MOVE):
+            write_varint(out, value.num_warriors)
+            write_varint(out, value.source_clearing)
+            write_varint(out, value.destination_clearing)
+        elif(kind is PLAYER):
+            write_varint(out, players.index(value))
+        else:
+            write_varint(out, ENUM_INDEX[kind][value])
+
+def decode_action(tag: int, data: bytes, pos: int, players: list[Player]) -> tuple[Action, int]:
+    if(tag not in TYPE_BY_TAG):
+        raise BinaryLogError(f"Unknown record tag {tag:#04x} at byte {pos - 1}")
+    (action_type, fields) = TYPE_BY_TAG[tag]
+    values = []
+    for (_, kind) in fields:
+        if(kind is INTS):
+            (count, pos) = read_varint(data, pos)
+            items = []
+            for _ in range(count):
+                (item, pos) = read_varint(data, pos)
+                items.append(item)
+            values.append(items)
+        elif(kind is MOVE):
+            (num_warriors, pos) = read_varint(data, pos)
+            (source_clearing, pos) = read_varint(data, pos)
+            (destination_clearing, pos) = read_varint(data, pos)
+            values.append(MoveAction(num_warriors, source_clearing, destination_clearing))
+        else:
+            (value, pos) = read_varint(data, pos)
+            if(kind is PLAYER):
+                if(value >= len(players)):
+                    raise BinaryLogError(f"No seat {value} in a {len(players)}-player log")
+                value = players[value]
+            elif(kind is not INT):
+                if(value >= len(ENUM_MEMBERS[kind])):
+                    raise BinaryLogError(f"No {kind.__name__} with index {value}")
+                value = ENUM_MEMBERS[kind][value]
+            values.append(value)
+    return (action_type(*values), pos)
+
+# State digests for checkpoints
+def board_key(board) -> tuple:
+    # The board as every backend exports it, minus empty entries (which only some backends keep)
+    return tuple((tuple(sorted((faction, count) for (faction, count) in info.warriors.items() if count)),
+                  tuple(info.tiles),
+                  tuple(sorted((faction, tuple(sorted(tokens))) for (faction, tokens) in info.tokens.items() if tokens)))
+                 for info in board.export_clearing_info().values())
+
+def state_digest(game) -> bytes:
+    # Digest of everything an action can change (not the log itself); equal digests mean the replay agrees.
+    # The board goes in through board_key rather than its snapshot, so logs verify on any backend
+    (round, current_player_idx, phase, players, deck, _board, _game_log, rng_state) = game.snapshot()
+    key = repr((round, current_player_idx, phase, players, len(deck), board_key(game.board), rng_state)).encode()
+    return hashlib.blake2b(key, digest_size=DIGEST_SIZE).digest()
+
+@dataclass
+class LogHeader:
+    version: int
+    seed: int
+    factions: list[FactionName]
+
+class GameLogWriter:
+    """
+    Streams a game to a binary log as it is played.
+
+    Call write_action() with each action the players choose, after applying it to the game
+    (automatic actions such as the evening draw are not written; replaying regenerates them).
+    """
+
+    def __init__(self, stream: BinaryIO, game, checkpoint_every: int = 0):
+        self.stream = stream
+        self.game = game
+        self.checkpoint_every = checkpoint_every
+        self.actions_written = 0
+        self.buffer = bytearray()
+        if(not 0 <= game.seed < MAX_SEED):
+            raise BinaryLogError(f"Can't log seed {game.seed}: seeds must be in [0, 2**64)")
+
+        factions = [player.faction.faction_name for player in game.players]
+        self.stream.write(HEADER.pack(MAGIC, VERSION, game.seed, len(factions)))
+        self.stream.write(bytes(FACTIONS.index(faction) for faction in factions))
+
+    def write_action(self, action: Action):
+        encode_action(self.buffer, action, self.game.players)
+        self.actions_written += 1
+        if(self.checkpoint_every and self.actions_written % self.checkpoint_every == 0):
+            self.write_checkpoint()
+        elif(len(self.buffer) >= 4096):
+            self.flush()
+
+    def write_checkpoint(self):
+        self.buffer.append(CHECKPOINT_TAG)
+        write_varint(self.buffer, self.actions_written)
+        self.buffer += state_digest(self.game)
+        self.flush()
+
+    def close(self):
+        # Final scores end the log; the stream itself is left open for the caller
+        self.buffer.append(END_TAG)
+        for player in self.game.players:
+            write_varint(self.buffer, player.score)
+        self.flush()
+
+    def flush(self):
+        self.stream.write(self.buffer)
+        self.buffer.clear()
+        self.stream.flush()
+
+def read_header(data: bytes) -> tuple[LogHeader, int]:
+    if(len(data) < HEADER.size):
+        raise BinaryLogError("Truncated header")
+    (magic, version, seed, num_players) = HEADER.unpack_from(data, 0)
+    if(magic != MAGIC):
+        raise BinaryLogError("Not a binary game log")
+    if(version != VERSION):
+        raise BinaryLogError(f"Unsupported log version {version}")
+    pos = HEADER.size + num_players
+    if(len(data) < pos):
+        raise BinaryLogError("Truncated header")
+    if(any(idx >= len(FACTIONS) for idx in data[HEADER.size:pos])):
+        raise BinaryLogError("Unknown faction in header")
+    factions = [FACTIONS[idx] for idx in data[HEADER.size:pos]]
+    return (LogHeader(version=version, seed=seed, factions=factions), pos)
+
+def iter_records(data: bytes, pos: int, players: list[Player]) -> Iterator[tuple]:
+    """
+    Yields ("action", action), ("checkpoint", actions_so_far, digest) and finally ("end", scores).
+
+    Battle actions refer to players by seat, so they are decoded against `players`.
+    """
+    while pos < len(data):
+        try:
+            (record, pos) = read_record(data, pos, players)
+        except TruncatedRecord:
+            return  # the log was cut off inside this record
+        yield record
+        if(record[0] == "end"):
+            return
+
+def read_record(data: bytes, pos: int, players: list[Player]) -> tuple[tuple, int]:
+    tag = data[pos]
+    pos += 1
+    if(tag == CHECKPOINT_TAG):
+        (count, pos) = read_varint(data, pos)
+        if(pos + DIGEST_SIZE > len(data)):
+            raise TruncatedRecord("Log ends inside a checkpoint digest")
+        return (("checkpoint", count, bytes(data[pos:pos + DIGEST_SIZE])), pos + DIGEST_SIZE)
+    if(tag == END_TAG):
+        scores = []
+        for _ in players:
+            (score, pos) = read_varint(data, pos)
+            scores.append(score)
+        return (("end", scores), pos)
+    (action, pos) = decode_action(tag, data, pos, players)
+    return (("action", action), pos)
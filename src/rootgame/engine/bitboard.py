@@ -0,0 +1,173 @@
+from typing import Iterator
+
+from rootgame.engine.types import FactionName, Suit
+
+# A set of clearings is an int with bit `clearing_id` set for each member (the Autumn map has 12)
+
+def clearing_bit(clearing_id: int) -> int:
+    return 1 << clearing_id
+
+def iter_clearings(mask: int) -> Iterator[int]:
+    # Clearing ids in the mask, lowest first
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+def count_clearings(mask: int) -> int:
+    return bin(mask).count("1")
+
+def build_adjacency_masks(num_clearings: int, edges: list[tuple[int, int]]) -> tuple[int, ...]:
+    adjacent = [0] * num_clearings
+    for (a, b) in edges:
+        adjacent[a] |= clearing_bit(b)
+        adjacent[b] |= clearing_bit(a)
+    return tuple(adjacent)
+
+def build_suit_masks(suits: list[Suit]) -> dict[Suit, int]:
+    suit_masks = dict.fromkeys(Suit, 0)
+    for (clearing_id, suit) in enumerate(suits):
+        suit_masks[suit] |= clearing_bit(clearing_id)
+    return suit_masks
+
+def flood_fill(adjacency: tuple[int, ...], seed: int, within: int) -> int:
+    # Clearings in `within` connected to the seed clearings through `within`
+    component = seed
+    frontier = seed
+    while frontier:
+        reached = 0
+        for clearing_id in iter_clearings(frontier):
+            reached |= adjacency[clearing_id]
+        frontier = reached & within & ~component
+        component |= frontier
+    return component
+
+class RuledComponents:
+    """
+    Connected components of the clearings one faction rules, and the faction's wood in each.
+
+    Each ruled clearing maps to its component's mask, which also keys the component's wood
+    total, so both are O(1) to look up. Gaining or losing rule of a clearing only touches the
+    components around it.
+    """
+
+    def __init__(self, adjacency: tuple[int, ...]):
+        self.adjacency = adjacency
+        self.component = [0] * len(adjacency)
+        self.wood = [0] * len(adjacency)
+        self.component_wood: dict[int, int] = {}
+
+    def clear(self):
+        for clearing_id in range(len(self.adjacency)):
+            self.component[clearing_id] = 0
+            self.wood[clearing_id] = 0
+        self.component_wood.clear()
+
+    def add_clearing(self, clearing_id: int):
+        # Newly ruled: merge with the components of any ruled neighbours
+        merged = clearing_bit(clearing_id)
+        wood = self.wood[clearing_id]
+        for neighbour in iter_clearings(self.adjacency[clearing_id]):
+            neighbour_component = self.component[neighbour]
+            if(neighbour_component and not neighbour_component & merged):
+                merged |= neighbour_component
+                wood += self.component_wood.pop(neighbour_component)
+        self.set_component(merged, wood)
+
+    def remove_clearing(self, clearing_id: int):
+        # No longer ruled: what is left of its component may split in several pieces
+        remaining = self.component[clearing_id] & ~clearing_bit(clearing_id)
+        del self.component_wood[self.component[clearing_id]]
+        self.component[clearing_id] = 0
+        while remaining:
+            piece = flood_fill(self.adjacency, remaining & -remaining, remaining)
+            remaining &= ~piece
+            self.set_component(piece, sum(self.wood[id] for id in iter_clearings(piece)))
+
+    def set_component(self, mask: int, wood: int):
+        for clearing_id in iter_clearings(mask):
+            self.component[clearing_id] = mask
+        self.component_wood[mask] = wood
+
+    def adjust_wood(self, clearing_id: int, delta: int):
+        self.wood[clearing_id] += delta
+        if(self.component[clearing_id]):
+            self.component_wood[self.component[clearing_id]] += delta
+
+    def get_component(self, clearing_id: int) -> int:
+        return self.component[clearing_id]
+
+    def get_connected_wood(self, clearing_id: int) -> int:
+        # 0 if the clearing isn't ruled
+        return self.component_wood.get(self.component[clearing_id], 0)
+
+class Bitboards:
+    """
+    Per-faction clearing masks: where each faction rules and where it has warriors.
+
+    Owned by a board, which updates them on every change to a clearing's ruler or warriors;
+    the map topology is shared and never changes.
+    """
+
+    def __init__(self, adjacency: tuple[int, ...], suit_masks: dict[Suit, int]):
+        self.adjacency = adjacency
+        self.suit_masks = suit_masks
+        self.ruled: dict[FactionName, int] = dict.fromkeys(FactionName, 0)
+        self.warriors: dict[FactionName, int] = dict.fromkeys(FactionName, 0)
+        self.components: dict[FactionName, RuledComponents] = {faction: RuledComponents(adjacency) for faction in FactionName}
+
+    def clear(self):
+        for faction in FactionName:
+            self.ruled[faction] = 0
+            self.warriors[faction] = 0
+            self.components[faction].clear()
+
+    def set_ruler(self, clearing_id: int, old_ruler: FactionName | None, new_ruler: FactionName | None):
+        if(old_ruler == new_ruler):
+            return
+        bit = clearing_bit(clearing_id)
+        if(old_ruler is not None):
+            self.ruled[old_ruler] &= ~bit
+            self.components[old_ruler].remove_clearing(clearing_id)
+        if(new_ruler is not None):
+            self.ruled[new_ruler] |= bit
+            self.components[new_ruler].add_clearing(clearing_id)
+
+    def set_has_warriors(self, clearing_id: int, faction: FactionName, has_warriors: bool):
+        if(has_warriors):
+            self.warriors[faction] |= clearing_bit(clearing_id)
+        else:
+            self.warriors[faction] &= ~clearing_bit(clearing_id)
+
+    def adjust_wood(self, clearing_id: int, owner: FactionName, delta: int):
+        self.components[owner].adjust_wood(clearing_id, delta)
+
+    # Queries
+    def is_adjacent(self, clearing_id: int, other_clearing_id: int) -> bool:
+        return bool(self.adjacency[clearing_id] & clearing_bit(other_clearing_id))
+
+    def rules(self, faction: FactionName, clearing_id: int) -> bool:
+        return bool(self.ruled[faction] & clearing_bit(clearing_id))
+
+    def has_warriors(self, faction: FactionName, clearing_id: int) -> bool:
+        return bool(self.warriors[faction] & clearing_bit(clearing_id))
+
+    def ruled_neighbours(self, clearing_id: int, faction: FactionName) -> int:
+        return self.adjacency[clearing_id] & self.ruled[faction]
+
+    def move_destinations(self, faction: FactionName, source_clearing: int) -> int:
+        # A move must start or end in a clearing the faction rules
+        if(self.ruled[faction] & clearing_bit(source_clearing)):
+            return self.adjacency[source_clearing]
+        return self.adjacency[source_clearing] & self.ruled[faction]
+
+    def enemy_warriors(self, faction: FactionName) -> int:
+        enemies = 0
+        for (other, mask) in self.warriors.items():
+            if(other != faction):
+                enemies |= mask
+        return enemies
+
+    def contested(self, faction: FactionName) -> int:
+        # Clearings where the faction and at least one other faction both have warriors
+        return self.warriors[faction] & self.enemy_warriors(faction)
@@ -1,10 +1,15 @@
 from dataclasses import dataclass, field
-import random
+from contextlib import contextmanager
+from typing import Iterable
+from rootgame.engine.rng import DiceStream, new_seed
 from rootgame.shared.shared_types import ClearingInfo
 from rootgame.engine.types import FactionName, Suit
+from rootgame.engine.legality import LEGAL, Legality, Rejection, reject
 from rootgame.engine.building import Building, BuildingType
+from rootgame.engine.bitboard import Bitboards, build_adjacency_masks, build_suit_masks
+from rootgame.engine.zobrist import count_key, recount_key
 
-from enum import StrEnum, auto
+from enum import Flag, StrEnum, auto
 
 AUTUMN_BOARD_EDGES = [
     (0, 1), (0, 3), (0, 4),
@@ -34,10 +39,43 @@ AUTUMN_BOARD_BUILDING_LIMITS = [
     2, 2, 1
 ]
 
+# Neighbours of each clearing, and clearings of each suit, as bitmasks
+AUTUMN_ADJACENCY_MASKS = build_adjacency_masks(len(AUTUMN_BOARD_SUITS), AUTUMN_BOARD_EDGES)
+AUTUMN_SUIT_MASKS = build_suit_masks(AUTUMN_BOARD_SUITS)
+
 class Token(StrEnum):
     KEEP = auto()
     WOOD = auto()
 
+class ClearingField(Flag):
+    # Kinds of clearing state, as reported by changes_since
+    WARRIORS = auto()
+    BUILDINGS = auto()
+    TOKENS = auto()
+    RULER = auto()
+
+# Change stamps are kept per field position, in this order (also the order of a clearing's snapshot tuple)
+CLEARING_FIELDS = (ClearingField.WARRIORS, ClearingField.BUILDINGS, ClearingField.TOKENS, ClearingField.RULER)
+(WARRIORS_FIELD, BUILDINGS_FIELD, TOKENS_FIELD, RULER_FIELD) = range(len(CLEARING_FIELDS))
+
+def resolve_ruler(presence: Iterable[tuple[FactionName, int]]) -> FactionName | None:
+    # The faction with the most presence (warriors + buildings) rules. A tie rules nobody,
+    # except that the Eyrie rule any tie they are part of (Lords of the Forest)
+    best = 0
+    leaders: list[FactionName] = []
+    for (faction, count) in presence:
+        if(count > best):
+            best = count
+            leaders = [faction]
+        elif(count == best and count > 0):
+            leaders.append(faction)
+
+    if(len(leaders) == 1):
+        return leaders[0]
+    if(FactionName.EYRIE_DYNASTIES in leaders):
+        return FactionName.EYRIE_DYNASTIES
+    return None
+
 @dataclass
 class Clearing:
     adjacentClearings: list[int] = field(default_factory=list)
@@ -48,6 +86,9 @@ class Clearing:
     suit: Suit | None = None
     ruler: FactionName | None = None
 
+    # Warriors + buildings per faction, kept in step with every change so the ruler is cheap to update
+    presence: dict[FactionName, int] = field(default_factory=dict, repr=False, compare=False)
+
     # Clearing Methods
     def is_adjacent(self, other_clearing_id: int):
         return other_clearing_id in self.adjacentClearings
@@ -58,7 +99,7 @@ class Clearing:
             return False
         
         self.buildings.append(building)
-        self.update_ruler()
+        self.adjust_presence(building.owner, 1)
         return True
     
     def get_buildings(self) -> list[Building]:
@@ -70,54 +111,100 @@ class Clearing:
     def can_build(self):
         return len(self.buildings) < self.building_limit
     
+    def pop_building(self) -> Building:
+        building = self.buildings.pop()
+        self.adjust_presence(building.owner, -1)
+        return building
+
+    def find_unused_building(self, building_type: BuildingType) -> int | None:
+        for (idx, building) in enumerate(self.buildings):
+            if building.type == building_type and building.used == False:
+                return idx
+        return None
+
     def use_building(self, building_type: BuildingType) -> bool:
-        if(not self.has_building(building_type=building_type)):
+        idx = self.find_unused_building(building_type)
+        if(idx is None):
             return False
         
-        for building in self.buildings:
-            if building.type == building_type and building.used == False:
-                building.used = True
-                return True
-        return False
+        self.buildings[idx].used = True
+        return True
         
     # Warrior Methods
     def add_warriors(self, faction: FactionName, count: int):
-        self.warriors[faction] = self.warriors.get(faction, 0) + count
-        self.update_ruler()
+        self.set_warriors(faction, self.warriors.get(faction, 0) + count)
     
     def get_warrior_count(self, faction: FactionName):
         return self.warriors.get(faction, 0)
 
     def remove_warriors(self, faction: FactionName, count: int):
         to_remove = min(count, self.warriors.get(faction, 0))
-        self.warriors[faction] = self.warriors.get(faction, 0) - to_remove
-        self.update_ruler()
+        self.set_warriors(faction, self.warriors.get(faction, 0) - to_remove)
+
+    def set_warriors(self, faction: FactionName, count: int | None):
+        # A count of None removes the faction's entry entirely; an entry of 0 adds no presence
+        delta = (count or 0) - self.warriors.get(faction, 0)
+        if(count is None):
+            self.warriors.pop(faction, None)
+        else:
+            self.warriors[faction] = count
+        if(delta):
+            self.adjust_presence(faction, delta)
     
     # Token Methods
     def add_token(self, token: Token, owner: FactionName):
         self.tokens.setdefault(owner, []).append(token)
+
+    def get_token_count(self, token: Token, owner: FactionName) -> int:
+        return self.tokens.get(owner, []).count(token)
+
+    def remove_token(self, token: Token, owner: FactionName) -> int | None:
+        # Returns the position the token was removed from, or None if there was none
+        owner_tokens = self.tokens.get(owner, [])
+        if(token not in owner_tokens):
+            return None
+        idx = owner_tokens.index(token)
+        owner_tokens.pop(idx)
+        return idx
+
+    def insert_token(self, idx: int, token: Token, owner: FactionName):
+        self.tokens.setdefault(owner, []).insert(idx, token)
+
+    def pop_token(self, owner: FactionName, remove_owner: bool = False):
+        self.tokens[owner].pop()
+        if(remove_owner):
+            del self.tokens[owner]
     
     # Ruler Methods
-    def update_ruler(self):
-        if not self.warriors and not self.buildings:
-            self.ruler = None
-        else:
-            # Determine the faction with the most warriors and buildings
-            faction_counts: dict[FactionName, int] = {}
-            for faction, count in self.warriors.items():
-                faction_counts[faction] = faction_counts.get(faction, 0) + count
-            for building in self.buildings:
-                faction_counts[building.owner] = faction_counts.get(building.owner, 0) + 1
+    def adjust_presence(self, faction: FactionName, delta: int):
+        self.presence[faction] = self.presence.get(faction, 0) + delta
+        self.ruler = resolve_ruler(self.presence.items())
 
-            # Determine the new ruler based on the highest count
-            if faction_counts:
-                self.ruler = max(faction_counts, key=faction_counts.get)
+    def update_ruler(self):
+        # Recount presence from scratch (only needed after replacing warriors/buildings wholesale)
+        self.presence = dict(self.warriors)
+        for building in self.buildings:
+            self.presence[building.owner] = self.presence.get(building.owner, 0) + 1
+        self.ruler = resolve_ruler(self.presence.items())
 
 class Board:
     clearings: list[Clearing]
 
-    def __init__(self):
+    # While set, every mutation appends an inverse operation (fn, *args) so it can be rolled back
+    journal: list | None = None
+
+    # Zobrist hash of the pieces on the board, updated by every mutation (see zobrist.py)
+    zobrist: int = 0
+
+    # Bumped by every change to a clearing; field_versions[clearing][field] is the version that last changed it
+    version: int = 0
+
+    def __init__(self, dice: DiceStream | None = None):
         self.clearings = [Clearing() for _ in range(len(AUTUMN_BOARD_SUITS))]
+        self.clearing_versions = [0] * len(self.clearings)
+        self.field_versions = [[0] * len(CLEARING_FIELDS) for _ in self.clearings]
+        self.what_if_depth = 0
+        self.dice = dice if dice is not None else DiceStream(new_seed())  # Battle rolls; a Game hands in its own stream
 
         for edge in AUTUMN_BOARD_EDGES:
             self.clearings[edge[0]].adjacentClearings.append(edge[1])
@@ -128,10 +215,18 @@ class Board:
 
         for (id, clearing) in enumerate(self.clearings):
             clearing.suit = AUTUMN_BOARD_SUITS[id]
+
+        self.bitboards = Bitboards(AUTUMN_ADJACENCY_MASKS, AUTUMN_SUIT_MASKS)
     
     # Clearing
     def is_valid_clearing(self, clearing_id: int):
         return clearing_id >= 0 and clearing_id < len(self.clearings)
+
+    def get_clearing_ids(self):
+        return range(len(self.clearings))
+
+    def get_adjacent_clearings(self, clearing_id: int) -> list[int]:
+        return self.clearings[clearing_id].adjacentClearings
     
     def get_clearing_suit(self, clearing_id: int):
         if(self.is_valid_clearing(clearing_id=clearing_id)):
@@ -140,86 +235,246 @@ class Board:
     def get_clearing_ruler(self, clearing_id: int):
         if(self.is_valid_clearing(clearing_id=clearing_id)):
             return self.clearings[clearing_id].ruler
+
+    # Bitboard Queries (sets of clearings as bitmasks, see bitboard.py)
+    def get_ruled_mask(self, faction: FactionName) -> int:
+        return self.bitboards.ruled[faction]
+
+    def get_warrior_mask(self, faction: FactionName) -> int:
+        return self.bitboards.warriors[faction]
+
+    def get_suit_mask(self, suit: Suit) -> int:
+        return self.bitboards.suit_masks[suit]
+
+    def get_ruled_neighbours(self, clearing_id: int, faction: FactionName) -> int:
+        return self.bitboards.ruled_neighbours(clearing_id, faction)
+
+    def get_move_destinations(self, faction: FactionName, source_clearing: int) -> int:
+        return self.bitboards.move_destinations(faction, source_clearing)
+
+    def get_contested_clearings(self, faction: FactionName) -> int:
+        return self.bitboards.contested(faction)
+
+    def get_ruled_component(self, clearing_id: int, faction: FactionName) -> int:
+        # Clearings connected to this one through clearings the faction rules (0 if it doesn't rule it)
+        return self.bitboards.components[faction].get_component(clearing_id)
+
+    def get_connected_wood(self, clearing_id: int, faction: FactionName) -> int:
+        # The faction's wood anywhere in the ruled component of this clearing
+        return self.bitboards.components[faction].get_connected_wood(clearing_id)
+
+    def sync_bitboards(self, clearing_id: int, old_ruler: FactionName | None, faction: FactionName | None = None):
+        clearing = self.clearings[clearing_id]
+        if(clearing.ruler != old_ruler):
+            self.touch(clearing_id, RULER_FIELD)
+        self.bitboards.set_ruler(clearing_id, old_ruler, clearing.ruler)
+        if(faction is not None):
+            self.bitboards.set_has_warriors(clearing_id, faction, clearing.warriors.get(faction, 0) > 0)
+
+    def rebuild_bitboards(self):
+        self.bitboards.clear()
+        for (clearing_id, clearing) in enumerate(self.clearings):
+            for (owner, tokens) in clearing.tokens.items():
+                self.bitboards.adjust_wood(clearing_id, owner, tokens.count(Token.WOOD))
+            self.bitboards.set_ruler(clearing_id, None, clearing.ruler)
+            for (faction, count) in clearing.warriors.items():
+                self.bitboards.set_has_warriors(clearing_id, faction, count > 0)
     
+    # Change Tracking
+    def touch(self, clearing_id: int, field: int):
+        # `field` is a position in CLEARING_FIELDS. Speculative changes don't count, as end_what_if undoes them exactly
+        if(self.what_if_depth):
+            return
+        self.version += 1
+        self.clearing_versions[clearing_id] = self.version
+        self.field_versions[clearing_id][field] = self.version
+
+    def changes_since(self, version: int) -> dict[int, ClearingField]:
+        # Clearings changed after `version` (an earlier value of self.version), with the kinds of field that changed.
+        # Changes that were later undone (rollbacks, restores of unrelated state) still count
+        changes: dict[int, ClearingField] = {}
+        for (clearing_id, clearing_version) in enumerate(self.clearing_versions):
+            if(clearing_version > version):
+                fields = ClearingField(0)
+                for (field, field_version) in zip(CLEARING_FIELDS, self.field_versions[clearing_id]):
+                    if(field_version > version):
+                        fields |= field
+                changes[clearing_id] = fields
+        return changes
+
+    # Journal Operations
+    def rollback(self, ops: list):
+        # Undo journaled operations, most recent first
+        for op in reversed(ops):
+            op[0](*op[1:])
+
+    def begin_what_if(self):
+        # Start journaling speculative changes; returns the outer journal to hand back to end_what_if
+        outer_journal = self.journal
+        self.journal = []
+        self.what_if_depth += 1
+        return outer_journal
+
+    def end_what_if(self, outer_journal):
+        # Roll back every change made since begin_what_if
+        ops = self.journal
+        self.journal = None
+        self.rollback(ops)
+        self.journal = outer_journal
+        self.what_if_depth -= 1
+
+    @contextmanager
+    def what_if(self):
+        # `with board.what_if():` rolls back the block's changes on the way out, even if it raises
+        outer_journal = self.begin_what_if()
+        try:
+            yield
+        finally:
+            self.end_what_if(outer_journal)
+
     # Building Operations
     def build(self, clearing_id: int, building_type: BuildingType, owner: FactionName):
         if(self.is_valid_clearing(clearing_id=clearing_id) and self.clearings[clearing_id].can_build()):
-            self.clearings[clearing_id].add_building(Building(type=building_type, owner=owner))
+            clearing = self.clearings[clearing_id]
+            old_ruler = clearing.ruler
+            self.rehash_buildings(clearing_id, building_type, owner, False, 1)
+            clearing.add_building(Building(type=building_type, owner=owner))
+            self.touch(clearing_id, BUILDINGS_FIELD)
+            self.sync_bitboards(clearing_id, old_ruler)
+            if(self.journal is not None):
+                self.journal.append((self.pop_building_at_clearing, clearing_id))
+
+    def pop_building_at_clearing(self, clearing_id: int) -> Building:
+        clearing = self.clearings[clearing_id]
+        old_ruler = clearing.ruler
+        last = clearing.buildings[-1]
+        self.rehash_buildings(clearing_id, last.type, last.owner, last.used, -1)
+        building = clearing.pop_building()
+        self.touch(clearing_id, BUILDINGS_FIELD)
+        self.sync_bitboards(clearing_id, old_ruler)
+        return building
     
     def clearing_has_building(self, clearing_id: int, building_type: BuildingType) -> bool:
         if(self.is_valid_clearing(clearing_id=clearing_id)):
             return self.clearings[clearing_id].has_building(building_type=building_type)
+
+    def get_building_count_at_clearing(self, clearing_id: int, building_type: BuildingType) -> int:
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return sum(1 for building in self.clearings[clearing_id].buildings if building.type == building_type)
+        return 0
+
+    def can_build_at_clearing(self, clearing_id: int) -> bool:
+        return self.is_valid_clearing(clearing_id=clearing_id) and self.clearings[clearing_id].can_build()
+
+    def get_buildings_at_clearing(self, clearing_id: int) -> list[tuple[BuildingType, FactionName, bool]]:
+        # (type, owner, used) for each building, in build order
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return [(building.type, building.owner, building.used) for building in self.clearings[clearing_id].buildings]
+        return []
     
     def mark_all_buildings_unused(self):
-        for clearing in self.clearings:
-            for building in clearing.buildings:
-                building.used = False
+        for (clearing_id, clearing) in enumerate(self.clearings):
+            for (idx, building) in enumerate(clearing.buildings):
+                if(building.used):
+                    self.set_building_used(clearing_id, idx, False)
+
+    def set_building_used(self, clearing_id: int, building_idx: int, used: bool):
+        building = self.clearings[clearing_id].buildings[building_idx]
+        if(self.journal is not None):
+            self.journal.append((self.set_building_used, clearing_id, building_idx, building.used))
+        if(building.used != used):
+            self.rehash_buildings(clearing_id, building.type, building.owner, building.used, -1)
+            self.rehash_buildings(clearing_id, building.type, building.owner, used, 1)
+            self.touch(clearing_id, BUILDINGS_FIELD)
+        building.used = used
     
+    def rehash_buildings(self, clearing_id: int, building_type: BuildingType, owner: FactionName, used: bool, delta: int):
+        # Called before adding/removing `delta` such buildings, with the current count still on the board
+        count = sum(1 for building in self.clearings[clearing_id].buildings
+                    if building.type == building_type and building.owner == owner and building.used == used)
+        self.zobrist ^= recount_key(count, count + delta, "building", clearing_id, building_type, owner, used)
+
     def get_unused_buildings_of_type(self, building_type: BuildingType):
         unused_buildings: dict[int, int] = {}
         for (id, clearing) in enumerate(self.clearings):
             for building in clearing.get_buildings():
-                if(building.type == building_type):
+                if(building.type == building_type and not building.used):
                     unused_buildings[id] = unused_buildings.setdefault(id, 0) + 1
         return unused_buildings
     
     def use_building_at_clearing(self, clearing_id: int, building_type: BuildingType):
         if(self.is_valid_clearing(clearing_id=clearing_id) and self.clearings[clearing_id].has_building(building_type=building_type)):
-            self.clearings[clearing_id].use_building(building_type)
+            building_idx = self.clearings[clearing_id].find_unused_building(building_type)
+            if(building_idx is not None):
+                self.set_building_used(clearing_id, building_idx, True)
     
     # Warrior Operations
+    def get_warrior_count(self, clearing_id: int, faction: FactionName) -> int:
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return self.clearings[clearing_id].get_warrior_count(faction)
+        return 0
+
     def add_warriors_at_clearing(self, clearing_id: int, faction: FactionName, num_warriors: int):
         if(self.is_valid_clearing(clearing_id=clearing_id)):
-            self.clearings[clearing_id].add_warriors(faction=faction, count=num_warriors)
+            clearing = self.clearings[clearing_id]
+            self.set_warriors_at_clearing(clearing_id, faction, clearing.get_warrior_count(faction) + num_warriors)
+
+    def remove_warriors_at_clearing(self, clearing_id: int, faction: FactionName, num_warriors: int):
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            clearing = self.clearings[clearing_id]
+            self.set_warriors_at_clearing(clearing_id, faction, max(0, clearing.get_warrior_count(faction) - num_warriors))
+
+    def set_warriors_at_clearing(self, clearing_id: int, faction: FactionName, count: int | None):
+        # Journal the exact prior entry (including its absence) so rollback restores it
+        clearing = self.clearings[clearing_id]
+        if(self.journal is not None):
+            self.journal.append((self.set_warriors_at_clearing, clearing_id, faction, clearing.warriors.get(faction)))
+        old_ruler = clearing.ruler
+        self.zobrist ^= recount_key(clearing.warriors.get(faction) or 0, count or 0, "warriors", clearing_id, faction)
+        if(clearing.warriors.get(faction) != count):
+            self.touch(clearing_id, WARRIORS_FIELD)
+        clearing.set_warriors(faction, count)
+        self.sync_bitboards(clearing_id, old_ruler, faction)
 
     def move_warriors(self, faction: FactionName, numWarriors: int, source_clearing: int, dest_clearing: int):
         if(self.is_valid_clearing(clearing_id=source_clearing) and self.is_valid_clearing(clearing_id=dest_clearing)):
-            self.clearings[source_clearing].remove_warriors(faction, numWarriors)
-            self.clearings[dest_clearing].add_warriors(faction, numWarriors)
+            self.remove_warriors_at_clearing(source_clearing, faction, numWarriors)
+            self.add_warriors_at_clearing(dest_clearing, faction, numWarriors)
     
-    def can_move(self, faction: FactionName, numWarriors: int, source_clearing: int, dest_clearing: int):
+    def can_move(self, faction: FactionName, numWarriors: int, source_clearing: int, dest_clearing: int) -> Legality:
         if(not self.is_valid_clearing(source_clearing) or not self.is_valid_clearing(dest_clearing)):
-            print("Not a valid source clearing")
-            return False
+            return reject(Rejection.INVALID_CLEARING)
         if(numWarriors <= 0):
-            print("Can't move 0 or negative warriors")
-            return False
-        if(not self.clearings[source_clearing].is_adjacent(dest_clearing)):
-            print("Can't move between non-adj clearings")
-            return False
+            return reject(Rejection.NO_WARRIORS_TO_MOVE)
+        if(not self.bitboards.is_adjacent(source_clearing, dest_clearing)):
+            return reject(Rejection.NOT_ADJACENT)
         if(self.clearings[source_clearing].get_warrior_count(faction) < numWarriors):
-            print("Insufficient warriors at clearing")
-            return False
-        if(not self.clearings[source_clearing].ruler == faction and not self.clearings[dest_clearing].ruler == faction):
-            print("Don't rule either clearing involved in move")
-            return False
+            return reject(Rejection.INSUFFICIENT_WARRIORS)
+        if(not self.bitboards.rules(faction, source_clearing) and not self.bitboards.rules(faction, dest_clearing)):
+            return reject(Rejection.NOT_RULED_MOVE)
         
-        return True
+        return LEGAL
     
-    def can_battle(self, attacker: FactionName, defender: FactionName, clearing_id: int):
+    def can_battle(self, attacker: FactionName, defender: FactionName, clearing_id: int) -> Legality:
         if(not self.is_valid_clearing(clearing_id)):
-            print("Not a valid clearing")
-            return False
+            return reject(Rejection.INVALID_CLEARING)
         if(attacker == defender):
-            print("Can't battle yourself")
-            return False
+            return reject(Rejection.SELF_BATTLE)
         
-        clearing = self.clearings[clearing_id]
-        if(clearing.get_warrior_count(attacker) <= 0 or clearing.get_warrior_count(defender) <= 0):
-            print("Either attacker or defender has no warriors")
-            return False
+        if(not self.bitboards.has_warriors(attacker, clearing_id) or not self.bitboards.has_warriors(defender, clearing_id)):
+            return reject(Rejection.NO_WARRIORS_TO_BATTLE)
 
-        return True
+        return LEGAL
     
     def battle(self, attacker: FactionName, defender: FactionName, clearing_id: int):
         battle_clearing = self.clearings[clearing_id]
-        rolls = [random.randint(0, 3) for _ in range(2)]
+        rolls = [self.dice.roll(), self.dice.roll()]
 
         attack_hits = min(max(rolls), battle_clearing.get_warrior_count(attacker))
         defense_hits = min(min(rolls), battle_clearing.get_warrior_count(defender))
 
-        battle_clearing.remove_warriors(attacker, defense_hits)
-        battle_clearing.remove_warriors(defender, attack_hits)
+        self.remove_warriors_at_clearing(clearing_id, attacker, defense_hits)
+        self.remove_warriors_at_clearing(clearing_id, defender, attack_hits)
         
         # Placeholder for vp scored from battle
         return 0
@@ -227,13 +482,106 @@ class Board:
     # Token Operations
     def add_token_at_clearing(self, clearing_id: int, token: Token, owner: FactionName):
         if(self.is_valid_clearing(clearing_id=clearing_id)):
-            self.clearings[clearing_id].add_token(token=token, owner=owner)
+            clearing = self.clearings[clearing_id]
+            if(self.journal is not None):
+                self.journal.append((self.pop_token_at_clearing, clearing_id, owner, owner not in clearing.tokens))
+            self.rehash_tokens(clearing_id, token, owner, 1)
+            clearing.add_token(token=token, owner=owner)
+            self.touch(clearing_id, TOKENS_FIELD)
+            if(token == Token.WOOD):
+                self.bitboards.adjust_wood(clearing_id, owner, 1)
+
+    def pop_token_at_clearing(self, clearing_id: int, owner: FactionName, remove_owner: bool = False):
+        # Removes the owner's most recently added token
+        clearing = self.clearings[clearing_id]
+        token = clearing.tokens[owner][-1]
+        if(token == Token.WOOD):
+            self.bitboards.adjust_wood(clearing_id, owner, -1)
+        self.rehash_tokens(clearing_id, token, owner, -1)
+        clearing.pop_token(owner, remove_owner)
+        self.touch(clearing_id, TOKENS_FIELD)
+
+    def remove_token_at_clearing(self, clearing_id: int, token: Token, owner: FactionName) -> bool:
+        if(not self.is_valid_clearing(clearing_id=clearing_id)):
+            return False
+        clearing = self.clearings[clearing_id]
+        if(clearing.get_token_count(token, owner) == 0):
+            return False
+        self.rehash_tokens(clearing_id, token, owner, -1)
+        idx = clearing.remove_token(token=token, owner=owner)
+        self.touch(clearing_id, TOKENS_FIELD)
+        if(self.journal is not None):
+            self.journal.append((self.insert_token_at_clearing, clearing_id, idx, token, owner))
+        if(token == Token.WOOD):
+            self.bitboards.adjust_wood(clearing_id, owner, -1)
+        return True
+
+    def insert_token_at_clearing(self, clearing_id: int, idx: int, token: Token, owner: FactionName):
+        self.rehash_tokens(clearing_id, token, owner, 1)
+        self.clearings[clearing_id].insert_token(idx, token, owner)
+        self.touch(clearing_id, TOKENS_FIELD)
+        if(token == Token.WOOD):
+            self.bitboards.adjust_wood(clearing_id, owner, 1)
+
+    def get_token_count_at_clearing(self, clearing_id: int, token: Token, owner: FactionName) -> int:
+        if(self.is_valid_clearing(clearing_id=clearing_id)):
+            return self.clearings[clearing_id].get_token_count(token=token, owner=owner)
+        return 0
+
+    def rehash_tokens(self, clearing_id: int, token: Token, owner: FactionName, delta: int):
+        # Called before adding/removing `delta` such tokens, with the current count still on the board
+        count = self.clearings[clearing_id].get_token_count(token, owner)
+        self.zobrist ^= recount_key(count, count + delta, "token", clearing_id, owner, token)
+
+    # Zobrist Hashing
+    def compute_zobrist(self) -> int:
+        # From scratch; the incremental `zobrist` should always equal this
+        zobrist = 0
+        for (clearing_id, clearing) in enumerate(self.clearings):
+            for (faction, count) in clearing.warriors.items():
+                zobrist ^= count_key(count, "warriors", clearing_id, faction)
+            kinds: dict[tuple, int] = {}
+            for building in clearing.buildings:
+                kind = (building.type, building.owner, building.used)
+                kinds[kind] = kinds.get(kind, 0) + 1
+            for ((building_type, owner, used), count) in kinds.items():
+                zobrist ^= count_key(count, "building", clearing_id, building_type, owner, used)
+            for (owner, tokens) in clearing.tokens.items():
+                for token in set(tokens):
+                    zobrist ^= count_key(tokens.count(token), "token", clearing_id, owner, token)
+        return zobrist
     
+    # Snapshot Operations
+    def snapshot(self):
+        # One (warriors, buildings, tokens, ruler) tuple per clearing; contents are immutable so they can be shared
+        return tuple(
+            (tuple(clearing.warriors.items()),
+             tuple([(building.type, building.owner, building.used) for building in clearing.buildings]),
+             tuple([(owner, tuple(tokens)) for (owner, tokens) in clearing.tokens.items()]),
+             clearing.ruler)
+            for clearing in self.clearings
+        )
+
+    def restore(self, snapshot):
+        for (clearing_id, (old, new)) in enumerate(zip(self.snapshot(), snapshot)):
+            for (field, (old_value, new_value)) in enumerate(zip(old, new)):
+                if(old_value != new_value):
+                    self.touch(clearing_id, field)
+        for (clearing, (warriors, buildings, tokens, _ruler)) in zip(self.clearings, snapshot):
+            clearing.warriors = dict(warriors)
+            clearing.buildings = [Building(type=building_type, owner=owner, used=used) for (building_type, owner, used) in buildings]
+            clearing.tokens = {owner: list(owner_tokens) for (owner, owner_tokens) in tokens}
+            clearing.update_ruler()
+        self.rebuild_bitboards()
+        self.zobrist = self.compute_zobrist()
+
     # Misc Operations
-    def export_clearing_info(self):
+    def export_clearing_info(self, clearing_ids: Iterable[int] | None = None):
+        # Every clearing, or only `clearing_ids` (e.g. those in changes_since)
         clearing_info: dict[int, ClearingInfo] = {}
 
-        for (id, clearing) in enumerate(self.clearings):
+        for id in (self.get_clearing_ids() if clearing_ids is None else clearing_ids):
+            clearing = self.clearings[id]
             clearing_info[id] = ClearingInfo()
             clearing_info[id].tiles = [building.type for building in clearing.buildings]
             clearing_info[id].warriors = {key[0].upper(): value for (key, value) in clearing.warriors.items()}
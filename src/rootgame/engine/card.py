@@ -49,4 +49,5 @@ class VizierCard(Card):
     name: str = "Vizier"
     suit: Suit = Suit.Bird
 
-    
\ No newline at end of file
+# Viziers are all alike and never change, so every decree shares this one
+VIZIER = VizierCard()
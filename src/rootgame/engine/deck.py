@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import random
 
 from rootgame.engine.card import Card
@@ -8,15 +8,27 @@ from rootgame.engine.base_deck import BASE_GAME_DECK
 class Deck:
     cards: list[Card]
 
-    def __init__(self):
+    # While set, draws append an inverse operation (fn, *args) so they can be rolled back
+    journal: list | None = field(default=None, repr=False, compare=False)
+
+    def __init__(self, rng: random.Random | None = None):
         self.cards = list(BASE_GAME_DECK)
+        self.journal = None
+        self.rng = rng if rng is not None else random.Random()
         self.shuffle_deck()
 
     def shuffle_deck(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def draw_card(self, num_cards=1):
         if self.cards and len(self.cards) >= num_cards:
-            return [self.cards.pop() for _ in range(num_cards)]
+            drawn = [self.cards.pop() for _ in range(num_cards)]
+            if self.journal is not None:
+                self.journal.append((self.return_cards, drawn))
+            return drawn
         else:
-            raise IndexError("Deck is empty, cannot draw a card.")
\ No newline at end of file
+            raise IndexError("Deck is empty, cannot draw a card.")
+
+    def return_cards(self, drawn: list[Card]):
+        # Put drawn cards back on top of the deck in their original order
+        self.cards.extend(reversed(drawn))
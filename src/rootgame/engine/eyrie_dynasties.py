@@ -1,16 +1,20 @@
 from dataclasses import dataclass, field
 from enum import StrEnum, auto
-from typing import ClassVar
+from typing import ClassVar, Iterator
 import random
 
-from rootgame.engine.actions import Action, DiscardCardAction, DrawCardAction, BattleAction, EndPhaseAction, EyrieAddToDecreeAction, EyrieMoveAction, EyrieRecruitAction, EyrieBuildAction, EyrieTurmoilAction, EyrieCraftAction
-from rootgame.engine.card import Card, VizierCard, ItemCard
-from rootgame.engine.faction import Faction
+from rootgame.engine.actions import Action, DrawCardAction, BattleAction, EndPhaseAction, EyrieAddToDecreeAction, EyrieMoveAction, EyrieRecruitAction, EyrieBuildAction, EyrieTurmoilAction, EyrieCraftAction
+from rootgame.engine.card import VIZIER, Card, ItemCard
+from rootgame.engine.legality import LEGAL, Legality, Rejection, reject
+from rootgame.engine.faction import Faction, iter_evening_actions, is_evening_action_legal, sample_by_kind
 from rootgame.engine.board import Board
+from rootgame.engine.bitboard import iter_clearings
 from rootgame.engine.building import BuildingType
 from rootgame.engine.player import Player
+from rootgame.engine.game_log import PhaseActions
+from rootgame.engine.zobrist import HashedFields, cards_zobrist, zobrist_key
 
-from rootgame.engine.types import MAX_HAND_SIZE, FactionName, Suit, TurnPhase, DecreeOption, EyrieLeader
+from rootgame.engine.types import FactionName, Suit, TurnPhase, DecreeOption, EyrieLeader
 
 LEADER_VIZIERS = {
     EyrieLeader.DESPOT: [DecreeOption.Move, DecreeOption.Build],
@@ -20,9 +24,13 @@ LEADER_VIZIERS = {
 }
 
 @dataclass
-class EyrieDynasties(Faction):
+class EyrieDynasties(HashedFields, Faction):
     faction_name = FactionName.EYRIE_DYNASTIES
 
+    # Scalars folded into the faction's Zobrist hash whenever they change; the decree and used
+    # leaders are rehashed by the methods that change them (see rehash_decree)
+    hashed_fields: ClassVar[frozenset[str]] = frozenset({"leader", "warriors_placed", "roosts_placed", "extra_cards_to_draw"})
+
     leader: EyrieLeader | None = None
     used_leaders: list[EyrieLeader] = field(default_factory=list)
 
@@ -37,6 +45,8 @@ class EyrieDynasties(Faction):
 
     extra_cards_to_draw: int = 0
 
+    # Picks the new leader after turmoil; a Game hands in its own stream
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
 
     def board_setup(self, board: Board):
         # Place roost in bottom right
@@ -56,8 +66,38 @@ class EyrieDynasties(Faction):
         return [DrawCardAction(num_cards=1 + self.extra_cards_to_draw)]
 
     def reset_state(self):
+        self.zobrist ^= self.decree_zobrist()
         self.decree_actions_taken = {}
+        self.zobrist ^= self.decree_zobrist()
     
+    def snapshot_state(self):
+        return (self.leader, tuple(self.used_leaders),
+                tuple((option, tuple(cards)) for (option, cards) in self.decree.items()),
+                tuple((option, tuple(cards)) for (option, cards) in self.decree_actions_taken.items()),
+                self.warriors_placed, self.roosts_placed, self.extra_cards_to_draw)
+
+    def restore_state(self, state):
+        (self.leader, used_leaders, decree, decree_actions_taken, self.warriors_placed, self.roosts_placed, self.extra_cards_to_draw) = state
+        self.zobrist ^= self.decree_zobrist()
+        self.used_leaders = list(used_leaders)
+        self.decree = {option: list(cards) for (option, cards) in decree}
+        self.decree_actions_taken = {option: list(cards) for (option, cards) in decree_actions_taken}
+        self.zobrist ^= self.decree_zobrist()
+
+    def decree_zobrist(self) -> int:
+        # The decree, the cards resolved from it this turn and the used leaders; small enough to rehash whole
+        zobrist = 0
+        for (option, cards) in self.decree.items():
+            zobrist ^= cards_zobrist(cards, "decree", option)
+        for (option, cards) in self.decree_actions_taken.items():
+            zobrist ^= cards_zobrist(cards, "decree_resolved", option)
+        for leader in self.used_leaders:
+            zobrist ^= zobrist_key("used_leader", leader)
+        return zobrist
+
+    def compute_zobrist(self) -> int:
+        return super().compute_zobrist() ^ self.decree_zobrist()
+
     def get_legal_actions(self, turn_phase: TurnPhase):
          # Implement logic to return legal actions for Eyrie Dynasties based on the turn phase
         legal_actions = ["END PHASE"]
@@ -72,145 +112,183 @@ class EyrieDynasties(Faction):
         
         return legal_actions
     
-    def is_action_legal(self, action: Action, current_phase: TurnPhase, player: Player, board: Board, actions_taken: list[Action]):
+    def iter_legal_actions(self, turn_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player]) -> Iterator[Action]:
+        if(turn_phase == TurnPhase.BIRDSONG):
+            decree_adds = actions_taken.count(EyrieAddToDecreeAction)
+            if(decree_adds >= 1):
+                yield EndPhaseAction()
+            if(decree_adds < 2):
+                for card_id in range(len(player.hand)):
+                    for decree_option in DecreeOption:
+                        yield EyrieAddToDecreeAction(card_id, decree_option)
+
+        elif(turn_phase == TurnPhase.DAYLIGHT):
+            yield from self.iter_daylight_actions(player, board, actions_taken, players)
+
+        elif(turn_phase == TurnPhase.EVENING):
+            yield from iter_evening_actions(player)
+
+    def sample_legal_action(self, turn_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player], rng: random.Random) -> Action | None:
+        # Eyrie moves are single moves, so enumerating everything stays cheap
+        return sample_by_kind(self.iter_legal_actions(turn_phase, player, board, actions_taken, players), rng)
+
+    def iter_daylight_actions(self, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player]) -> Iterator[Action]:
+        # If turmoiled, can only end phase
+        if(actions_taken.last_type() is EyrieTurmoilAction):
+            yield EndPhaseAction()
+            return
+
+        yield EyrieTurmoilAction()
+
+        if(actions_taken.last_type() in (None, EyrieCraftAction)):
+            for (card_idx, card) in enumerate(player.hand):
+                if(isinstance(card, ItemCard) and self.has_roosts_to_craft(card, board)):
+                    yield EyrieCraftAction(card_idx)
+
+        # Only the first unresolved decree column can be acted on
+        if(not self.resolved_decree_option(DecreeOption.Recruit)):
+            if(self.warriors_placed < self.warrior_limit):
+                for clearing_id in board.get_clearing_ids():
+                    if(board.clearing_has_building(clearing_id, BuildingType.ROOST) and self.suit_exists_in_decree_option(DecreeOption.Recruit, board.get_clearing_suit(clearing_id))):
+                        yield EyrieRecruitAction(clearing_id)
+
+        elif(not self.resolved_decree_option(DecreeOption.Move)):
+            for source in iter_clearings(board.get_warrior_mask(self.faction_name)):
+                if(not self.suit_exists_in_decree_option(DecreeOption.Move, board.get_clearing_suit(source))):
+                    continue
+                num_warriors = board.get_warrior_count(source, self.faction_name)
+                for dest in iter_clearings(board.get_move_destinations(self.faction_name, source)):
+                    for count in range(1, num_warriors + 1):
+                        yield EyrieMoveAction(count, source, dest)
+
+        elif(not self.resolved_decree_option(DecreeOption.Battle)):
+            for clearing_id in iter_clearings(board.get_contested_clearings(self.faction_name)):
+                if(not self.suit_exists_in_decree_option(DecreeOption.Battle, board.get_clearing_suit(clearing_id))):
+                    continue
+                for defender in players:
+                    if(defender is not player and board.get_warrior_count(clearing_id, defender.faction.faction_name) > 0):
+                        yield BattleAction(clearing_id, player, defender)
+
+        elif(not self.resolved_decree_option(DecreeOption.Build)):
+            if(self.roosts_placed < self.roost_limit):
+                for clearing_id in board.get_clearing_ids():
+                    if(board.get_clearing_ruler(clearing_id) == self.faction_name and board.can_build_at_clearing(clearing_id)
+                       and not board.clearing_has_building(clearing_id, BuildingType.ROOST)
+                       and self.suit_exists_in_decree_option(DecreeOption.Build, board.get_clearing_suit(clearing_id))):
+                        yield EyrieBuildAction(clearing_id)
+
+        else:
+            yield EndPhaseAction()
+
+    def is_action_legal(self, action: Action, current_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions) -> Legality:
         if(current_phase == TurnPhase.BIRDSONG):
             if(isinstance(action, EyrieAddToDecreeAction)):
-                if(sum(isinstance(a, EyrieAddToDecreeAction) for a in actions_taken) == 2):
-                    return False
+                if(actions_taken.count(EyrieAddToDecreeAction) == 2):
+                    return reject(Rejection.DECREE_FULL)
                 if(action.card_id >= len(player.hand) or action.card_id < 0):
-                    return False
+                    return reject(Rejection.INVALID_CARD)
                 if(action.decree_option not in DecreeOption):
-                    return False
-                return True
+                    return reject(Rejection.UNKNOWN_ACTION)
+                return LEGAL
             
             elif(isinstance(action, EndPhaseAction)):
-                if(sum(isinstance(a, EyrieAddToDecreeAction) for a in actions_taken) == 0):
-                    return False
-                return True
+                if(actions_taken.count(EyrieAddToDecreeAction) == 0):
+                    return reject(Rejection.DECREE_EMPTY)
+                return LEGAL
             
-            return False
+            return reject(Rejection.WRONG_PHASE)
         
         elif(current_phase == TurnPhase.DAYLIGHT):
             # If turmoiled, can only end phase
-            if(len(actions_taken) and isinstance(actions_taken[-1], EyrieTurmoilAction)):
+            if(actions_taken.last_type() is EyrieTurmoilAction):
                 if(isinstance(action, EndPhaseAction)):
-                    return True
-                return False
+                    return LEGAL
+                return reject(Rejection.IN_TURMOIL)
             
             # Can always turmoil during daylight (for now)
             if(isinstance(action, EyrieTurmoilAction)):
-                return True
+                return LEGAL
         
             # Must do all crafting at start (first action, or following another craft actions)
             if(isinstance(action, EyrieCraftAction)):
-                print("Validating craft")
                 if(action.card_idx >= len(player.hand) or action.card_idx < 0):
-                    print("Invalid card index")
-                    return False
-                if(not len(actions_taken) == 0):
-                    print(actions_taken)
-                    if(not isinstance(actions_taken[-1], EyrieCraftAction)):
-                        print("Not start of turn")
-                        return False
+                    return reject(Rejection.INVALID_CARD)
+                if(actions_taken.last_type() not in (None, EyrieCraftAction)):
+                    return reject(Rejection.CRAFT_NOT_FIRST)
                 if(not isinstance(player.hand[action.card_idx], ItemCard)):
-                    print("Not item card")
-                    return False
+                    return reject(Rejection.NOT_ITEM_CARD)
                 
                 # Check if there are enough unused roosts
-                card_to_craft: ItemCard = player.hand[action.card_idx]
-                unused_roost_cnts = board.get_unused_buildings_of_type(building_type=BuildingType.ROOST)
-
-                if(sum(card_to_craft.crafting_requirements.values()) > sum(unused_roost_cnts.values())):
-                    print("Not enough roosts")
-                    return False
-
-                unused_roots_by_suit = {}
-                for (clearing_id, roost_cnt) in unused_roost_cnts.items():
-                    clearing_suit = board.get_clearing_suit(clearing_id=clearing_id)
-                    unused_roots_by_suit[clearing_suit] = unused_roots_by_suit.get(clearing_suit, 0) + roost_cnt
-
-                for (suit, req_cnt) in card_to_craft.crafting_requirements.items():
-                    if(suit == Suit.Bird): continue
-                    if(unused_roots_by_suit.get(suit, 0) < req_cnt):
-                        print(f"Not enough roosts of suit {suit}")
-                        return False
-                
-                return True
+                return self.has_roosts_to_craft(player.hand[action.card_idx], board)
             
             # If recruit actions left, must finish them
             if(not self.resolved_decree_option(DecreeOption.Recruit)):
                 if(isinstance(action, EyrieRecruitAction)):
                     if(not board.is_valid_clearing(action.clearing_id)):
-                        return False
+                        return reject(Rejection.INVALID_CLEARING)
                     if(DecreeOption.Recruit not in self.decree or len(self.decree.get(DecreeOption.Recruit, [])) == 0):
-                        return False
+                        return reject(Rejection.NOT_IN_DECREE, DecreeOption.Recruit)
                     if(not self.suit_exists_in_decree_option(DecreeOption.Recruit, board.get_clearing_suit(action.clearing_id))):
-                        return False
+                        return reject(Rejection.NOT_IN_DECREE, DecreeOption.Recruit)
                     if(not board.clearing_has_building(clearing_id=action.clearing_id, building_type=BuildingType.ROOST)):
-                        return False
+                        return reject(Rejection.MISSING_BUILDING, BuildingType.ROOST)
                     if(self.warriors_placed == self.warrior_limit):
-                        return False
-                    return True
-                return False
+                        return reject(Rejection.OUT_OF_WARRIORS)
+                    return LEGAL
+                return reject(Rejection.DECREE_ORDER, DecreeOption.Recruit)
             
             elif(not self.resolved_decree_option(DecreeOption.Move)):
                 if(isinstance(action, EyrieMoveAction)):
-                    if(not board.can_move(self.faction_name, action.num_warriors, action.source_clearing, action.destination_clearing)):
-                        return False
+                    can_move = board.can_move(self.faction_name, action.num_warriors, action.source_clearing, action.destination_clearing)
+                    if(not can_move):
+                        return can_move
                     if(not self.suit_exists_in_decree_option(DecreeOption.Move, board.get_clearing_suit(action.source_clearing))):
-                        return False
-                    return True
-                return False
+                        return reject(Rejection.NOT_IN_DECREE, DecreeOption.Move)
+                    return LEGAL
+                return reject(Rejection.DECREE_ORDER, DecreeOption.Move)
             
             elif(not self.resolved_decree_option(DecreeOption.Battle)):
                 if(isinstance(action, BattleAction)):
-                    if(not board.can_battle(self.faction_name, action.defender.faction.faction_name, action.clearing_id)):
-                        return False
+                    if(action.attacker is not player):
+                        return reject(Rejection.NOT_ATTACKER)
+                    can_battle = board.can_battle(self.faction_name, action.defender.faction.faction_name, action.clearing_id)
+                    if(not can_battle):
+                        return can_battle
                     if(not self.suit_exists_in_decree_option(DecreeOption.Battle, board.get_clearing_suit(action.clearing_id))):
-                        return False
-                    return True
-                return False
+                        return reject(Rejection.NOT_IN_DECREE, DecreeOption.Battle)
+                    return LEGAL
+                return reject(Rejection.DECREE_ORDER, DecreeOption.Battle)
             
             elif(not self.resolved_decree_option(DecreeOption.Build)):
                 if(isinstance(action, EyrieBuildAction)):
                     if(not self.suit_exists_in_decree_option(DecreeOption.Build, board.get_clearing_suit(action.clearing_id))):
-                        return False
+                        return reject(Rejection.NOT_IN_DECREE, DecreeOption.Build)
                     if(not board.get_clearing_ruler(action.clearing_id) == self.faction_name):
-                        return False
+                        return reject(Rejection.NOT_RULER)
                     if(board.clearing_has_building(clearing_id=action.clearing_id, building_type=BuildingType.ROOST)):
-                        return False
+                        return reject(Rejection.ALREADY_BUILT, BuildingType.ROOST)
+                    if(not board.can_build_at_clearing(action.clearing_id)):
+                        return reject(Rejection.NO_BUILDING_SLOT)
                     if(self.roosts_placed == self.roost_limit):
-                        return False
-                    return True
-                return False
+                        return reject(Rejection.OUT_OF_BUILDINGS, BuildingType.ROOST)
+                    return LEGAL
+                return reject(Rejection.DECREE_ORDER, DecreeOption.Build)
             
             elif(isinstance(action, EndPhaseAction)):
-                return True
+                return LEGAL
                 
-        elif(current_phase == TurnPhase.EVENING):            
-            if(isinstance(action, DiscardCardAction)):
-                if(len(player.hand) < MAX_HAND_SIZE):
-                    return False
-                if(len(player.hand) - len(action.card_ids) != MAX_HAND_SIZE):
-                    return False
-                if(any(card_id >= len(player.hand) or card_id < 0 for card_id in action.card_ids)):
-                    return False
-                return True
-            
-            elif(isinstance(action, EndPhaseAction)):
-                if(len(player.hand) > MAX_HAND_SIZE):
-                    return False
-                return True
-            
-            return False
+        elif(current_phase == TurnPhase.EVENING):
+            return is_evening_action_legal(action, player)
         
-        return False
+        return reject(Rejection.WRONG_PHASE)
     
     def apply_action(self, action: Action, board: Board, player: Player):
+            vp_scored: int = 0
+
             if(isinstance(action, EyrieAddToDecreeAction)):
                 card = player.hand[action.card_id]
                 self.add_to_decree(card, action.decree_option)
-                player.hand.pop(action.card_id)
+                player.pop_card(action.card_id)
 
             elif(isinstance(action, EyrieRecruitAction)):
                 board.add_warriors_at_clearing(clearing_id=action.clearing_id, faction=self.faction_name, num_warriors=1)
@@ -218,7 +296,7 @@ class EyrieDynasties(Faction):
 
             elif(isinstance(action, EyrieMoveAction)):
                 board.move_warriors(self.faction_name, action.num_warriors, action.source_clearing, action.destination_clearing)
-                self.take_decree_action(board.get_clearing_suit(action.clearing_id), DecreeOption.Move)
+                self.take_decree_action(board.get_clearing_suit(action.source_clearing), DecreeOption.Move)
 
             elif(isinstance(action, BattleAction)):
                 board.battle(self.faction_name, action.defender.faction.faction_name, action.clearing_id)
@@ -232,13 +310,17 @@ class EyrieDynasties(Faction):
                 self.turmoil()
             
             elif(isinstance(action, EyrieCraftAction)):
-                used_card: ItemCard = player.hand.pop(action.card_idx)
+                used_card: ItemCard = player.pop_card(action.card_idx)
                 self.craft(card=used_card, board=board)
 
+            return vp_scored
+
     def add_to_decree(self, card: Card, decree_option: DecreeOption):
+        self.zobrist ^= self.decree_zobrist()
         if decree_option not in self.decree:
             self.decree[decree_option] = []
         self.decree[decree_option].append(card)
+        self.zobrist ^= self.decree_zobrist()
     
     def get_remaining_decree(self, decree_option: DecreeOption):
         return [card for card in self.decree.get(decree_option, []) if card not in self.decree_actions_taken.get(decree_option, [])]
@@ -248,14 +330,19 @@ class EyrieDynasties(Faction):
         remaining_cards = self.get_remaining_decree(decree_option)
         for card in remaining_cards:
             if(card.suit == suit):
-                self.decree_actions_taken.setdefault(decree_option, []).append(card)
+                self.resolve_decree_card(card, decree_option)
                 return
         
         # Default to using bird card if not found
         for card in remaining_cards:
             if(card.suit == Suit.Bird):
-                self.decree_actions_taken.setdefault(decree_option, []).append(card)
+                self.resolve_decree_card(card, decree_option)
                 return
+
+    def resolve_decree_card(self, card: Card, decree_option: DecreeOption):
+        self.zobrist ^= self.decree_zobrist()
+        self.decree_actions_taken.setdefault(decree_option, []).append(card)
+        self.zobrist ^= self.decree_zobrist()
         
     def resolved_decree_option(self, decree_option: DecreeOption):
         if(len(self.decree.get(decree_option, [])) - len(self.decree_actions_taken.get(decree_option, [])) == 0):
@@ -272,9 +359,10 @@ class EyrieDynasties(Faction):
     
     def set_leader_viziers(self):
         for decree_option in LEADER_VIZIERS[self.leader]:
-            self.decree.setdefault(decree_option, []).append(VizierCard())
+            self.add_to_decree(VIZIER, decree_option)
 
     def turmoil(self):
+        self.zobrist ^= self.decree_zobrist()
         self.decree = {}
         self.decree_actions_taken = {}
         self.used_leaders.append(self.leader)
@@ -283,9 +371,28 @@ class EyrieDynasties(Faction):
             self.used_leaders = []
 
         leader_options = [leader for leader in EyrieLeader if leader not in self.used_leaders]
-        self.leader = random.choice(leader_options)
+        self.leader = self.rng.choice(leader_options)
+        self.zobrist ^= self.decree_zobrist()
         self.set_leader_viziers()
     
+    def has_roosts_to_craft(self, card: ItemCard, board: Board) -> Legality:
+        unused_roost_cnts = board.get_unused_buildings_of_type(building_type=BuildingType.ROOST)
+
+        if(sum(card.crafting_requirements.values()) > sum(unused_roost_cnts.values())):
+            return reject(Rejection.NOT_ENOUGH_CRAFTERS, BuildingType.ROOST)
+
+        unused_roots_by_suit = {}
+        for (clearing_id, roost_cnt) in unused_roost_cnts.items():
+            clearing_suit = board.get_clearing_suit(clearing_id=clearing_id)
+            unused_roots_by_suit[clearing_suit] = unused_roots_by_suit.get(clearing_suit, 0) + roost_cnt
+
+        for (suit, req_cnt) in card.crafting_requirements.items():
+            if(suit == Suit.Bird): continue
+            if(unused_roots_by_suit.get(suit, 0) < req_cnt):
+                return reject(Rejection.NOT_ENOUGH_CRAFTERS_OF_SUIT, BuildingType.ROOST, suit)
+
+        return LEGAL
+
     def craft(self, card: ItemCard, board: Board):
         unused_roosts = board.get_unused_buildings_of_type(building_type=BuildingType.ROOST)
         crafting_requirements = card.crafting_requirements.copy()
@@ -1,9 +1,13 @@
-from typing import Protocol
-from rootgame.engine.actions import Action
+import itertools
+import random
+from typing import Iterable, Iterator, Protocol
+from rootgame.engine.actions import Action, DiscardCardAction, EndPhaseAction
 from rootgame.engine.board import Board
+from rootgame.engine.legality import LEGAL, Legality, Rejection, reject
 
 from rootgame.engine.player import Player
-from rootgame.engine.types import FactionName, TurnPhase
+from rootgame.engine.game_log import PhaseActions
+from rootgame.engine.types import FactionName, TurnPhase, MAX_HAND_SIZE
 
 class Faction(Protocol):
     faction_name: FactionName
@@ -14,7 +18,13 @@ class Faction(Protocol):
     def get_legal_actions(self, turn_phase: TurnPhase):
         ...
     
-    def is_action_legal(self, action: Action, current_phase: TurnPhase, player: Player, board: Board, actions_taken: list[Action]):
+    def iter_legal_actions(self, turn_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player]) -> Iterator[Action]:
+        ...
+
+    def sample_legal_action(self, turn_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player], rng: random.Random) -> Action | None:
+        ...
+
+    def is_action_legal(self, action: Action, current_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions) -> Legality:
         ...
     
     def apply_action(self, action: Action, board: Board, player: Player):
@@ -27,4 +37,49 @@ class Faction(Protocol):
         ...
     
     def pre_evening_actions(self):
-        ...
\ No newline at end of file
+        ...
+
+    def snapshot_state(self):
+        ...
+
+    def restore_state(self, state):
+        ...
+
+def group_by_kind(actions: Iterable[Action]) -> dict[type, list[Action]]:
+    by_kind: dict[type, list[Action]] = {}
+    for action in actions:
+        by_kind.setdefault(type(action), []).append(action)
+    return by_kind
+
+def sample_by_kind(actions: Iterable[Action], rng: random.Random) -> Action | None:
+    # Uniform over the kinds of action on offer, then over the actions of that kind, so a kind
+    # with thousands of variants (marches, discards) doesn't crowd out the rest
+    by_kind = group_by_kind(actions)
+    if(not by_kind):
+        return None
+    return rng.choice(by_kind[rng.choice(list(by_kind))])
+
+def iter_evening_actions(player: Player) -> Iterator[Action]:
+    # Evening is the same for every faction: discard down to the hand limit, then end the phase
+    if(len(player.hand) > MAX_HAND_SIZE):
+        for card_ids in itertools.combinations(range(len(player.hand)), len(player.hand) - MAX_HAND_SIZE):
+            yield DiscardCardAction(list(card_ids))
+    else:
+        yield EndPhaseAction()
+
+def is_evening_action_legal(action: Action, player: Player) -> Legality:
+    if(isinstance(action, DiscardCardAction)):
+        if(len(player.hand) < MAX_HAND_SIZE):
+            return reject(Rejection.NOTHING_TO_DISCARD)
+        if(len(player.hand) - len(action.card_ids) != MAX_HAND_SIZE):
+            return reject(Rejection.WRONG_DISCARD_COUNT, MAX_HAND_SIZE)
+        if(any(card_id >= len(player.hand) or card_id < 0 for card_id in action.card_ids)):
+            return reject(Rejection.INVALID_CARD)
+        return LEGAL
+
+    elif(isinstance(action, EndPhaseAction)):
+        if(len(player.hand) > MAX_HAND_SIZE):
+            return reject(Rejection.HAND_OVER_LIMIT, MAX_HAND_SIZE)
+        return LEGAL
+
+    return reject(Rejection.WRONG_PHASE)
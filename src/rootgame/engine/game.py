@@ -1,6 +1,8 @@
 import random
+from dataclasses import dataclass, field
+from typing import Iterable
 
-from rootgame.engine.game_log import GameLog
+from rootgame.engine.game_log import GameLog, PhaseActions
 from rootgame.engine.board import Board
 from rootgame.engine.deck import Deck
 from rootgame.engine.player import Player
@@ -9,9 +11,26 @@ from rootgame.engine.marquise_de_cat import MarquiseDeCat
 from rootgame.engine.eyrie_dynasties import EyrieDynasties
 
 from rootgame.engine.actions import *
+from rootgame.engine.legality import Legality
+from rootgame.engine.rng import DiceStream, new_seed
+from rootgame.engine.zobrist import zobrist_key
 
 from rootgame.engine.types import TurnPhase, EyrieLeader
 
+@dataclass
+class UndoRecord:
+    # Inverse operations (fn, *args) journaled by the board, deck, hands and log, applied most recent first
+    ops: list = field(default_factory=list)
+
+    # Game and faction state from before the action
+    round: int = 0
+    current_player: Player | None = None
+    current_phase: TurnPhase = TurnPhase.BIRDSONG
+    scores: tuple[int, ...] = ()
+    faction_states: tuple = ()
+    rng_state: tuple | None = None
+    dice_counter: int = 0
+
 class Game:
     players: list[Player]
     board: Board
@@ -24,19 +43,25 @@ class Game:
     current_player: Player | None = None
     current_phase: TurnPhase = TurnPhase.BIRDSONG
 
-    def __init__(self):
+    def __init__(self, board: Board | None = None, seed: int | None = None):
+        # All randomness in the game comes from these two streams, so (seed, actions) replays it exactly
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = random.Random(self.seed)
+        self.dice = DiceStream.for_seed(self.seed)  # battle rolls, counter-based so batches can draw them together
+
         # Initialize players, board, and game state
-        self.players = [Player() for _ in range(2)]  # Assuming 2 players for now
-        self.players[1].faction = EyrieDynasties(EyrieLeader.BUILDER)
+        self.players = [Player(seat=seat) for seat in range(2)]  # Assuming 2 players for now
+        self.players[1].faction = EyrieDynasties(EyrieLeader.BUILDER, rng=self.rng)
         self.players[0].faction = MarquiseDeCat()
 
         self.current_player = self.players[0]
 
-        self.deck = Deck()
+        self.deck = Deck(self.rng)
         for player in self.players:
-            player.hand = self.deck.draw_card(3)  # Each player starts with 3 cards
+            player.set_hand(self.deck.draw_card(3))  # Each player starts with 3 cards
 
-        self.board = Board()
+        self.board = board if board is not None else Board()  # Any backend with the Board API, e.g. ArrayBoard
+        self.board.dice = self.dice
         self.new_game_board_setup()
 
         self.game_log = GameLog()
@@ -46,6 +71,14 @@ class Game:
         for action in actions_to_run:
             self.apply_action(action)
 
+    @classmethod
+    def replay(cls, seed: int, actions: Iterable[Action], board: Board | None = None) -> "Game":
+        # Rebuild a game from its seed and the actions the players chose (automatic actions replay themselves)
+        game = cls(board=board, seed=seed)
+        for action in actions:
+            game.apply_action(action)
+        return game
+
     def new_game_board_setup(self):
         for p in self.players:
             p.faction.board_setup(self.board)
@@ -53,10 +86,63 @@ class Game:
     def get_legal_actions(self):
         return self.current_player.faction.get_legal_actions(self.current_phase)
     
-    def is_action_legal(self, action: Action):
+    def iter_legal_actions(self):
+        return self.current_player.faction.iter_legal_actions(self.current_phase, self.current_player, self.board, self.game_log.get_actions_for_turn_phase(self.round, self.current_phase), self.players)
+
+    def sample_legal_action(self, rng: random.Random) -> Action | None:
+        # A random legal action, by kind and then within the kind, without enumerating every march
+        return self.current_player.faction.sample_legal_action(self.current_phase, self.current_player, self.board, self.game_log.get_actions_for_turn_phase(self.round, self.current_phase), self.players, rng)
+
+    def is_action_legal(self, action: Action) -> Legality:
+        # Falsy when illegal; the result's message explains why
         return self.current_player.faction.is_action_legal(action, self.current_phase, self.current_player, self.board, self.game_log.get_actions_for_turn_phase(self.round, self.current_phase))
             
-    def apply_action(self, action: Action):
+    def apply_action(self, action: Action, record_undo: bool = False) -> UndoRecord | None:
+        if(not record_undo):
+            self.resolve_action(action)
+            return None
+
+        record = UndoRecord(
+            round=self.round,
+            current_player=self.current_player,
+            current_phase=self.current_phase,
+            scores=tuple([player.score for player in self.players]),
+            faction_states=tuple([player.faction.snapshot_state() for player in self.players]),
+            rng_state=self.rng.getstate(),
+            dice_counter=self.dice.counter,
+        )
+        outer_journal = self.board.journal
+        self.set_journal(record.ops)
+        try:
+            self.resolve_action(action)
+        finally:
+            self.set_journal(outer_journal)
+        return record
+
+    def undo(self, record: UndoRecord):
+        outer_journal = self.board.journal
+        self.set_journal(None)
+        for op in reversed(record.ops):
+            op[0](*op[1:])
+        self.set_journal(outer_journal)
+
+        self.round = record.round
+        self.current_player = record.current_player
+        self.current_phase = record.current_phase
+        for (player, score, faction_state) in zip(self.players, record.scores, record.faction_states):
+            player.score = score
+            player.faction.restore_state(faction_state)
+        self.rng.setstate(record.rng_state)
+        self.dice.counter = record.dice_counter
+
+    def set_journal(self, journal: list | None):
+        self.board.journal = journal
+        self.deck.journal = journal
+        self.game_log.journal = journal
+        for player in self.players:
+            player.journal = journal
+
+    def resolve_action(self, action: Action):
         # Log the action
         self.game_log.log_action(self.round, self.current_player, self.current_phase, action)
 
@@ -68,7 +154,7 @@ class Game:
                 # Do pre-evening actions
                 actions_to_run = self.current_player.faction.pre_evening_actions()
                 for action in actions_to_run:
-                    self.apply_action(action)
+                    self.resolve_action(action)
 
                 self.current_phase = TurnPhase.EVENING
 
@@ -85,10 +171,10 @@ class Game:
                 # Do pre-birdsong actions for next player
                 actions_to_run = self.current_player.faction.pre_birdsong_actions()
                 for action in actions_to_run:
-                    self.apply_action(action)
+                    self.resolve_action(action)
 
         elif(isinstance(action, DrawCardAction)):
-            self.current_player.hand.extend(self.deck.draw_card(action.num_cards))
+            self.current_player.add_cards(self.deck.draw_card(action.num_cards))
         elif(isinstance(action, DiscardCardAction)):
             self.discard_cards(self.current_player, action.card_ids)
         else:
@@ -96,19 +182,63 @@ class Game:
             self.current_player.score += vp_scored
 
     def play_card(self, player: Player, card_idx: int):
-        card = player.hand[card_idx]
-        player.hand.pop(card_idx)  # Remove the card from player's hand
+        card = player.pop_card(card_idx)  # Remove the card from player's hand
         print(f"Playing card: {card.suit}")
     
     def discard_cards(self, player: Player, cards: list[int]):
-        new_hand = list()
-        for (id, card) in enumerate(player.hand):
-            if(not id in cards):
-                new_hand.append(card)
-        player.hand = new_hand
-
-    def get_clearing_state(self):
-        return self.board.export_clearing_info()
+        player.remove_cards(cards)
+
+    # Snapshots
+    def snapshot(self):
+        # Compact, immutable encoding of the full game state. Cards and actions are never mutated, so they are shared by reference
+        return (
+            self.round,
+            self.players.index(self.current_player),
+            self.current_phase,
+            tuple([(player.score, tuple(player.hand), player.faction.snapshot_state()) for player in self.players]),
+            tuple(self.deck.cards),
+            self.board.snapshot(),
+            self.game_log.snapshot(),
+            (self.rng.getstate(), self.dice.counter),
+        )
+
+    def restore(self, snapshot):
+        (self.round, current_player_idx, self.current_phase, players, deck, board, game_log, (rng_state, dice_counter)) = snapshot
+        self.current_player = self.players[current_player_idx]
+        for (player, (score, hand, faction_state)) in zip(self.players, players):
+            player.score = score
+            player.set_hand(list(hand))
+            player.faction.restore_state(faction_state)
+        self.deck.cards = list(deck)
+        self.board.restore(board)
+        self.game_log.restore(game_log)
+        self.rng.setstate(rng_state)
+        self.dice.counter = dice_counter
+
+    # Zobrist Hashing
+    @property
+    def zobrist(self) -> int:
+        # Hash of the board, hands, faction state, scores, turn, this phase's actions and deck size; each part is kept current as it changes
+        zobrist = (self.board.zobrist
+                   ^ self.game_log.get_actions_for_turn_phase(self.round, self.current_phase).zobrist
+                   ^ zobrist_key("turn", self.current_player.seat, self.current_phase.name)
+                   ^ zobrist_key("deck", len(self.deck.cards)))
+        for player in self.players:
+            zobrist ^= player.zobrist ^ player.faction.zobrist ^ zobrist_key("score", player.seat, player.score)
+        return zobrist
+
+    def compute_zobrist(self) -> int:
+        # From scratch, for checking the incremental hash
+        zobrist = (self.board.compute_zobrist()
+                   ^ PhaseActions(self.game_log.get_actions_for_turn_phase(self.round, self.current_phase)).zobrist
+                   ^ zobrist_key("turn", self.current_player.seat, self.current_phase.name)
+                   ^ zobrist_key("deck", len(self.deck.cards)))
+        for player in self.players:
+            zobrist ^= player.compute_zobrist() ^ player.faction.compute_zobrist() ^ zobrist_key("score", player.seat, player.score)
+        return zobrist
+
+    def get_clearing_state(self, clearing_ids: Iterable[int] | None = None):
+        return self.board.export_clearing_info(clearing_ids)
     
     def get_board_edges(self):
         return self.board.get_edges()
\ No newline at end of file
@@ -1,23 +1,122 @@
 from dataclasses import dataclass, field
+from typing import Iterable
 
 from rootgame.engine.player import Player
 from rootgame.engine.actions import Action
 from rootgame.engine.types import TurnPhase
+from rootgame.engine.zobrist import recount_key
+
+class PhaseActions:
+    """
+    The actions logged in one phase of one turn.
+
+    Reads like a list of actions, and also keeps a count per action type so that rule checks
+    ("recruited yet?", "how many daylight actions?") don't rescan the phase. The counts are
+    also Zobrist hashed, as they decide which actions are still legal this phase.
+    """
+    __slots__ = ("actions", "counts", "zobrist")
+
+    def __init__(self, actions: Iterable[Action] = ()):
+        self.actions: list[Action] = []
+        self.counts: dict[type, int] = {}
+        self.zobrist = 0
+        for action in actions:
+            self.append(action)
+
+    def append(self, action: Action):
+        self.actions.append(action)
+        count = self.counts.get(type(action), 0)
+        self.counts[type(action)] = count + 1
+        self.zobrist ^= recount_key(count, count + 1, "phase_actions", type(action).__name__)
+
+    def pop(self) -> Action:
+        action = self.actions.pop()
+        count = self.counts[type(action)]
+        self.counts[type(action)] = count - 1
+        self.zobrist ^= recount_key(count, count - 1, "phase_actions", type(action).__name__)
+        return action
+
+    def count(self, *action_types: type) -> int:
+        # Actions logged this phase of any of the given types
+        return sum(self.counts.get(action_type, 0) for action_type in action_types)
+
+    def last_type(self) -> type | None:
+        return type(self.actions[-1]) if self.actions else None
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __iter__(self):
+        return iter(self.actions)
+
+    def __getitem__(self, idx):
+        return self.actions[idx]
+
+    def __eq__(self, other):
+        if(isinstance(other, PhaseActions)):
+            return self.actions == other.actions
+        return self.actions == other
+
+    def __repr__(self):
+        return repr(self.actions)
 
 @dataclass
 class GameLog:
-    actions_taken: list[tuple[Player, dict[TurnPhase, list[Action]]]] = field(default_factory=list)
+    actions_taken: list[tuple[Player, dict[TurnPhase, PhaseActions]]] = field(default_factory=list)
+
+    # While set, logged actions append an inverse operation (fn, *args) so they can be rolled back
+    journal: list | None = field(default=None, repr=False, compare=False)
 
     def log_action(self, turn: int, player: Player, phase: TurnPhase, action: Action):
+        if(self.journal is not None):
+            self.journal.append((self.unlog_action, turn, phase))
+
         if(len(self.actions_taken) <= turn):
-            self.actions_taken.append((player, {phase: [action]}))
+            self.actions_taken.append((player, {phase: PhaseActions([action])}))
         else:
             if phase not in self.actions_taken[turn][1]:
-                self.actions_taken[turn][1][phase] = []
+                self.actions_taken[turn][1][phase] = PhaseActions()
             self.actions_taken[turn][1][phase].append(action)
+
+    def unlog_action(self, turn: int, phase: TurnPhase):
+        # Remove the last action logged for the phase, along with any phase/turn entry it created
+        phases = self.actions_taken[turn][1]
+        phases[phase].pop()
+        if(not phases[phase]):
+            del phases[phase]
+            if(not phases):
+                self.actions_taken.pop(turn)
+                self.reopen_last_turn()
+
+    def reopen_last_turn(self):
+        # Snapshots share completed turns by reference, so give the re-opened turn its own copy
+        if(self.actions_taken):
+            (player, phases) = self.actions_taken[-1]
+            self.actions_taken[-1] = (player, {phase: PhaseActions(actions) for (phase, actions) in phases.items()})
         
-    def get_actions_for_turn_phase(self, turn: int, phase: TurnPhase):
+    def get_actions_for_turn_phase(self, turn: int, phase: TurnPhase) -> PhaseActions:
         if(turn < len(self.actions_taken)):
-            return self.actions_taken[turn][1].get(phase, [])
-        else:
-            return []
\ No newline at end of file
+            phases = self.actions_taken[turn][1]
+            if(phase in phases):
+                return phases[phase]
+        return PhaseActions()
+
+    def count_actions(self, turn: int, phase: TurnPhase, *action_types: type) -> int:
+        return self.get_actions_for_turn_phase(turn, phase).count(*action_types)
+
+    def get_last_action_type(self, turn: int, phase: TurnPhase) -> type | None:
+        return self.get_actions_for_turn_phase(turn, phase).last_type()
+
+    def snapshot(self):
+        # Earlier turns are never appended to again, so only the current turn needs copying
+        if(not self.actions_taken):
+            return ((), None)
+        (player, phases) = self.actions_taken[-1]
+        return (tuple(self.actions_taken[:-1]), (player, tuple((phase, tuple(actions)) for (phase, actions) in phases.items())))
+
+    def restore(self, snapshot):
+        (earlier_turns, current_turn) = snapshot
+        self.actions_taken = list(earlier_turns)
+        if(current_turn is not None):
+            (player, phases) = current_turn
+            self.actions_taken.append((player, {phase: PhaseActions(actions) for (phase, actions) in phases}))
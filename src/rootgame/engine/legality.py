@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from enum import StrEnum, auto
+
+class Rejection(StrEnum):
+    UNKNOWN_ACTION = auto()
+    WRONG_PHASE = auto()
+    ACTION_LIMIT = auto()
+    INVALID_CLEARING = auto()
+    INVALID_CARD = auto()
+    # Crafting
+    CRAFT_NOT_FIRST = auto()
+    NOT_ITEM_CARD = auto()
+    NOT_ENOUGH_CRAFTERS = auto()
+    NOT_ENOUGH_CRAFTERS_OF_SUIT = auto()
+    # Movement and battle
+    NO_WARRIORS_TO_MOVE = auto()
+    NOT_ADJACENT = auto()
+    INSUFFICIENT_WARRIORS = auto()
+    NOT_RULED_MOVE = auto()
+    SELF_BATTLE = auto()
+    NOT_ATTACKER = auto()
+    NO_WARRIORS_TO_BATTLE = auto()
+    # Recruiting, building and wood
+    ALREADY_RECRUITED = auto()
+    OUT_OF_WARRIORS = auto()
+    NO_RECRUITERS = auto()
+    OUT_OF_BUILDINGS = auto()
+    NOT_RULER = auto()
+    NO_BUILDING_SLOT = auto()
+    ALREADY_BUILT = auto()
+    INSUFFICIENT_WOOD = auto()
+    MISSING_BUILDING = auto()
+    OUT_OF_WOOD = auto()
+    SUIT_MISMATCH = auto()
+    NOT_BIRD_CARD = auto()
+    # Eyrie decree
+    DECREE_FULL = auto()
+    DECREE_EMPTY = auto()
+    DECREE_ORDER = auto()
+    NOT_IN_DECREE = auto()
+    IN_TURMOIL = auto()
+    # Evening
+    NOTHING_TO_DISCARD = auto()
+    WRONG_DISCARD_COUNT = auto()
+    HAND_OVER_LIMIT = auto()
+
+# Formatted with the rejection's details, only when a caller asks for the message
+MESSAGES: dict[Rejection, str] = {
+    Rejection.UNKNOWN_ACTION: "Not a recognised action",
+    Rejection.WRONG_PHASE: "Action not allowed right now",
+    Rejection.ACTION_LIMIT: "Used up all daylight actions",
+    Rejection.INVALID_CLEARING: "Not a valid clearing",
+    Rejection.INVALID_CARD: "Invalid card index",
+    Rejection.CRAFT_NOT_FIRST: "Crafting must come first in daylight",
+    Rejection.NOT_ITEM_CARD: "Not item card",
+    Rejection.NOT_ENOUGH_CRAFTERS: "Not enough unused {0}s",
+    Rejection.NOT_ENOUGH_CRAFTERS_OF_SUIT: "Not enough unused {0}s of suit {1}",
+    Rejection.NO_WARRIORS_TO_MOVE: "Can't move 0 or negative warriors",
+    Rejection.NOT_ADJACENT: "Can't move between non-adj clearings",
+    Rejection.INSUFFICIENT_WARRIORS: "Insufficient warriors at clearing",
+    Rejection.NOT_RULED_MOVE: "Don't rule either clearing involved in move",
+    Rejection.SELF_BATTLE: "Can't battle yourself",
+    Rejection.NOT_ATTACKER: "The attacker must be the player taking the action",
+    Rejection.NO_WARRIORS_TO_BATTLE: "Either attacker or defender has no warriors",
+    Rejection.ALREADY_RECRUITED: "Can only recruit once per turn",
+    Rejection.OUT_OF_WARRIORS: "Out of warriors",
+    Rejection.NO_RECRUITERS: "No recruiters placed",
+    Rejection.OUT_OF_BUILDINGS: "Out of {0}s",
+    Rejection.NOT_RULER: "Don't rule clearing",
+    Rejection.NO_BUILDING_SLOT: "No free building slot",
+    Rejection.ALREADY_BUILT: "Already a {0} at clearing",
+    Rejection.INSUFFICIENT_WOOD: "Insufficient wood: {0} vs {1}",
+    Rejection.MISSING_BUILDING: "No {0} at clearing",
+    Rejection.OUT_OF_WOOD: "No wood available to place",
+    Rejection.SUIT_MISMATCH: "Invalid card. Suit doesn't match",
+    Rejection.NOT_BIRD_CARD: "Invalid card. Suit must be bird",
+    Rejection.DECREE_FULL: "Already added two cards to the decree",
+    Rejection.DECREE_EMPTY: "Must add a card to the decree first",
+    Rejection.DECREE_ORDER: "Must resolve the {0} column of the decree first",
+    Rejection.NOT_IN_DECREE: "No {0} card in the decree matches the clearing",
+    Rejection.IN_TURMOIL: "In turmoil, can only end the phase",
+    Rejection.NOTHING_TO_DISCARD: "Hand is within the limit, nothing to discard",
+    Rejection.WRONG_DISCARD_COUNT: "Must discard down to {0} cards",
+    Rejection.HAND_OVER_LIMIT: "Must discard down to {0} cards first",
+}
+
+@dataclass(frozen=True, slots=True)
+class Legality:
+    """
+    Outcome of a legality check: truthy when legal, otherwise carries a rejection code.
+
+    Checks build these without formatting anything; `message` renders a reason on demand.
+    """
+    rejection: Rejection | None = None
+    details: tuple = ()
+
+    def __bool__(self):
+        return self.rejection is None
+
+    @property
+    def message(self) -> str:
+        if(self.rejection is None):
+            return "Legal"
+        return MESSAGES[self.rejection].format(*self.details)
+
+LEGAL = Legality()
+
+# Rejections without details are shared rather than rebuilt on every check
+_PLAIN_REJECTIONS = {rejection: Legality(rejection) for rejection in Rejection}
+
+def reject(rejection: Rejection, *details) -> Legality:
+    if(details):
+        return Legality(rejection, details)
+    return _PLAIN_REJECTIONS[rejection]
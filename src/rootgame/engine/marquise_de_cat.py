@@ -1,19 +1,35 @@
 from dataclasses import dataclass
-from typing import ClassVar
+from typing import ClassVar, Iterator
+import random
 from rootgame.engine import actions
-from rootgame.engine.faction import Faction
+from rootgame.engine.faction import Faction, group_by_kind, iter_evening_actions, is_evening_action_legal, sample_by_kind
 from rootgame.engine.player import Player
+from rootgame.engine.game_log import PhaseActions
 from rootgame.engine.board import Board, Token, Clearing
+from rootgame.engine.bitboard import iter_clearings
 from rootgame.engine.building import Building, BuildingType
-from rootgame.engine.actions import Action, AddWoodToSawmillsAction, EndPhaseAction, MarchAction, MarquiseRecruitAction, MarquiseBuildAction, MarquiseOverworkAction, BattleAction, DrawCardAction, DiscardCardAction, MoveAction, MarquiseCraftAction, MarquiseExtraTurnAction
+from rootgame.engine.actions import Action, AddWoodToSawmillsAction, EndPhaseAction, MarchAction, MarquiseRecruitAction, MarquiseBuildAction, MarquiseOverworkAction, BattleAction, DrawCardAction, MoveAction, MarquiseCraftAction, MarquiseExtraTurnAction
 from rootgame.engine.card import ItemCard
+from rootgame.engine.legality import LEGAL, Legality, Rejection, reject
+from rootgame.engine.zobrist import HashedFields
 
-from rootgame.engine.types import FactionName, TurnPhase, Suit, MAX_HAND_SIZE
+from rootgame.engine.types import FactionName, TurnPhase, Suit
+
+def expand_move_groups(groups, max_warriors: int | None = None) -> Iterator[tuple[int, int, int]]:
+    # Moves as (count, source, destination), optionally capped at max_warriors per move
+    for (source, dest, num_warriors) in groups:
+        for count in range(1, (num_warriors if max_warriors is None else min(num_warriors, max_warriors)) + 1):
+            yield (count, source, dest)
 
 @dataclass
-class MarquiseDeCat(Faction):
+class MarquiseDeCat(HashedFields, Faction):
     faction_name: ClassVar[FactionName] = FactionName.MARQUISE_DE_CAT
 
+    # Counters folded into the faction's Zobrist hash whenever they change
+    hashed_fields: ClassVar[frozenset[str]] = frozenset({
+        "warriors_placed", "wood_placed", "sawmills_placed", "workshops_placed",
+        "recruiters_placed", "extra_cards_to_draw", "extra_actions_for_turn"})
+
     warrior_limit: ClassVar[int] = 25 # Starting number of warriors for Marquise de Cat
     warriors_placed: int = 0
 
@@ -50,9 +66,9 @@ class MarquiseDeCat(Faction):
         self.build(board, 1, BuildingType.RECRUITER)
 
         # Place 1 warrior in every clearing (except corner opposite to keep)
-        for (id, clearing) in enumerate(board.clearings):
+        for id in board.get_clearing_ids():
             if id != 11:
-                clearing.add_warriors(FactionName.MARQUISE_DE_CAT, 1)
+                board.add_warriors_at_clearing(id, FactionName.MARQUISE_DE_CAT, 1)
                 self.warriors_placed += 1
 
     def pre_birdsong_actions(self):
@@ -65,6 +81,14 @@ class MarquiseDeCat(Faction):
     def reset_state(self):
         self.extra_actions_for_turn = 0
 
+    def snapshot_state(self):
+        return (self.warriors_placed, self.wood_placed, self.sawmills_placed, self.workshops_placed,
+                self.recruiters_placed, self.extra_cards_to_draw, self.extra_actions_for_turn)
+
+    def restore_state(self, state):
+        (self.warriors_placed, self.wood_placed, self.sawmills_placed, self.workshops_placed,
+         self.recruiters_placed, self.extra_cards_to_draw, self.extra_actions_for_turn) = state
+
     def get_legal_actions(self, turn_phase: TurnPhase):
         # Implement logic to return legal actions for Marquise de Cat based on the turn phase
         legal_actions = ["END PHASE"]
@@ -80,7 +104,133 @@ class MarquiseDeCat(Faction):
         
         return legal_actions
     
-    def is_action_legal(self, action: Action, current_phase: TurnPhase, player: Player, board: Board, actions_taken: list[Action]):
+    def iter_legal_actions(self, turn_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player]) -> Iterator[Action]:
+        # Bird song is automatic for marquise de cat, so only daylight and evening have choices
+        if(turn_phase == TurnPhase.DAYLIGHT):
+            yield from self.iter_daylight_actions(player, board, actions_taken, players)
+        elif(turn_phase == TurnPhase.EVENING):
+            yield from iter_evening_actions(player)
+
+    def sample_legal_action(self, turn_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player], rng: random.Random) -> Action | None:
+        if(turn_phase != TurnPhase.DAYLIGHT):
+            return sample_by_kind(self.iter_legal_actions(turn_phase, player, board, actions_taken, players), rng)
+
+        # Marches are sampled directly rather than enumerated, and only if their kind comes up
+        by_kind: dict[type, list[Action] | None] = group_by_kind(self.iter_daylight_actions(player, board, actions_taken, players, marches=False))
+        if(self.has_actions_left(actions_taken)):
+            by_kind[MarchAction] = None
+        while by_kind:
+            kind = rng.choice(list(by_kind))
+            if(kind is not MarchAction):
+                return rng.choice(by_kind[kind])
+            march = self.sample_march(board, rng)
+            if(march is not None):
+                return march
+            del by_kind[MarchAction]
+        return None
+
+    def has_actions_left(self, actions_taken: PhaseActions) -> bool:
+        return self.count_actions_taken(actions_taken=actions_taken) < self.turn_action_limit + self.extra_actions_for_turn
+
+    def iter_daylight_actions(self, player: Player, board: Board, actions_taken: PhaseActions, players: list[Player], marches: bool = True) -> Iterator[Action]:
+        yield EndPhaseAction()
+
+        # Extra turns are exempt from the action limit
+        for (card_idx, card) in enumerate(player.hand):
+            if(card.suit == Suit.Bird):
+                yield MarquiseExtraTurnAction(card_idx)
+
+        if(not self.has_actions_left(actions_taken)):
+            return
+
+        # Crafting only at the start of daylight (or following other crafts)
+        if(actions_taken.last_type() in (None, MarquiseCraftAction)):
+            for (card_idx, card) in enumerate(player.hand):
+                if(isinstance(card, ItemCard) and self.has_workshops_to_craft(card, board)):
+                    yield MarquiseCraftAction(card_idx)
+
+        if(not actions_taken.count(MarquiseRecruitAction) and self.warriors_placed < self.warrior_limit and self.recruiters_placed > 0):
+            yield MarquiseRecruitAction()
+
+        for clearing_id in iter_clearings(board.get_contested_clearings(self.faction_name)):
+            for defender in players:
+                if(defender is not player and board.get_warrior_count(clearing_id, defender.faction.faction_name) > 0):
+                    yield BattleAction(clearing_id, player, defender)
+
+        yield from self.iter_build_actions(board)
+
+        if(self.wood_placed < self.wood_limit):
+            for clearing_id in board.get_clearing_ids():
+                if(not board.clearing_has_building(clearing_id, BuildingType.SAWMILL)):
+                    continue
+                clearing_suit = board.get_clearing_suit(clearing_id)
+                for (card_idx, card) in enumerate(player.hand):
+                    if(card.suit == clearing_suit):
+                        yield MarquiseOverworkAction(clearing_id, card_idx)
+
+        if(marches):
+            yield from self.iter_march_actions(board)
+
+    def iter_build_actions(self, board: Board) -> Iterator[Action]:
+        costs: dict[BuildingType, int] = {}
+        for (building_type, placed, limit) in ((BuildingType.SAWMILL, self.sawmills_placed, self.sawmill_limit),
+                                               (BuildingType.WORKSHOP, self.workshops_placed, self.workshop_limit),
+                                               (BuildingType.RECRUITER, self.recruiters_placed, self.recruiter_limit)):
+            if(placed < limit):
+                costs[building_type] = self.building_cost[placed]
+        if(not costs):
+            return
+
+        # Wood can be drawn from anywhere in the ruled component of the target clearing
+        cheapest = min(costs.values())
+        for clearing_id in iter_clearings(board.get_ruled_mask(self.faction_name)):
+            wood_available = board.get_connected_wood(clearing_id, self.faction_name)
+            if(wood_available < cheapest or not board.can_build_at_clearing(clearing_id)):
+                continue
+            for (building_type, cost) in costs.items():
+                if(cost <= wood_available):
+                    yield MarquiseBuildAction(clearing_id, building_type)
+
+    def iter_march_actions(self, board: Board, max_warriors: int | None = None) -> Iterator[Action]:
+        for (move_one, second_groups) in self.iter_march_options(board, max_warriors):
+            move_one = MoveAction(*move_one)
+            for move_two in expand_move_groups(second_groups, max_warriors):
+                yield MarchAction(move_one, MoveAction(*move_two))
+
+    def iter_march_options(self, board: Board, max_warriors: int | None = None) -> Iterator[tuple[tuple[int, int, int], list[tuple[int, int, int]]]]:
+        # Each first move, with the move groups open to the second move on the board it leaves.
+        # Larger first moves along an edge are reached by moving one more warrior at a time
+        for (source_one, dest_one, num_warriors) in list(self.iter_move_groups(board)):
+            options = []
+            with board.what_if():
+                for count in range(1, (num_warriors if max_warriors is None else min(num_warriors, max_warriors)) + 1):
+                    board.move_warriors(self.faction_name, 1, source_one, dest_one)
+                    options.append(((count, source_one, dest_one), list(self.iter_move_groups(board))))
+            yield from options
+
+    def sample_march(self, board: Board, rng: random.Random) -> Action | None:
+        # A random first move, then a random second move from the board it leaves
+        first_moves = list(self.iter_moves(board))
+        rng.shuffle(first_moves)
+        for (num_warriors_one, source_one, dest_one) in first_moves:
+            with board.what_if():
+                board.move_warriors(self.faction_name, num_warriors_one, source_one, dest_one)
+                second_moves = list(self.iter_moves(board))
+            if(second_moves):
+                return MarchAction(MoveAction(num_warriors_one, source_one, dest_one), MoveAction(*rng.choice(second_moves)))
+        return None
+
+    def iter_moves(self, board: Board, max_warriors: int | None = None) -> Iterator[tuple[int, int, int]]:
+        return expand_move_groups(self.iter_move_groups(board), max_warriors)
+
+    def iter_move_groups(self, board: Board) -> Iterator[tuple[int, int, int]]:
+        # (source, destination, warriors at the source): a move of any 1..warriors of them is legal
+        for source in iter_clearings(board.get_warrior_mask(self.faction_name)):
+            num_warriors = board.get_warrior_count(source, self.faction_name)
+            for dest in iter_clearings(board.get_move_destinations(self.faction_name, source)):
+                yield (source, dest, num_warriors)
+
+    def is_action_legal(self, action: Action, current_phase: TurnPhase, player: Player, board: Board, actions_taken: PhaseActions) -> Legality:
         if(current_phase == TurnPhase.BIRDSONG):
             # Bird song is automatic for marquise de cat
             pass
@@ -88,46 +238,23 @@ class MarquiseDeCat(Faction):
         elif(current_phase == TurnPhase.DAYLIGHT):
             # Check for max of 3 actions during daylight (+ 1 for every bird card used)
             if(self.count_actions_taken(actions_taken=actions_taken) >= self.turn_action_limit + self.extra_actions_for_turn and not self.is_action_exempt_from_limit(action=action)):
-                print("Used up all daylight actions")
-                return False
+                return reject(Rejection.ACTION_LIMIT)
             
             # Must do all crafting at start (first action, or following another craft actions)
             if(isinstance(action, MarquiseCraftAction)):
-                print("Validating craft")
                 if(action.card_idx >= len(player.hand) or action.card_idx < 0):
-                    print("Invalid card index")
-                    return False
-                if(not len(actions_taken) == 0):
-                    print(actions_taken)
-                    if(not isinstance(actions_taken[-1], MarquiseCraftAction)):
-                        print("Not start of turn")
-                        return False
+                    return reject(Rejection.INVALID_CARD)
+                if(actions_taken.last_type() not in (None, MarquiseCraftAction)):
+                    return reject(Rejection.CRAFT_NOT_FIRST)
                 if(not isinstance(player.hand[action.card_idx], ItemCard)):
-                    print("Not item card")
-                    return False
+                    return reject(Rejection.NOT_ITEM_CARD)
                 
                 # Check if there are enough unused workshops
-                card_to_craft: ItemCard = player.hand[action.card_idx]
-                unused_workshop_cnts = board.get_unused_buildings_of_type(building_type=BuildingType.WORKSHOP)
-
-                if(sum(card_to_craft.crafting_requirements.values()) > sum(unused_workshop_cnts.values())):
-                    print("Not enough workshops")
-                    return False
-
-                unused_workshops_by_suit = {}
-                for (clearing_id, workshop_cnt) in unused_workshop_cnts.items():
-                    clearing_suit = board.get_clearing_suit(clearing_id=clearing_id)
-                    unused_workshops_by_suit[clearing_suit] = unused_workshops_by_suit.get(clearing_suit, 0) + workshop_cnt
-
-                for (suit, req_cnt) in card_to_craft.crafting_requirements.items():
-                    if(suit == Suit.Bird): continue
-                    if(unused_workshops_by_suit.get(suit, 0) < req_cnt):
-                        print(f"Not enough workshops of suit {suit}")
-                        return False
-                
-                return True
+                return self.has_workshops_to_craft(player.hand[action.card_idx], board)
             
             elif(isinstance(action, BattleAction)):
+                if(action.attacker is not player):
+                    return reject(Rejection.NOT_ATTACKER)
                 return board.can_battle(action.attacker.faction.faction_name, action.defender.faction.faction_name, action.clearing_id)
             
             elif(isinstance(action, MarchAction)):
@@ -136,115 +263,90 @@ class MarquiseDeCat(Faction):
                 source_clearing_one = action.move_one.source_clearing
                 destination_clearing_one = action.move_one.destination_clearing
 
-                if(not board.can_move(self.faction_name, num_warriors_one, source_clearing_one, destination_clearing_one)):
-                    return False
+                can_move_one = board.can_move(self.faction_name, num_warriors_one, source_clearing_one, destination_clearing_one)
+                if(not can_move_one):
+                    return can_move_one
 
                 # Validate second move, given first move
                 num_warriors_two = action.move_two.num_warriors
                 source_clearing_two = action.move_two.source_clearing
                 destination_clearing_two = action.move_two.destination_clearing
 
-                board.move_warriors(self.faction_name, num_warriors_one, source_clearing_one, destination_clearing_one) # Temporarily move warriors to validate second move
-                if(not board.can_move(self.faction_name, num_warriors_two, source_clearing_two, destination_clearing_two)):
-                    board.move_warriors(self.faction_name, num_warriors_one, destination_clearing_one, source_clearing_one) # Move warriors back to original clearing
-                    return False
-                board.move_warriors(self.faction_name, num_warriors_one, destination_clearing_one, source_clearing_one) # Move warriors back to original clearing
+                with board.what_if(): # Temporarily move warriors to validate second move; rolled back exactly
+                    board.move_warriors(self.faction_name, num_warriors_one, source_clearing_one, destination_clearing_one)
+                    can_move_two = board.can_move(self.faction_name, num_warriors_two, source_clearing_two, destination_clearing_two)
 
-                return True
+                return can_move_two
             
             elif(isinstance(action, MarquiseRecruitAction)):
-                if(sum(isinstance(a, MarquiseRecruitAction) for a in actions_taken) == 1):
-                    print("Can only recruit once per turn")
-                    return False
+                if(actions_taken.count(MarquiseRecruitAction) == 1):
+                    return reject(Rejection.ALREADY_RECRUITED)
                 if(self.warriors_placed >= self.warrior_limit):
-                    print("Out of warriors")
-                    return False
+                    return reject(Rejection.OUT_OF_WARRIORS)
                 if(self.recruiters_placed == 0):
-                    print("No recruiters placed")
-                    return False
-                return True
+                    return reject(Rejection.NO_RECRUITERS)
+                return LEGAL
 
             elif(isinstance(action, MarquiseBuildAction)):
                 wood_needed = 0
                 if(action.building_type == BuildingType.SAWMILL):
                     if(self.sawmills_placed >= self.sawmill_limit):
-                        print("Out of sawmills")
-                        return False
+                        return reject(Rejection.OUT_OF_BUILDINGS, action.building_type)
                     else:
                         wood_needed = self.building_cost[self.sawmills_placed]
                 elif(action.building_type == BuildingType.WORKSHOP):
                     if(self.workshops_placed >= self.workshop_limit):
-                        print("Out of workshops")
-                        return False
+                        return reject(Rejection.OUT_OF_BUILDINGS, action.building_type)
                     else:
                         wood_needed = self.building_cost[self.workshops_placed]
                 elif(action.building_type == BuildingType.RECRUITER):
                     if(self.recruiters_placed >= self.recruiter_limit):
-                        print("Out of recruiters")
-                        return False
+                        return reject(Rejection.OUT_OF_BUILDINGS, action.building_type)
                     else:
                         wood_needed = self.building_cost[self.recruiters_placed]
                 else:
-                    return False
+                    return reject(Rejection.UNKNOWN_ACTION)
+
+                if(board.get_clearing_ruler(action.clearing_id) != self.faction_name):
+                    return reject(Rejection.NOT_RULER)
+                if(not board.can_build_at_clearing(action.clearing_id)):
+                    return reject(Rejection.NO_BUILDING_SLOT)
                 
-                connected_clearings_with_wood = self.find_wood_in_connected_ruled_clearings(board, action.clearing_id)
-                wood_available = 0
-                for clearing in connected_clearings_with_wood:
-                    wood_available += clearing.tokens.get(FactionName.MARQUISE_DE_CAT, []).count(Token.WOOD)
+                wood_available = board.get_connected_wood(action.clearing_id, self.faction_name)
                 
                 if(wood_available < wood_needed):
-                    print(f"Insufficient wood: {wood_available} vs {wood_needed}")
-                    return False
-                return True
+                    return reject(Rejection.INSUFFICIENT_WOOD, wood_available, wood_needed)
+                return LEGAL
                 
             elif(isinstance(action, MarquiseOverworkAction)):
                 if(action.card_idx >= len(player.hand) or action.card_idx < 0):
-                    print("Invalid card index")
-                    return False
+                    return reject(Rejection.INVALID_CARD)
                 if(board.is_valid_clearing(action.clearing_id) == False):
-                    print("Invalid clearing")
-                    return False
+                    return reject(Rejection.INVALID_CLEARING)
                 if(player.hand[action.card_idx].suit != board.get_clearing_suit(action.clearing_id)):
-                    print("Invalid card. Suit doesn't match")
-                    return False
+                    return reject(Rejection.SUIT_MISMATCH)
                 if(not board.clearing_has_building(clearing_id=action.clearing_id, building_type=BuildingType.SAWMILL)):
-                    print("No sawmill at clearing")
-                    return False
+                    return reject(Rejection.MISSING_BUILDING, BuildingType.SAWMILL)
                 if(self.wood_placed == self.wood_limit):
-                    print("No wood available to place")
-                    return False
-                return True
+                    return reject(Rejection.OUT_OF_WOOD)
+                return LEGAL
             
             elif(isinstance(action, MarquiseExtraTurnAction)):
                 if(action.card_idx >= len(player.hand) or action.card_idx < 0):
-                    print("Invalid card index")
-                    return False
+                    return reject(Rejection.INVALID_CARD)
                 if(player.hand[action.card_idx].suit != Suit.Bird):
-                    print("Invalid card. Suit must be bird")
-                    return False
-                return True
+                    return reject(Rejection.NOT_BIRD_CARD)
+                return LEGAL
             
             elif(isinstance(action, EndPhaseAction)):
-                return True
+                return LEGAL
             
-            return False
-
-        elif(current_phase == TurnPhase.EVENING):            
-            if(isinstance(action, DiscardCardAction)):
-                if(len(player.hand) < MAX_HAND_SIZE):
-                    return False
-                if(len(player.hand) - len(action.card_ids) != MAX_HAND_SIZE):
-                    return False
-                if(any(card_id >= len(player.hand) or card_id < 0 for card_id in action.card_ids)):
-                    return False
-                return True
-            
-            elif(isinstance(action, EndPhaseAction)):
-                if(len(player.hand) > MAX_HAND_SIZE):
-                    return False
-                return True
-            
-            return False
+            return reject(Rejection.WRONG_PHASE)
+
+        elif(current_phase == TurnPhase.EVENING):
+            return is_evening_action_legal(action, player)
+
+        return reject(Rejection.WRONG_PHASE)
         
     def apply_action(self, action: Action, board: Board, player: Player):
         vp_scored: int = 0
@@ -277,55 +379,38 @@ class MarquiseDeCat(Faction):
             self.overwork(board, action.clearing_id, player, action.card_idx)
 
         elif(isinstance(action, MarquiseCraftAction)):
-            vp_scored = self.craft(card=player.hand.pop(action.card_idx), board=board)
+            vp_scored = self.craft(card=player.pop_card(action.card_idx), board=board)
         
         elif(isinstance(action, MarquiseExtraTurnAction)):
-            player.hand.pop(action.card_idx)
+            player.pop_card(action.card_idx)
             self.extra_actions_for_turn += 1
         
         return vp_scored
     
     def add_wood_to_sawmills(self, board: Board):
-        for clearing in board.clearings:
-            for building in clearing.buildings:
-                if building.type is BuildingType.SAWMILL and self.wood_placed < self.wood_limit:
-                    building.used = True
-                    clearing.add_token(token=Token.WOOD, owner=self.faction_name)
+        for clearing_id in board.get_clearing_ids():
+            for _ in range(board.get_building_count_at_clearing(clearing_id, BuildingType.SAWMILL)):
+                if self.wood_placed < self.wood_limit:
+                    board.use_building_at_clearing(clearing_id, BuildingType.SAWMILL)
+                    board.add_token_at_clearing(clearing_id, token=Token.WOOD, owner=self.faction_name)
                     self.wood_placed += 1
     
-    def find_wood_in_connected_ruled_clearings(self, board: Board, clearing_id: int) -> list[Clearing]:
-        search_q = [board.clearings[clearing_id]]
-        searched_clearings = set([clearing_id])
-        clearings_with_wood = []
-        while(len(search_q)):
-            curr_clearing = search_q.pop()
-            # print(curr_clearing)
-            if(Token.WOOD in curr_clearing.tokens.get(FactionName.MARQUISE_DE_CAT, [])):
-                clearings_with_wood.append(curr_clearing)
-            
-            # Check adj clearings that you rule
-            for id in curr_clearing.adjacentClearings:
-                adj_clearing = board.clearings[id]
-                print(id)
-                if(adj_clearing.ruler == FactionName.MARQUISE_DE_CAT and id not in searched_clearings):
-                    # print(f"will search {id}")
-                    search_q.append(adj_clearing)
-                    searched_clearings.add(id)
-        
-        return clearings_with_wood 
-        
+    def find_wood_in_connected_ruled_clearings(self, board: Board, clearing_id: int) -> list[int]:
+        # Clearings holding wood in the ruled component of this clearing (kept up to date by the board)
+        return [id for id in iter_clearings(board.get_ruled_component(clearing_id, self.faction_name))
+                if board.get_token_count_at_clearing(id, Token.WOOD, self.faction_name) > 0]
+
     def march(self, board: Board, num_warriors_one: int, start_clearing_one: int, end_clearing_one: int,
               num_warriors_two: int, start_clearing_two: int, end_clearing_two: int):
         board.move_warriors(self.faction_name, num_warriors_one, start_clearing_one, end_clearing_one)
         board.move_warriors(self.faction_name, num_warriors_two, start_clearing_two, end_clearing_two)
 
     def recruit(self, board: Board):
-        for clearing in board.clearings:
-            for building in clearing.buildings:
-                if building.type is BuildingType.RECRUITER:
-                    if(self.warriors_placed < self.warrior_limit):
-                        clearing.add_warriors(self.faction_name, 1)
-                        self.warriors_placed += 1
+        for clearing_id in board.get_clearing_ids():
+            for _ in range(board.get_building_count_at_clearing(clearing_id, BuildingType.RECRUITER)):
+                if(self.warriors_placed < self.warrior_limit):
+                    board.add_warriors_at_clearing(clearing_id, self.faction_name, 1)
+                    self.warriors_placed += 1
     
     def build(self, board: Board, clearing_id: int, building_type: BuildingType):
         wood_needed = 0
@@ -339,9 +424,8 @@ class MarquiseDeCat(Faction):
         connected_clearings_with_wood = self.find_wood_in_connected_ruled_clearings(board, clearing_id)
 
         # Remove wood from connected clearings
-        for clearing in connected_clearings_with_wood:
-            while wood_needed > 0 and Token.WOOD in clearing.tokens.get(FactionName.MARQUISE_DE_CAT, []):
-                clearing.tokens[FactionName.MARQUISE_DE_CAT].remove(Token.WOOD)
+        for wood_clearing_id in connected_clearings_with_wood:
+            while wood_needed > 0 and board.remove_token_at_clearing(wood_clearing_id, Token.WOOD, self.faction_name):
                 wood_needed -= 1
                 self.wood_placed -= 1
         
@@ -360,7 +444,7 @@ class MarquiseDeCat(Faction):
     
     def overwork(self, board: Board, clearing_id: int, player: Player, card_idx: int):
         # Use card
-        player.hand.pop(card_idx)  # Remove the card from player's hand
+        player.pop_card(card_idx)  # Remove the card from player's hand
 
         # Add wood to sawmill at clearing
         board.add_token_at_clearing(clearing_id=clearing_id, token=Token.WOOD, owner=self.faction_name)
@@ -388,16 +472,26 @@ class MarquiseDeCat(Faction):
         
         return card.crafting_VP
     
-    def count_actions_taken(self, actions_taken: list[Action]):
-        count = 0
-        for action in actions_taken:
-            if(isinstance(action, MarchAction) or
-               isinstance(action, MarquiseBuildAction) or
-               isinstance(action, MarquiseOverworkAction) or
-               isinstance(action, MarquiseRecruitAction) or
-               isinstance(action, BattleAction)):
-                count += 1
-        return count
+    def has_workshops_to_craft(self, card: ItemCard, board: Board) -> Legality:
+        unused_workshop_cnts = board.get_unused_buildings_of_type(building_type=BuildingType.WORKSHOP)
+
+        if(sum(card.crafting_requirements.values()) > sum(unused_workshop_cnts.values())):
+            return reject(Rejection.NOT_ENOUGH_CRAFTERS, BuildingType.WORKSHOP)
+
+        unused_workshops_by_suit = {}
+        for (clearing_id, workshop_cnt) in unused_workshop_cnts.items():
+            clearing_suit = board.get_clearing_suit(clearing_id=clearing_id)
+            unused_workshops_by_suit[clearing_suit] = unused_workshops_by_suit.get(clearing_suit, 0) + workshop_cnt
+
+        for (suit, req_cnt) in card.crafting_requirements.items():
+            if(suit == Suit.Bird): continue
+            if(unused_workshops_by_suit.get(suit, 0) < req_cnt):
+                return reject(Rejection.NOT_ENOUGH_CRAFTERS_OF_SUIT, BuildingType.WORKSHOP, suit)
+
+        return LEGAL
+
+    def count_actions_taken(self, actions_taken: PhaseActions):
+        return actions_taken.count(MarchAction, MarquiseBuildAction, MarquiseOverworkAction, MarquiseRecruitAction, BattleAction)
     
     def is_action_exempt_from_limit(self, action: Action):
         if(isinstance(action, EndPhaseAction) or isinstance(action, MarquiseExtraTurnAction)):
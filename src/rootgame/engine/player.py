@@ -1,9 +1,63 @@
 from dataclasses import dataclass, field
 from typing import Optional
 from rootgame.engine.card import Card
+from rootgame.engine.zobrist import cards_zobrist, card_kind, recount_key
 
 @dataclass
 class Player:
     score: int = 0
     hand: list[Card] = field(default_factory=list)
-    faction: Optional["Faction"] = None
\ No newline at end of file
+    faction: Optional["Faction"] = None
+
+    # Seat at the table; keys this player's share of the game's Zobrist hash
+    seat: int = field(default=0, repr=False, compare=False)
+
+    # While set, hand changes append an inverse operation (fn, *args) so they can be rolled back
+    journal: list | None = field(default=None, repr=False, compare=False)
+
+    # Zobrist hash of the hand, updated by every hand change (see zobrist.py)
+    zobrist: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.zobrist = self.compute_zobrist()
+
+    def add_cards(self, cards: list[Card]):
+        if(self.journal is not None):
+            self.journal.append((self.truncate_hand, len(self.hand)))
+        for card in cards:
+            self.rehash_card(card, 1)
+            self.hand.append(card)
+
+    def pop_card(self, card_idx: int) -> Card:
+        self.rehash_card(self.hand[card_idx], -1)
+        card = self.hand.pop(card_idx)
+        if(self.journal is not None):
+            self.journal.append((self.insert_card, card_idx, card))
+        return card
+
+    def remove_cards(self, card_idxs: list[int]):
+        if(self.journal is not None):
+            self.journal.append((self.set_hand, self.hand))
+        self.set_hand([card for (idx, card) in enumerate(self.hand) if idx not in card_idxs])
+
+    def insert_card(self, card_idx: int, card: Card):
+        self.rehash_card(card, 1)
+        self.hand.insert(card_idx, card)
+
+    def truncate_hand(self, hand_size: int):
+        for card in self.hand[hand_size:]:
+            self.rehash_card(card, -1)
+        del self.hand[hand_size:]
+
+    def set_hand(self, hand: list[Card]):
+        self.hand = hand
+        self.zobrist = self.compute_zobrist()
+
+    def rehash_card(self, card: Card, delta: int):
+        # Called before adding/removing the card, with the current copies still in hand
+        kind = card_kind(card)
+        count = sum(1 for held in self.hand if card_kind(held) == kind)
+        self.zobrist ^= recount_key(count, count + delta, "hand", self.seat, kind)
+
+    def compute_zobrist(self) -> int:
+        return cards_zobrist(self.hand, "hand", self.seat)
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Callable
+import time
+
+from rootgame.engine.binary_log import BinaryLogError, LogHeader, iter_records, read_header, state_digest
+from rootgame.engine.board import Board
+from rootgame.engine.game import Game
+
+class ReplayMismatch(BinaryLogError):
+    pass
+
+@dataclass
+class ReplayResult:
+    header: LogHeader
+    game: Game
+    actions: int = 0
+    checkpoints: int = 0
+    scores: list[int] | None = None
+    duration: float = 0.0
+
+    @property
+    def actions_per_sec(self) -> float:
+        return self.actions / self.duration if self.duration else 0.0
+
+def replay_log(stream: BinaryIO, verify: bool = True, board: Board | None = None, on_state: Callable[[Game], None] | None = None) -> ReplayResult:
+    """
+    Rebuild a game from a binary log by applying its actions straight through Game.apply_action.
+
+    With `verify`, each action is also checked for legality, the game's state digest is compared at
+    every recorded checkpoint and the final scores against the end record; the first disagreement
+    raises ReplayMismatch. Without it, actions are trusted and applied as fast as they decode.
+
+    `on_state` is called with the game before the first action and after every action.
+    """
+    data = stream.read()
+    (header, pos) = read_header(data)
+
+    start = time.perf_counter()
+    game = Game(board=board, seed=header.seed)
+    factions = [player.faction.faction_name for player in game.players]
+    if(factions != header.factions):
+        raise ReplayMismatch(f"Log was recorded with seats {header.factions}, this engine sets up {factions}")
+
+    result = ReplayResult(header=header, game=game)
+    if(on_state is not None):
+        on_state(game)
+    for record in iter_records(data, pos, game.players):
+        if(record[0] == "action"):
+            if(verify and not (legality := game.is_action_legal(record[1]))):
+                raise ReplayMismatch(f"Action {result.actions + 1} is illegal on replay: {legality.message}")
+            game.apply_action(record[1])
+            result.actions += 1
+            if(on_state is not None):
+                on_state(game)
+        elif(record[0] == "checkpoint"):
+            (_, count, digest) = record
+            if(verify and state_digest(game) != digest):
+                raise ReplayMismatch(f"State diverged by action {count}")
+            result.checkpoints += 1
+        else:
+            result.scores = record[1]
+            if(verify and result.scores != [player.score for player in game.players]):
+                raise ReplayMismatch(f"Final scores {result.scores} don't match replayed {[player.score for player in game.players]}")
+    result.duration = time.perf_counter() - start
+    return result
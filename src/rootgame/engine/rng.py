@@ -0,0 +1,61 @@
+import hashlib
+import random
+
+# Every source of randomness in a game (deck shuffles, Eyrie turmoil) draws from one random.Random
+# owned by the Game, seeded explicitly so the game can be replayed exactly. Battle dice come from a
+# separate counter-based DiceStream keyed from the same seed, so batches of games can draw them in
+# one vectorized call (see battle_batch.py) and still land exactly where the scalar path would
+
+SEED_BYTES = 8
+MAX_SEED = 1 << (SEED_BYTES * 8)  # seeds are in [0, MAX_SEED), as binary logs store them
+
+def new_seed() -> int:
+    # A fresh 64-bit seed from OS entropy, for games started without one
+    return random.SystemRandom().getrandbits(SEED_BYTES * 8)
+
+def derive_seed(seed: int, *path: int) -> int:
+    """
+    Derive an independent 64-bit seed from a base seed and a path of indices.
+
+    e.g. derive_seed(base, game_index) for each game of a run, derive_seed(game_seed, seat) for a
+    player's policy. Hashing (rather than base + index) keeps neighbouring streams unrelated.
+    """
+    key = ",".join(str(part) for part in (seed, *path)).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=SEED_BYTES).digest(), "little")
+
+def game_seed(base_seed: int, game_index: int) -> int:
+    return derive_seed(base_seed, game_index)
+
+# SplitMix64 finalizer over (key, counter): roll n of a stream is a pure function of its key and n
+MASK64 = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+DICE_STREAM = 0xD1CE  # derive_seed path of a game's dice key
+
+def splitmix64(key: int, counter: int) -> int:
+    z = (key + (counter + 1) * GAMMA) & MASK64
+    z = ((z ^ (z >> 30)) * MIX1) & MASK64
+    z = ((z ^ (z >> 27)) * MIX2) & MASK64
+    return z ^ (z >> 31)
+
+class DiceStream:
+    """
+    Battle dice (0-3) drawn from a counter-based stream.
+
+    The whole state is the counter, so undo and snapshots save one int, and a batch of streams can be
+    advanced together with NumPy (battle_batch.roll_battle_dice) without leaving the scalar sequence.
+    """
+
+    def __init__(self, key: int, counter: int = 0):
+        self.key = key
+        self.counter = counter
+
+    def roll(self) -> int:
+        roll = splitmix64(self.key, self.counter) & 3  # low bits of a 64-bit output: uniform over 0-3
+        self.counter += 1
+        return roll
+
+    @classmethod
+    def for_seed(cls, seed: int) -> "DiceStream":
+        return cls(derive_seed(seed, DICE_STREAM))
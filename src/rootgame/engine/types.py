@@ -1,6 +1,7 @@
 from enum import Enum, StrEnum, auto
 
 MAX_HAND_SIZE = 5
+WINNING_SCORE = 30
 
 class FactionName(StrEnum):
     NONE = auto()
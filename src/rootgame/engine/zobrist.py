@@ -0,0 +1,65 @@
+from functools import cache
+from typing import ClassVar, Iterable
+import hashlib
+
+from rootgame.engine.base_deck import BASE_GAME_DECK
+from rootgame.engine.card import VIZIER, Card
+
+# Zobrist hashing: a state hashes to the XOR of a 64-bit key per piece present, kept current by the mutation methods
+# Counted things are keyed by (what, count), so the same contents hash the same in any order; a count of 0 has key 0
+# Keys are hashed from their parts rather than drawn from an RNG, so every process agrees on them
+
+ZOBRIST_BITS = 64
+
+@cache
+def zobrist_key(*parts) -> int:
+    key = ",".join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=ZOBRIST_BITS // 8, person=b"rootgame-zobrist").digest(), "little")
+
+def count_key(count: int, *parts) -> int:
+    return zobrist_key(*parts, count) if count else 0
+
+def recount_key(old_count: int, new_count: int, *parts) -> int:
+    # XOR into a hash to move the counted thing from old_count to new_count
+    return count_key(old_count, *parts) ^ count_key(new_count, *parts)
+
+# Cards
+def card_signature(card: Card) -> str:
+    # Identical cards (e.g. the two Sappers) share a signature
+    return f"{type(card).__name__}{vars(card)!r}"
+
+SHARED_CARD_SIGNATURES = {id(card): card_signature(card) for card in (*BASE_GAME_DECK, VIZIER)}
+
+def card_kind(card: Card) -> str:
+    # Deck cards and the vizier are module-level singletons, so their signatures are computed once
+    signature = SHARED_CARD_SIGNATURES.get(id(card))
+    return signature if signature is not None else card_signature(card)
+
+def cards_zobrist(cards: Iterable[Card], *parts) -> int:
+    counts: dict[str, int] = {}
+    for card in cards:
+        kind = card_kind(card)
+        counts[kind] = counts.get(kind, 0) + 1
+    zobrist = 0
+    for (kind, count) in counts.items():
+        zobrist ^= zobrist_key(*parts, kind, count)
+    return zobrist
+
+class HashedFields:
+    # Mixin that folds the scalar fields named in hashed_fields into self.zobrist whenever they are assigned
+    hashed_fields: ClassVar[frozenset[str]] = frozenset()
+
+    def __setattr__(self, name, value):
+        if(name in self.hashed_fields and self.__dict__.get(name, HashedFields) != value):
+            zobrist = self.__dict__.get("zobrist", 0) ^ zobrist_key(type(self).__name__, name, value)
+            if(name in self.__dict__):
+                zobrist ^= zobrist_key(type(self).__name__, name, self.__dict__[name])
+            object.__setattr__(self, "zobrist", zobrist)
+        object.__setattr__(self, name, value)
+
+    def compute_zobrist(self) -> int:
+        # From scratch, for checking the incremental value
+        zobrist = 0
+        for name in self.hashed_fields:
+            zobrist ^= zobrist_key(type(self).__name__, name, getattr(self, name))
+        return zobrist
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+
+from rootgame.server.game_server import MAX_LINE
+from rootgame.server.protocol import decode_message, encode_message
+
+
+class GameClient:
+    """
+    Asyncio client for GameServer: request() sends one op and waits for its response, while
+    events pushed by the server (other seats' actions) collect in `events`.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.pending: dict[int, asyncio.Future] = {}
+        self.request_ids = itertools.count(1)
+        self.read_task = asyncio.create_task(self.read_loop())
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> GameClient:
+        (reader, writer) = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> GameClient:
+        (reader, writer) = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def read_loop(self) -> None:
+        try:
+            while line := await self.reader.readline():
+                message = decode_message(line)
+                future = self.pending.pop(message.get("id"), None)
+                if future is not None:
+                    future.set_result(message)
+                else:
+                    self.events.put_nowait(message)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection closed"))
+
+    async def request(self, op: str, **fields) -> dict:
+        request_id = next(self.request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(encode_message({"op": op, "id": request_id, **fields}))
+        await self.writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self.read_task, return_exceptions=True)
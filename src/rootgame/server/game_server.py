@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+
+from rootgame.engine.actions import BattleAction
+from rootgame.engine.game import Game
+from rootgame.engine.rng import MAX_SEED
+from rootgame.server.protocol import (ProtocolError, action_from_json, action_to_json, decode_message, encode_message,
+                                      game_view, is_finished)
+from rootgame.server.spectator import SpectatorFeed
+
+MAX_LINE = 1 << 20  # longest accepted request, in bytes
+OUTBOX_SIZE = 1024  # queued messages per connection before its events are dropped
+DEFAULT_LEGAL_LIMIT = 64
+LATENCY_WINDOW = 4096  # recent latencies kept for percentiles
+IDLE_TIMEOUT = 600.0  # seconds an unfinished game with nobody seated or watching is kept
+
+
+@dataclass
+class LatencyStats:
+    """Per-action latency, from reading the request to having the response ready."""
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> dict:
+        recent = sorted(self.recent)
+
+        def percentile(fraction: float) -> float:
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] * 1000 if recent else 0.0
+
+        return {
+            "actions": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "max_ms": self.max * 1000,
+        }
+
+
+class Session:
+    """One client connection. Everything it is sent goes through its outbox, written by its own task."""
+
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter) -> None:
+        self.session_id = session_id
+        self.writer = writer
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self.seats: dict[str, int] = {}  # game id -> seat
+        self.spectating: set[str] = set()  # game ids
+        self.behind: set[SpectatorFeed] = set()  # feeds that dropped messages for it, owed a keyframe
+        self.dropped_events = 0
+
+    def send(self, message: dict) -> None:
+        self.outbox.put_nowait(encode_message(message))
+
+    def send_bytes(self, data: bytes) -> None:
+        # An already encoded message, e.g. one shared by every spectator of a game
+        self.outbox.put_nowait(data)
+
+    def send_event(self, message: dict) -> None:
+        # Events are advisory (a client can always observe), so a client too slow to take them loses them
+        if self.outbox.full():
+            self.dropped_events += 1
+            return
+        self.send(message)
+
+    async def write_loop(self) -> None:
+        try:
+            while True:
+                data = await self.outbox.get()
+                if data is None:
+                    break
+                self.writer.write(data)
+                await self.writer.drain()
+                if self.behind and self.outbox.empty():
+                    for feed in list(self.behind):
+                        feed.catch_up(self)
+        except ConnectionError:
+            pass  # the reader side notices and cleans up
+
+
+class HostedGame:
+    def __init__(self, game_id: str, seed: int | None) -> None:
+        self.game_id = game_id
+        self.game = Game(seed=seed)
+        self.seats: dict[int, Session] = {}
+        self.latency = LatencyStats()
+        self.feed = SpectatorFeed(game_id, self.game)
+        self.last_active = time.monotonic()  # creation, or the last join or action
+
+    def abandoned(self) -> bool:
+        return not self.seats and not self.feed.subscribers
+
+
+class GameServer:
+    """
+    Hosts any number of concurrent games behind the newline-delimited JSON protocol in protocol.py.
+
+    Each connection is served by its own reader task and writer task, so a client that is slow
+    to read never holds up anyone else. A request is handled to completion on the event loop
+    without awaiting, so the actions on a game are applied one at a time, in arrival order, and
+    each is checked against the state the previous one left.
+    """
+
+    def __init__(self, max_games: int | None = None, send_buffer: int | None = None,
+                 idle_timeout: float | None = IDLE_TIMEOUT) -> None:
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout  # None keeps unfinished games until the server stops
+        self.send_buffer = send_buffer  # bytes a connection may buffer below its outbox; None leaves it to the OS
+        self.games: dict[str, HostedGame] = {}
+        self.latency = LatencyStats()
+        self.game_ids = itertools.count(1)
+        self.session_ids = itertools.count(1)
+        self.servers: list[asyncio.AbstractServer] = []
+        self.connections: dict[asyncio.Task, Session] = {}
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        self.servers.append(server)
+        return server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+        self.servers.append(server)
+        return server
+
+    async def close(self) -> None:
+        # Stop listening, then hang up on every client and wait for their handlers to finish
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+        for session in self.connections.values():
+            session.writer.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+
+    # Connections
+    def limit_send_buffer(self, writer: asyncio.StreamWriter) -> None:
+        # Loopback and fast links let the kernel buffer megabytes for a client that isn't reading;
+        # capping it makes a slow client back up into its outbox, where spectator feeds can see it
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        writer.transport.set_write_buffer_limits(high=self.send_buffer)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.send_buffer:
+            self.limit_send_buffer(writer)
+        session = Session(next(self.session_ids), writer)
+        write_task = asyncio.create_task(session.write_loop())
+        handler_task = asyncio.current_task()
+        self.connections[handler_task] = session
+        try:
+            while not write_task.done():
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):
+                    break  # request over MAX_LINE, or the connection dropped
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                start = time.perf_counter()
+                message = {}
+                try:
+                    message = decode_message(line)
+                    response = self.dispatch(session, message, start)
+                except ProtocolError as error:
+                    response = {"ok": False, "error": str(error)}
+                except Exception as error:
+                    response = {"ok": False, "error": f"Internal error: {type(error).__name__}: {error}"}
+                if "id" in message:
+                    response["id"] = message["id"]
+                if session.outbox.full():
+                    break  # not reading its responses; drop the connection
+                session.send(response)
+        finally:
+            self.leave_all(session)
+            if session.outbox.full():
+                write_task.cancel()
+            elif not write_task.done():
+                session.outbox.put_nowait(None)
+            await asyncio.gather(write_task, return_exceptions=True)
+            writer.close()
+            del self.connections[handler_task]
+
+    def leave_all(self, session: Session) -> None:
+        for (game_id, seat) in session.seats.items():
+            hosted = self.games.get(game_id)
+            if hosted is not None and hosted.seats.get(seat) is session:
+                del hosted.seats[seat]
+                self.evict_if_finished(hosted)
+        session.seats = {}
+        for game_id in session.spectating:
+            hosted = self.games.get(game_id)
+            if hosted is not None:
+                hosted.feed.unsubscribe(session)
+                self.evict_if_finished(hosted)
+        session.spectating = set()
+
+    def evict_if_finished(self, hosted: HostedGame) -> None:
+        # A finished game is dropped once nobody is seated at or watching it
+        if is_finished(hosted.game) and hosted.abandoned():
+            self.games.pop(hosted.game_id, None)
+
+    def evict_idle(self) -> None:
+        # Unfinished games nobody is seated at or watching are kept for players to come back to, until they go idle
+        if self.idle_timeout is None:
+            return
+        cutoff = time.monotonic() - self.idle_timeout
+        for hosted in [hosted for hosted in self.games.values() if hosted.last_active < cutoff and hosted.abandoned()]:
+            del self.games[hosted.game_id]
+
+    # Requests
+    def dispatch(self, session: Session, message: dict, start: float) -> dict:
+        op = message.get("op")
+        handler = getattr(self, f"op_{op}", None) if isinstance(op, str) else None
+        if handler is None:
+            raise ProtocolError(f"Unknown op {op!r}")
+        return handler(session, message, start)
+
+    def get_game(self, message: dict) -> HostedGame:
+        game_id = message.get("game")
+        hosted = self.games.get(game_id) if isinstance(game_id, str) else None
+        if hosted is None:
+            raise ProtocolError(f"No game {message.get('game')!r}")
+        return hosted
+
+    def op_create(self, session: Session, message: dict, start: float) -> dict:
+        self.evict_idle()
+        if self.max_games is not None and len(self.games) >= self.max_games:
+            raise ProtocolError("Server is full")
+        seed = message.get("seed")
+        if seed is not None and (not isinstance(seed, int) or not 0 <= seed < MAX_SEED):
+            raise ProtocolError("'seed' must be an integer in [0, 2**64)")
+        game_id = f"g{next(self.game_ids)}"
+        hosted = HostedGame(game_id, seed)
+        self.games[game_id] = hosted
+        # The seed stays private: it determines the deck order, and so every hand and draw
+        return {"ok": True, "game": game_id,
+                "seats": [player.faction.faction_name.value for player in hosted.game.players]}
+
+    def op_join(self, session: Session, message: dict, start: float) -> dict:
+        hosted = self.get_game(message)
+        seat = message.get("seat")
+        current = session.seats.get(hosted.game_id)
+        if current is not None and seat not in (None, current):
+            raise ProtocolError(f"Already seated at seat {current}")  # one seat per connection and game
+        if seat is None:
+            seat = current if current is not None else next((seat for seat in range(len(hosted.game.players)) if seat not in hosted.seats), None)
+            if seat is None:
+                raise ProtocolError("Every seat is taken")
+        if not isinstance(seat, int) or not 0 <= seat < len(hosted.game.players):
+            raise ProtocolError(f"No seat {seat!r}")
+        if hosted.seats.get(seat, session) is not session:
+            raise ProtocolError(f"Seat {seat} is taken")
+        hosted.seats[seat] = session
+        session.seats[hosted.game_id] = seat
+        hosted.last_active = time.monotonic()
+        return {"ok": True, "game": hosted.game_id, "seat": seat, "view": game_view(hosted.game, seat)}
+
+    def op_observe(self, session: Session, message: dict, start: float) -> dict:
+        hosted = self.get_game(message)
+        response = {"ok": True, "view": game_view(hosted.game, session.seats.get(hosted.game_id))}
+        if is_finished(hosted.game):
+            response["seed"] = hosted.game.seed  # with nothing left hidden, enough to replay the game
+        return response
+
+    def op_legal(self, session: Session, message: dict, start: float) -> dict:
+        hosted = self.get_game(message)
+        game = hosted.game
+        limit = message.get("limit", DEFAULT_LEGAL_LIMIT)
+        if not isinstance(limit, int) or limit < 0:
+            raise ProtocolError("'limit' must be a non-negative integer")
+        if session.seats.get(hosted.game_id) != game.current_player.seat or is_finished(game):
+            return {"ok": True, "current_seat": game.current_player.seat, "actions": []}
+        return {"ok": True, "current_seat": game.current_player.seat,
+                "actions": [action_to_json(action) for action in islice(game.iter_legal_actions(), limit)]}
+
+    def op_act(self, session: Session, message: dict, start: float) -> dict:
+        hosted = self.get_game(message)
+        game = hosted.game
+        seat = session.seats.get(hosted.game_id)
+        if seat is None:
+            raise ProtocolError("Join the game before acting")
+        if is_finished(game):
+            raise ProtocolError("The game is over")
+        if seat != game.current_player.seat:
+            raise ProtocolError(f"It is seat {game.current_player.seat}'s turn")
+        action = action_from_json(message.get("action"), game.players)
+        if isinstance(action, BattleAction) and action.attacker is not game.current_player:
+            raise ProtocolError("Can only battle as your own seat")
+        legality = game.is_action_legal(action)
+        if not legality:
+            raise ProtocolError(f"Illegal action: {legality.message}")
+        game.apply_action(action)
+        hosted.last_active = time.monotonic()
+
+        latency = time.perf_counter() - start
+        hosted.latency.record(latency)
+        self.latency.record(latency)
+
+        event = {"event": "update", "game": hosted.game_id, "seat": seat, "action": action_to_json(action),
+                 "current_seat": game.current_player.seat, "finished": is_finished(game)}
+        for (other_seat, other) in hosted.seats.items():
+            if other is not session:
+                other.send_event(event)
+        hosted.feed.publish(action)
+        return {"ok": True, "latency_ms": latency * 1000, "view": game_view(game, seat)}
+
+    def op_spectate(self, session: Session, message: dict, start: float) -> dict:
+        hosted = self.get_game(message)
+        session.spectating.add(hosted.game_id)
+        return {"ok": True, "game": hosted.game_id, **hosted.feed.subscribe(session)}
+
+    def op_unspectate(self, session: Session, message: dict, start: float) -> dict:
+        hosted = self.get_game(message)
+        session.spectating.discard(hosted.game_id)
+        hosted.feed.unsubscribe(session)
+        self.evict_if_finished(hosted)
+        return {"ok": True, "game": hosted.game_id}
+
+    def op_stats(self, session: Session, message: dict, start: float) -> dict:
+        if "game" in message:
+            hosted = self.get_game(message)
+            return {"ok": True, "game": hosted.game_id, "latency": hosted.latency.summary(),
+                    "spectators": len(hosted.feed.subscribers), "seq": hosted.feed.seq, "feed": hosted.feed.stats.summary()}
+        return {"ok": True, "games": len(self.games), "latency": self.latency.summary()}
+
+
+async def serve(host: str, port: int, unix_path: str | None, max_games: int | None, send_buffer: int | None = None,
+                idle_timeout: float | None = IDLE_TIMEOUT) -> None:
+    server = GameServer(max_games=max_games, send_buffer=send_buffer, idle_timeout=idle_timeout)
+    if unix_path:
+        listener = await server.start_unix(unix_path)
+    else:
+        listener = await server.start_tcp(host, port)
+    print(f"Serving on {', '.join(str(sock.getsockname()) for sock in listener.sockets)}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="rootgame-server", description="Host games over newline-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address to listen on")
+    parser.add_argument("--port", type=int, default=7878, help="TCP port to listen on")
+    parser.add_argument("--unix", metavar="PATH", default=None, help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-games", type=int, default=None, help="refuse to create more than this many games")
+    parser.add_argument("--send-buffer", type=int, default=None, help="cap each connection's socket send buffer, in bytes")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="drop an unfinished game after this many seconds with nobody seated or watching (0 keeps them)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.max_games, args.send_buffer, args.idle_timeout or None))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
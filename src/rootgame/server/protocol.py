@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+
+from rootgame.engine.actions import Action, AddWoodToSawmillsAction, DrawCardAction, MoveAction
+from rootgame.engine.binary_log import ACTION_CODECS, INT, INTS, MOVE, PLAYER
+from rootgame.engine.board import Token
+from rootgame.engine.card import Card
+from rootgame.engine.game import Game
+from rootgame.engine.player import Player
+from rootgame.engine.types import WINNING_SCORE
+
+# Newline-delimited JSON: every message is one JSON object on its own line.
+#
+# Requests carry an "op" and an optional "id" that is echoed in the response:
+#
+#   {"op": "create", "seed": 7}                      -> {"ok": true, "game": "g1", "seats": [...]}
+#   {"op": "join", "game": "g1", "seat": 0}          -> {"ok": true, "seat": 0, "view": {...}}
+#   {"op": "observe", "game": "g1"}                  -> {"ok": true, "view": {...}}  (and "seed" once it's over)
+#   {"op": "legal", "game": "g1", "limit": 64}       -> {"ok": true, "actions": [...]}
+#   {"op": "act", "game": "g1", "action": {...}}     -> {"ok": true, "latency_ms": 0.21, "view": {...}}
+#   {"op": "stats"}                                  -> {"ok": true, "games": 12, "latency": {...}}
+#   {"op": "spectate", "game": "g1"}                 -> {"ok": true, "seq": 41, "view": {...}}
+#   {"op": "unspectate", "game": "g1"}               -> {"ok": true}
+#
+# Failures are {"ok": false, "error": "..."}. After every action, the other seats of the game get
+# an event {"event": "update", "game": ..., "seat": ..., "action": {...}, "current_seat": ...},
+# and its spectators a delta or keyframe event (see spectator.py). A finished game is removed once
+# its seats and spectators have all disconnected (or unspectated); an unfinished one once nobody has
+# been seated at or watching it for the server's idle timeout. A connection holds one seat per game.
+#
+# Actions are {"type": <action class name>, <field>: <value>, ...} with moves as
+# [warriors, source, destination], players as seats and enums as their string values.
+
+class ProtocolError(Exception):
+    pass
+
+# Actions a client may send; the automatic ones (drawing, adding wood) are the engine's to take
+CHOOSABLE_ACTIONS = {action_type.__name__: (action_type, fields) for (_, action_type, fields) in ACTION_CODECS
+                     if action_type not in (DrawCardAction, AddWoodToSawmillsAction)}
+
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode_message(line: bytes) -> dict:
+    try:
+        message = json.loads(line)
+    except ValueError as error:
+        raise ProtocolError(f"Malformed JSON: {error}") from None
+    if not isinstance(message, dict):
+        raise ProtocolError("Messages must be JSON objects")
+    return message
+
+
+# ----------------------------
+# Actions
+# ----------------------------
+
+def action_to_json(action: Action) -> dict:
+    (_, fields) = CHOOSABLE_ACTIONS[type(action).__name__]
+    data = {"type": type(action).__name__}
+    for (name, kind) in fields:
+        value = getattr(action, name)
+        if kind is MOVE:
+            data[name] = [value.num_warriors, value.source_clearing, value.destination_clearing]
+        elif kind is PLAYER:
+            data[name] = value.seat
+        elif kind is INTS:
+            data[name] = list(value)
+        elif kind is INT:
+            data[name] = value
+        else:
+            data[name] = value.value
+    return data
+
+
+def action_from_json(data: object, players: list[Player]) -> Action:
+    if not isinstance(data, dict) or data.get("type") not in CHOOSABLE_ACTIONS:
+        raise ProtocolError(f"Unknown action: {data!r}")
+    (action_type, fields) = CHOOSABLE_ACTIONS[data["type"]]
+    values = []
+    for (name, kind) in fields:
+        value = data.get(name)
+        if kind is INT:
+            values.append(parse_int(value, name))
+        elif kind is INTS:
+            if not isinstance(value, list):
+                raise ProtocolError(f"'{name}' must be a list")
+            ints = [parse_int(item, name) for item in value]
+            if len(set(ints)) != len(ints):
+                raise ProtocolError(f"'{name}' has repeated entries")
+            values.append(ints)
+        elif kind is MOVE:
+            if not isinstance(value, list) or len(value) != 3:
+                raise ProtocolError(f"'{name}' must be [warriors, source, destination]")
+            values.append(MoveAction(*[parse_int(item, name) for item in value]))
+        elif kind is PLAYER:
+            seat = parse_int(value, name)
+            if seat >= len(players):
+                raise ProtocolError(f"No seat {seat}")
+            values.append(players[seat])
+        else:
+            try:
+                values.append(kind(value))
+            except ValueError:
+                raise ProtocolError(f"'{name}' must be one of {[member.value for member in kind]}") from None
+    return action_type(*values)
+
+
+def parse_int(value: object, name: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ProtocolError(f"'{name}' must be a non-negative integer")
+    return value
+
+
+# ----------------------------
+# Views
+# ----------------------------
+
+def card_to_json(card: Card) -> dict:
+    data = {"type": type(card).__name__, "suit": card.suit.value if card.suit is not None else None}
+    for name in ("name", "item", "crafting_VP"):
+        if hasattr(card, name):
+            data[name] = getattr(card, name)
+    return data
+
+
+def clearing_to_json(board, clearing_id: int, factions: list) -> dict:
+    ruler = board.get_clearing_ruler(clearing_id)
+    return {
+        "suit": board.get_clearing_suit(clearing_id).value,
+        "warriors": {faction.value: count for faction in factions if (count := board.get_warrior_count(clearing_id, faction))},
+        "buildings": [[building_type.value, owner.value, used] for (building_type, owner, used) in board.get_buildings_at_clearing(clearing_id)],
+        "tokens": {faction.value: {token.value: count for token in Token if (count := board.get_token_count_at_clearing(clearing_id, token, faction))}
+                   for faction in factions if any(board.get_token_count_at_clearing(clearing_id, token, faction) for token in Token)},
+        "ruler": ruler.value if ruler is not None else None,
+    }
+
+
+def board_to_json(board, factions: list) -> list[dict]:
+    return [clearing_to_json(board, clearing_id, factions) for clearing_id in board.get_clearing_ids()]
+
+
+def faction_to_json(faction) -> dict:
+    # Public faction state: its counters, plus the decree for the Eyrie
+    data = {"faction": faction.faction_name.value}
+    for name in sorted(faction.hashed_fields):
+        data[name] = getattr(faction, name)
+    if hasattr(faction, "decree"):
+        data["decree"] = {option.value: [card_to_json(card) for card in cards] for (option, cards) in faction.decree.items()}
+        data["used_leaders"] = [leader.value for leader in faction.used_leaders]
+    return data
+
+
+def is_finished(game: Game) -> bool:
+    return any(player.score >= WINNING_SCORE for player in game.players) or not game.deck.cards
+
+
+def game_view(game: Game, viewer: int | None) -> dict:
+    """
+    Everything `viewer` may see: the board, scores, faction state and their own hand.
+
+    Other seats' hands are reduced to their sizes; spectators (viewer None) see no hands.
+    """
+    factions = [player.faction.faction_name for player in game.players]
+    return {
+        **turn_to_json(game),
+        "seat": viewer,
+        "players": [player_to_json(player, viewer) for player in game.players],
+        "board": board_to_json(game.board, factions),
+    }
+
+
+def turn_to_json(game: Game) -> dict:
+    return {
+        "round": game.round,
+        "phase": game.current_phase.name,
+        "current_seat": game.current_player.seat,
+        "finished": is_finished(game),
+        "deck": len(game.deck.cards),
+    }
+
+
+def player_to_json(player: Player, viewer: int | None) -> dict:
+    return {
+        "seat": player.seat,
+        "score": player.score,
+        "hand_size": len(player.hand),
+        "hand": [card_to_json(card) for card in player.hand] if player.seat == viewer else None,
+        **faction_to_json(player.faction),
+    }
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from rootgame.engine.actions import Action
+from rootgame.engine.board import ClearingField
+from rootgame.engine.game import Game
+from rootgame.server.protocol import action_to_json, clearing_to_json, encode_message, game_view, player_to_json, turn_to_json
+
+if TYPE_CHECKING:
+    from rootgame.server.game_server import Session
+
+# Spectators of a game get its state once, then only what each action changed:
+#
+#   {"op": "spectate", "game": "g1"}  -> {"ok": true, "game": "g1", "seq": 41, "view": {...}}
+#
+#   {"event": "delta", "game": "g1", "seq": 42, "action": {...},
+#    "turn": {"phase": "EVENING"},                       changed turn fields
+#    "players": {"0": {"score": 4, "wood": 3}},          changed public player fields, by seat
+#    "board": {"5": {"warriors": {...}, "ruler": ...}}}  changed fields of changed clearings, by clearing id
+#
+#   {"event": "keyframe", "game": "g1", "seq": 64, "view": {...}}
+#
+# Views are game_view(game, None): the whole public state, no hands. A delta applies to the state
+# at seq - 1 (see apply_delta) and leaves out anything that didn't change. Each delta is encoded
+# once and the same bytes go to every spectator.
+#
+# Every KEYFRAME_EVERY actions everyone gets a keyframe instead of the delta. A spectator whose
+# connection has SPECTATOR_BACKLOG messages still unsent is skipped; having missed a delta, it is
+# sent a keyframe once it has caught up (its outbox has emptied, or at the next action with room),
+# rather than every delta in between.
+
+KEYFRAME_EVERY = 64
+SPECTATOR_BACKLOG = 32
+
+# Clearing fields in clearing_to_json, by the kind of change that affects them
+CLEARING_JSON_FIELDS = {
+    ClearingField.WARRIORS: "warriors",
+    ClearingField.BUILDINGS: "buildings",
+    ClearingField.TOKENS: "tokens",
+    ClearingField.RULER: "ruler",
+}
+
+
+@dataclass
+class FeedStats:
+    deltas: int = 0
+    keyframes: int = 0
+    delta_bytes: int = 0
+    keyframe_bytes: int = 0
+    sent: int = 0
+    dropped: int = 0  # deltas or keyframes a backlogged spectator didn't get
+
+    def summary(self) -> dict:
+        return {
+            "deltas": self.deltas,
+            "keyframes": self.keyframes,
+            "mean_delta_bytes": self.delta_bytes / self.deltas if self.deltas else 0.0,
+            "mean_keyframe_bytes": self.keyframe_bytes / self.keyframes if self.keyframes else 0.0,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+
+class SpectatorFeed:
+    """
+    Turns the actions on one hosted game into delta and keyframe messages for its spectators.
+
+    The delta for an action comes from the board's changes_since and a comparison of the turn
+    and public player fields with those last published, so its cost follows what the action
+    changed rather than the size of the game.
+    """
+
+    def __init__(self, game_id: str, game: Game) -> None:
+        self.game_id = game_id
+        self.game = game
+        self.factions = [player.faction.faction_name for player in game.players]
+        self.subscribers: dict[Session, bool] = {}  # session -> whether it missed a message and needs a keyframe
+        self.seq = 0
+        self.encoded_keyframe: tuple[int, bytes] = (-1, b"")
+        self.stats = FeedStats()
+        self.mark()
+
+    def mark(self) -> None:
+        # Take the current state as the base of the next delta
+        self.version = self.game.board.version
+        self.turn = turn_to_json(self.game)
+        self.players = [player_to_json(player, None) for player in self.game.players]
+
+    def subscribe(self, session: Session) -> dict:
+        self.subscribers[session] = False
+        return {"seq": self.seq, "view": game_view(self.game, None)}
+
+    def unsubscribe(self, session: Session) -> None:
+        self.subscribers.pop(session, None)
+        session.behind.discard(self)
+
+    def catch_up(self, session: Session) -> None:
+        # The session has worked through its backlog; bring it up to date if it missed anything
+        session.behind.discard(self)
+        if self.subscribers.get(session):
+            session.send_bytes(self.keyframe_bytes())
+            self.subscribers[session] = False
+            self.stats.sent += 1
+
+    # ----------------------------
+    # Messages
+    # ----------------------------
+
+    def delta(self, action: Action | None) -> dict:
+        message = {"event": "delta", "game": self.game_id, "seq": self.seq}
+        if action is not None:
+            message["action"] = action_to_json(action)
+
+        turn = turn_to_json(self.game)
+        changed_turn = {name: value for (name, value) in turn.items() if self.turn.get(name) != value}
+        if changed_turn:
+            message["turn"] = changed_turn
+
+        changed_players = {}
+        for (old, player) in zip(self.players, self.game.players):
+            new = player_to_json(player, None)
+            fields = {name: value for (name, value) in new.items() if old.get(name) != value}
+            if fields:
+                changed_players[str(player.seat)] = fields
+        if changed_players:
+            message["players"] = changed_players
+
+        changed_board = {}
+        for (clearing_id, fields) in self.game.board.changes_since(self.version).items():
+            clearing = clearing_to_json(self.game.board, clearing_id, self.factions)
+            changed_board[str(clearing_id)] = {name: clearing[name] for (field, name) in CLEARING_JSON_FIELDS.items() if field in fields}
+        if changed_board:
+            message["board"] = changed_board
+        return message
+
+    def keyframe(self) -> dict:
+        return {"event": "keyframe", "game": self.game_id, "seq": self.seq, "view": game_view(self.game, None)}
+
+    def keyframe_bytes(self) -> bytes:
+        # Encoded once per seq, however many spectators it goes to
+        if self.encoded_keyframe[0] != self.seq:
+            data = encode_message(self.keyframe())
+            self.encoded_keyframe = (self.seq, data)
+            self.stats.keyframes += 1
+            self.stats.keyframe_bytes += len(data)
+        return self.encoded_keyframe[1]
+
+    # ----------------------------
+    # Fan-out
+    # ----------------------------
+
+    def publish(self, action: Action | None = None) -> None:
+        """Send spectators what the last action changed; call after every action on the game."""
+        self.seq += 1
+        if not self.subscribers:
+            self.mark()  # nobody to tell; a new spectator starts from a full view anyway
+            return
+        periodic = self.seq % KEYFRAME_EVERY == 0
+
+        delta = None
+        if not periodic:
+            delta = encode_message(self.delta(action))
+            self.stats.deltas += 1
+            self.stats.delta_bytes += len(delta)
+
+        for (session, stale) in self.subscribers.items():
+            if session.outbox.qsize() >= SPECTATOR_BACKLOG:
+                self.subscribers[session] = True
+                session.behind.add(self)
+                self.stats.dropped += 1
+                continue
+            if stale or periodic:
+                session.send_bytes(self.keyframe_bytes())
+                self.subscribers[session] = False
+                session.behind.discard(self)
+            else:
+                session.send_bytes(delta)
+            self.stats.sent += 1
+        self.mark()
+
+
+def apply_delta(view: dict, seq: int | None, message: dict) -> int | None:
+    """
+    Bring a spectator's copy of the view up to date with a delta or keyframe, in place.
+
+    `seq` is the view's current sequence number; returns the new one, or None if the message
+    doesn't follow on from it (a delta was missed). The view is then out of date, and is left
+    alone until a keyframe arrives; pass None as `seq` until then.
+    """
+    if message["event"] == "keyframe":
+        view.clear()
+        view.update(message["view"])
+        return message["seq"]
+    if seq is None or message["seq"] != seq + 1:
+        return None
+    view.update(message.get("turn", {}))
+    for (seat, fields) in message.get("players", {}).items():
+        view["players"][int(seat)].update(fields)
+    for (clearing_id, fields) in message.get("board", {}).items():
+        view["board"][int(clearing_id)].update(fields)
+    return message["seq"]
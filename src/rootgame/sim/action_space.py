@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import product
+
+import numpy as np
+
+from rootgame.engine.actions import *
+from rootgame.engine.board import AUTUMN_BOARD_EDGES, AUTUMN_BOARD_SUITS
+from rootgame.engine.building import BuildingType
+from rootgame.engine.eyrie_dynasties import EyrieDynasties
+from rootgame.engine.game import Game
+from rootgame.engine.marquise_de_cat import MarquiseDeCat
+from rootgame.engine.types import MAX_HAND_SIZE, DecreeOption, TurnPhase
+
+# A fixed discrete action space: every action a player can choose gets a stable integer index, in
+# these sections (in order):
+#
+#   end phase, Marquise recruit, Eyrie turmoil
+#   battles               clearing x attacker seat x defender seat
+#   Marquise builds       clearing x building type
+#   Marquise overwork     clearing x card slot
+#   Marquise craft        card slot
+#   Marquise extra turn   card slot
+#   Marquise marches      move x move, a move being (directed edge, 1..MARCH_MAX_WARRIORS warriors)
+#   Eyrie decree          card slot x decree column
+#   Eyrie recruit/build   clearing
+#   Eyrie moves           directed edge x 1..Eyrie warrior limit warriors
+#   Eyrie craft           card slot
+#   discards              every non-empty set of card slots
+#
+# The tables are built once at import. Legal actions the space can't express (a march moving
+# more than MARCH_MAX_WARRIORS warriors in one move, a card beyond CARD_SLOTS) are left out of
+# the mask; all the rest map one to one. Marches are never enumerated for the mask: their section
+# is filled from the first moves and the second moves each leaves open, as index ranges.
+
+NUM_SEATS = 2
+NUM_CLEARINGS = len(AUTUMN_BOARD_SUITS)
+CARD_SLOTS = MAX_HAND_SIZE + 3  # a full hand plus the largest evening draw
+MARCH_MAX_WARRIORS = 6  # per move; marches of two moves multiply, so this bounds the table
+EYRIE_MAX_WARRIORS = EyrieDynasties.warrior_limit
+MARQUISE_BUILDINGS = (BuildingType.SAWMILL, BuildingType.WORKSHOP, BuildingType.RECRUITER)
+
+# Both directions of every edge
+DIRECTED_EDGES = [edge for (a, b) in AUTUMN_BOARD_EDGES for edge in ((a, b), (b, a))]
+EDGE_INDEX = {edge: idx for (idx, edge) in enumerate(DIRECTED_EDGES)}
+NUM_MARCH_MOVES = len(DIRECTED_EDGES) * MARCH_MAX_WARRIORS  # march moves are (edge, count), edge-major
+
+
+@dataclass(frozen=True)
+class BattleSlot:
+    # Battles hold the Player objects, so their actions are made per game when decoded
+    clearing_id: int
+    attacker_seat: int
+    defender_seat: int
+
+
+def action_key(action: Action) -> tuple:
+    # Hashable identity of an action: its type and fields, players by seat, card sets sorted
+    if isinstance(action, MarchAction):
+        (one, two) = (action.move_one, action.move_two)
+        return (MarchAction, one.num_warriors, one.source_clearing, one.destination_clearing,
+                two.num_warriors, two.source_clearing, two.destination_clearing)
+    if isinstance(action, BattleAction):
+        return (BattleAction, action.clearing_id, action.attacker.seat, action.defender.seat)
+    if isinstance(action, DiscardCardAction):
+        return (DiscardCardAction, tuple(sorted(action.card_ids)))
+    return (type(action), *vars(action).values())
+
+
+def slot_key(entry: Action | BattleSlot) -> tuple:
+    if isinstance(entry, BattleSlot):
+        return (BattleAction, entry.clearing_id, entry.attacker_seat, entry.defender_seat)
+    return action_key(entry)
+
+
+def build_actions() -> tuple[list[Action | BattleSlot], dict[str, range]]:
+    actions: list[Action | BattleSlot] = []
+    sections: dict[str, range] = {}
+
+    def section(name: str, entries) -> None:
+        start = len(actions)
+        actions.extend(entries)
+        sections[name] = range(start, len(actions))
+
+    clearings = range(NUM_CLEARINGS)
+    card_slots = range(CARD_SLOTS)
+    march_moves = [MoveAction(count, source, dest) for ((source, dest), count) in product(DIRECTED_EDGES, range(1, MARCH_MAX_WARRIORS + 1))]
+
+    section("end_phase", [EndPhaseAction()])
+    section("marquise_recruit", [MarquiseRecruitAction()])
+    section("eyrie_turmoil", [EyrieTurmoilAction()])
+    section("battle", [BattleSlot(clearing_id, attacker, defender) for (clearing_id, attacker, defender) in product(clearings, range(NUM_SEATS), range(NUM_SEATS))])
+    section("marquise_build", [MarquiseBuildAction(clearing_id, building_type) for (clearing_id, building_type) in product(clearings, MARQUISE_BUILDINGS)])
+    section("marquise_overwork", [MarquiseOverworkAction(clearing_id, card_idx) for (clearing_id, card_idx) in product(clearings, card_slots)])
+    section("marquise_craft", [MarquiseCraftAction(card_idx) for card_idx in card_slots])
+    section("marquise_extra_turn", [MarquiseExtraTurnAction(card_idx) for card_idx in card_slots])
+    section("march", [MarchAction(one, two) for (one, two) in product(march_moves, march_moves)])
+    section("eyrie_decree", [EyrieAddToDecreeAction(card_id, option) for (card_id, option) in product(card_slots, DecreeOption)])
+    section("eyrie_recruit", [EyrieRecruitAction(clearing_id) for clearing_id in clearings])
+    section("eyrie_build", [EyrieBuildAction(clearing_id) for clearing_id in clearings])
+    section("eyrie_move", [EyrieMoveAction(count, source, dest) for ((source, dest), count) in product(DIRECTED_EDGES, range(1, EYRIE_MAX_WARRIORS + 1))])
+    section("eyrie_craft", [EyrieCraftAction(card_idx) for card_idx in card_slots])
+    section("discard", [DiscardCardAction([card_idx for card_idx in card_slots if bits >> card_idx & 1]) for bits in range(1, 1 << CARD_SLOTS)])
+    return (actions, sections)
+
+
+# Decode table (index -> action) and encode table (action key -> index)
+(ACTIONS, SECTIONS) = build_actions()
+ACTION_SPACE_SIZE = len(ACTIONS)
+INDEX_BY_KEY = {slot_key(entry): index for (index, entry) in enumerate(ACTIONS)}
+
+
+def encode_action(action: Action) -> int | None:
+    # None for actions outside the space
+    return INDEX_BY_KEY.get(action_key(action))
+
+
+def decode_action(index: int, game: Game) -> Action:
+    entry = ACTIONS[index]
+    if isinstance(entry, BattleSlot):
+        return BattleAction(entry.clearing_id, game.players[entry.attacker_seat], game.players[entry.defender_seat])
+    return entry
+
+
+def legal_action_mask(game: Game, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Boolean mask over the action space of the actions legal for the player to act.
+
+    One pass over the game's legal action generator, rather than testing every index with
+    is_action_legal, except for Marquise marches, which are filled in by fill_march_mask.
+    `out` (ACTION_SPACE_SIZE bools) is cleared and reused if given.
+    """
+    if out is None:
+        out = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+    else:
+        out[:] = False
+    faction = game.current_player.faction
+    if isinstance(faction, MarquiseDeCat) and game.current_phase == TurnPhase.DAYLIGHT:
+        actions_taken = game.game_log.get_actions_for_turn_phase(game.round, game.current_phase)
+        actions = faction.iter_daylight_actions(game.current_player, game.board, actions_taken, game.players, marches=False)
+        if faction.has_actions_left(actions_taken):
+            fill_march_mask(faction, game, out)
+    else:
+        actions = game.iter_legal_actions()
+    indices = [index for index in map(INDEX_BY_KEY.get, map(action_key, actions)) if index is not None]
+    out[indices] = True
+    return out
+
+
+def fill_march_mask(faction: MarquiseDeCat, game: Game, out: np.ndarray) -> None:
+    # Row of the march section per first move, then one run of counts per open second-move group
+    march_start = SECTIONS["march"].start
+    for ((count, source, dest), second_groups) in faction.iter_march_options(game.board, MARCH_MAX_WARRIORS):
+        row = march_start + (EDGE_INDEX[(source, dest)] * MARCH_MAX_WARRIORS + count - 1) * NUM_MARCH_MOVES
+        for (source_two, dest_two, num_warriors) in second_groups:
+            start = row + EDGE_INDEX[(source_two, dest_two)] * MARCH_MAX_WARRIORS
+            out[start:start + min(num_warriors, MARCH_MAX_WARRIORS)] = True
+
+
+class DiscreteActionSpace:
+    """The fixed action space above, for VectorEnv."""
+    size = ACTION_SPACE_SIZE
+
+    def fill_mask(self, game: Game, mask: np.ndarray) -> None:
+        legal_action_mask(game, mask)
+
+    def decode(self, game: Game, index: int, legal: None) -> Action | None:
+        return decode_action(index, game) if 0 <= index < ACTION_SPACE_SIZE else None
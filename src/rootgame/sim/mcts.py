@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+from rootgame.engine.actions import Action
+from rootgame.engine.binary_log import encode_action
+from rootgame.engine.game import Game, UndoRecord
+from rootgame.engine.types import WINNING_SCORE
+
+if TYPE_CHECKING:
+    from rootgame.sim.policies import Policy
+
+DEFAULT_ITERATIONS = 200
+DEFAULT_EXPLORATION = 1.4
+DEFAULT_ROLLOUT_DEPTH = 50
+DEFAULT_WIDENING = 2.0
+WIDENING_BUFFER = 8  # generated actions a node picks its next expansion from at random
+REUSE_SEARCH_LIMIT = 20000  # nodes examined when looking for the new root in the old tree
+
+
+def action_key(action: Action, game: Game) -> bytes:
+    # Actions aren't hashable; their binary log encoding is a compact canonical key
+    key = bytearray()
+    encode_action(key, action, game.players)
+    return bytes(key)
+
+
+def is_game_over(game: Game) -> bool:
+    return any(player.score >= WINNING_SCORE for player in game.players) or not game.deck.cards
+
+
+def evaluate(game: Game) -> list[float]:
+    """
+    Reward in [0, 1] for each seat: 1/0 once someone has won, otherwise 0.5 shifted by the score lead.
+    """
+    scores = [player.score for player in game.players]
+    best = max(scores)
+    if best >= WINNING_SCORE:
+        return [1.0 if score == best else 0.0 for score in scores]
+    rewards = []
+    for (seat, score) in enumerate(scores):
+        lead = score - max(other for (other_seat, other) in enumerate(scores) if other_seat != seat)
+        rewards.append(min(1.0, max(0.0, 0.5 + lead / (2 * WINNING_SCORE))))
+    return rewards
+
+
+# ----------------------------
+# Search tree
+# ----------------------------
+
+class Node:
+    """
+    A decision point: one game state (by Zobrist hash) and the player to act in it.
+
+    Legal actions are generated lazily, only as far as progressive widening has got (a Marquise
+    daylight can have thousands of marches, most of which are never expanded). Taking an action
+    leads to an Edge, whose outcomes are keyed by the resulting state's hash, so chance (battle
+    rolls, card draws, a new Eyrie leader) branches the tree instead of blurring it.
+    """
+    __slots__ = ("zobrist", "mover", "visits", "edges", "untried", "buffer")
+
+    def __init__(self, game: Game) -> None:
+        self.zobrist = game.zobrist
+        self.mover = game.current_player.seat
+        self.visits = 0
+        self.edges: dict[bytes, Edge] = {}
+        self.untried: Iterator[Action] | None = game.iter_legal_actions()
+        self.buffer: list[Action] = []
+
+    def next_untried(self, game: Game, rng: random.Random) -> Action | None:
+        # The game must be in this node's state. The generator is resumed from a later playout, so
+        # what it yields is checked against the game rather than trusted
+        while True:
+            while self.untried is not None and len(self.buffer) < WIDENING_BUFFER:
+                action = next(self.untried, None)
+                if action is None:
+                    self.untried = None
+                else:
+                    self.buffer.append(action)
+            if not self.buffer:
+                return None
+            idx = rng.randrange(len(self.buffer))
+            (self.buffer[idx], self.buffer[-1]) = (self.buffer[-1], self.buffer[idx])
+            action = self.buffer.pop()
+            if game.is_action_legal(action):
+                return action
+
+    @property
+    def exhausted(self) -> bool:
+        return self.untried is None and not self.buffer
+
+    def select(self, exploration: float) -> Edge:
+        log_visits = math.log(self.visits)
+        return max(self.edges.values(), key=lambda edge: edge.value / edge.visits + exploration * math.sqrt(log_visits / edge.visits))
+
+    def best_edge(self) -> Edge | None:
+        if not self.edges:
+            return None
+        return max(self.edges.values(), key=lambda edge: (edge.visits, edge.value))
+
+
+class Edge:
+    __slots__ = ("action", "visits", "value", "outcomes")
+
+    def __init__(self, action: Action) -> None:
+        self.action = action
+        self.visits = 0
+        self.value = 0.0  # total reward for the node's mover
+        self.outcomes: dict[int, Node] = {}
+
+
+@dataclass
+class SearchStats:
+    playouts: int = 0
+    duration: float = 0.0
+    reused_visits: int = 0
+
+    @property
+    def playouts_per_sec(self) -> float:
+        return self.playouts / self.duration if self.duration else 0.0
+
+
+# ----------------------------
+# Player
+# ----------------------------
+
+class MCTSPlayer:
+    """
+    Monte Carlo Tree Search (UCT) over the engine's own make/unmake.
+
+    Each playout descends the tree, expands one action, plays the rollout policy for up to
+    `rollout_depth` actions and backs the result up. Without a rollout policy, rollouts use
+    Game.sample_legal_action (a random kind of action, then a random action of that kind), which
+    never enumerates marches. The game is returned to the root state with Game.undo after every
+    playout. Every action is its own tree level, so the several actions of a
+    Marquise or Eyrie phase are searched one after another, each credited to the player taking it.
+
+    The search stops after `iterations` playouts or `time_budget` seconds, whichever comes first.
+    Hidden information is approximated by reshuffling the deck and reseeding the game's RNG for
+    every playout. The subtree for the state actually reached is kept for the next decision.
+    """
+
+    def __init__(
+        self,
+        seed: int | None = None,
+        iterations: int | None = DEFAULT_ITERATIONS,
+        time_budget: float | None = None,
+        rollout_policy: Policy | None = None,
+        exploration: float = DEFAULT_EXPLORATION,
+        widening: float = DEFAULT_WIDENING,
+        rollout_depth: int = DEFAULT_ROLLOUT_DEPTH,
+        reuse_tree: bool = True,
+    ) -> None:
+        if iterations is None and time_budget is None:
+            raise ValueError("MCTSPlayer needs an iteration or time budget")
+        self.rng = random.Random(seed)
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.rollout_policy = rollout_policy
+        self.exploration = exploration
+        self.widening = widening
+        self.rollout_depth = rollout_depth
+        self.reuse_tree = reuse_tree
+
+        self.root: Node | None = None
+        self.last_search = SearchStats()
+        self.total = SearchStats()
+
+    @property
+    def playouts_per_sec(self) -> float:
+        return self.total.playouts_per_sec
+
+    def choose_action(self, game: Game) -> Action | None:
+        if is_game_over(game):
+            return None
+        root = self.find_root(game)
+        stats = SearchStats(reused_visits=root.visits)
+        fallback = None  # played if the search adds no edge, e.g. with no iterations
+        if not root.edges:
+            fallback = root.next_untried(game, self.rng)
+            if fallback is None:
+                return None
+            root.buffer.append(fallback)
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else math.inf
+        while (self.iterations is None or stats.playouts < self.iterations) and time.perf_counter() < deadline:
+            self.playout(game, root)
+            stats.playouts += 1
+        stats.duration = time.perf_counter() - start
+
+        self.last_search = stats
+        self.total.playouts += stats.playouts
+        self.total.duration += stats.duration
+        self.total.reused_visits += stats.reused_visits
+
+        edge = root.best_edge()
+        self.root = root
+        return edge.action if edge is not None else fallback
+
+    def find_root(self, game: Game) -> Node:
+        # Reuse the part of the last tree that starts at the current state, if the search reached it
+        zobrist = game.zobrist
+        if self.reuse_tree and self.root is not None:
+            frontier = deque([self.root])
+            examined = 0
+            while frontier and examined < REUSE_SEARCH_LIMIT:
+                node = frontier.popleft()
+                examined += 1
+                if node.zobrist == zobrist:
+                    return node
+                for edge in node.edges.values():
+                    frontier.extend(edge.outcomes.values())
+        return Node(game)
+
+    def rollout_action(self, game: Game) -> Action | None:
+        if self.rollout_policy is not None:
+            return self.rollout_policy.choose_action(game)
+        return game.sample_legal_action(self.rng)
+
+    def playout(self, game: Game, root: Node) -> None:
+        deck_cards = game.deck.cards
+        rng_state = game.rng.getstate()
+        dice_key = game.dice.key
+        game.deck.cards = list(deck_cards)
+        self.rng.shuffle(game.deck.cards)
+        game.rng.seed(self.rng.getrandbits(64))
+        game.dice.key = self.rng.getrandbits(64)  # fresh battle rolls too; undo puts the counter back
+
+        records: list[UndoRecord] = []
+        path: list[tuple[Node, Edge]] = []
+        node = root
+        try:
+            # Selection and expansion
+            while not is_game_over(game):
+                action = None
+                if not node.exhausted and len(node.edges) < self.widening * math.sqrt(node.visits + 1):
+                    action = node.next_untried(game, self.rng)
+                if action is not None:
+                    edge = node.edges.setdefault(action_key(action, game), Edge(action))
+                elif node.edges:
+                    edge = node.select(self.exploration)
+                else:
+                    break
+                path.append((node, edge))
+                records.append(game.apply_action(edge.action, record_undo=True))
+
+                child = edge.outcomes.get(game.zobrist)
+                if child is None:
+                    edge.outcomes[game.zobrist] = Node(game)
+                    break
+                node = child
+
+            # Rollout
+            for _ in range(self.rollout_depth):
+                if is_game_over(game):
+                    break
+                action = self.rollout_action(game)
+                if action is None:
+                    break
+                records.append(game.apply_action(action, record_undo=True))
+
+            rewards = evaluate(game)
+        finally:
+            for record in reversed(records):
+                game.undo(record)
+            game.deck.cards = deck_cards
+            game.rng.setstate(rng_state)
+            game.dice.key = dice_key
+
+        # Backpropagation
+        for (node, edge) in path:
+            node.visits += 1
+            edge.visits += 1
+            edge.value += rewards[node.mover]
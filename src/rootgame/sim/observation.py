@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from rootgame.engine.board import AUTUMN_BOARD_SUITS, Token
+from rootgame.engine.building import BuildingType
+from rootgame.engine.card import AmbushCard, Card, DominanceCard, EffectCard, ItemCard
+from rootgame.engine.eyrie_dynasties import EyrieDynasties
+from rootgame.engine.game import Game
+from rootgame.engine.marquise_de_cat import MarquiseDeCat
+from rootgame.engine.types import DecreeOption, EyrieLeader, FactionName, Suit, TurnPhase
+
+# Fixed-shape numeric encoding of a Game for training value/policy models.
+#
+# An observation is a float32 vector of OBS_SIZE values, made of the named segments in LAYOUT (in
+# order). The clearings segment holds one CLEARING_SIZE block per clearing, laid out by
+# CLEARING_LAYOUT:
+#
+#   warriors    warriors per faction (FACTIONS order)
+#   buildings   count per (building type, owner, used), index (type * len(FACTIONS) + owner) * 2 + used
+#   tokens      count per (token, owner), index token * len(FACTIONS) + owner
+#   suit        one-hot over SUITS
+#   ruler       one-hot over FACTIONS, all zero when nobody rules
+#
+# followed by the global segments:
+#
+#   hands            per seat: count per (card type, suit), index type * len(SUITS) + suit, then hand size
+#   decree           per decree column: count per suit of the cards in it
+#   decree_resolved  per decree column: count per suit of the cards resolved this turn
+#   leader           one-hot over LEADERS (current Eyrie leader)
+#   used_leaders     flag per leader
+#   marquise_supply  warriors, wood, sawmills, workshops, recruiters left in supply
+#   eyrie_supply     warriors, roosts left in supply
+#   extra_draws      extra cards each faction draws in evening (FACTIONS order)
+#   extra_actions    Marquise actions gained this turn beyond the usual three
+#   score            VP per seat
+#   phase            one-hot over PHASES
+#   round            round number
+#   current_seat     one-hot, the seat to act
+#   viewer           one-hot, the seat the observation is for (all zero for the full view)
+#   deck             cards left in the deck
+#
+# Counts are raw, not normalized. A view for one seat hides the other seats' hands: only their hand
+# sizes are encoded.
+
+OBS_DTYPE = np.float32
+
+FACTIONS = (FactionName.MARQUISE_DE_CAT, FactionName.EYRIE_DYNASTIES)  # the factions the engine plays
+FACTION_INDEX = {faction: idx for (idx, faction) in enumerate(FACTIONS)}
+SUITS = tuple(Suit)
+SUIT_INDEX = {suit: idx for (idx, suit) in enumerate(SUITS)}
+BUILDING_TYPES = tuple(BuildingType)
+BUILDING_TYPE_INDEX = {building_type: idx for (idx, building_type) in enumerate(BUILDING_TYPES)}
+TOKENS = tuple(Token)
+CARD_TYPES = (EffectCard, ItemCard, DominanceCard, AmbushCard)
+CARD_TYPE_INDEX = {card_type: idx for (idx, card_type) in enumerate(CARD_TYPES)}
+DECREE_OPTIONS = tuple(DecreeOption)
+LEADERS = tuple(EyrieLeader)
+LEADER_INDEX = {leader: idx for (idx, leader) in enumerate(LEADERS)}
+PHASES = tuple(TurnPhase)
+PHASE_INDEX = {phase: idx for (idx, phase) in enumerate(PHASES)}
+
+NUM_SEATS = 2
+NUM_CLEARINGS = len(AUTUMN_BOARD_SUITS)
+
+
+def build_layout(fields: list[tuple[str, int]]) -> tuple[dict[str, slice], int]:
+    # Consecutive named segments; returns their slices and the total size
+    layout: dict[str, slice] = {}
+    offset = 0
+    for (name, size) in fields:
+        layout[name] = slice(offset, offset + size)
+        offset += size
+    return (layout, offset)
+
+
+# ----------------------------
+# Layout
+# ----------------------------
+
+(CLEARING_LAYOUT, CLEARING_SIZE) = build_layout([
+    ("warriors", len(FACTIONS)),
+    ("buildings", len(BUILDING_TYPES) * len(FACTIONS) * 2),
+    ("tokens", len(TOKENS) * len(FACTIONS)),
+    ("suit", len(SUITS)),
+    ("ruler", len(FACTIONS)),
+])
+
+HAND_SIZE = len(CARD_TYPES) * len(SUITS) + 1
+
+(LAYOUT, OBS_SIZE) = build_layout([
+    ("clearings", NUM_CLEARINGS * CLEARING_SIZE),
+    ("hands", NUM_SEATS * HAND_SIZE),
+    ("decree", len(DECREE_OPTIONS) * len(SUITS)),
+    ("decree_resolved", len(DECREE_OPTIONS) * len(SUITS)),
+    ("leader", len(LEADERS)),
+    ("used_leaders", len(LEADERS)),
+    ("marquise_supply", 5),
+    ("eyrie_supply", 2),
+    ("extra_draws", len(FACTIONS)),
+    ("extra_actions", 1),
+    ("score", NUM_SEATS),
+    ("phase", len(PHASES)),
+    ("round", 1),
+    ("current_seat", NUM_SEATS),
+    ("viewer", NUM_SEATS),
+    ("deck", 1),
+])
+
+# Offsets used by the encoder
+WARRIORS = CLEARING_LAYOUT["warriors"].start
+BUILDINGS = CLEARING_LAYOUT["buildings"].start
+TOKENS_AT = CLEARING_LAYOUT["tokens"].start
+RULER = CLEARING_LAYOUT["ruler"].start
+HANDS = LAYOUT["hands"].start
+DECREE = LAYOUT["decree"].start
+DECREE_RESOLVED = LAYOUT["decree_resolved"].start
+LEADER = LAYOUT["leader"].start
+USED_LEADERS = LAYOUT["used_leaders"].start
+MARQUISE_SUPPLY = LAYOUT["marquise_supply"].start
+EYRIE_SUPPLY = LAYOUT["eyrie_supply"].start
+EXTRA_DRAWS = LAYOUT["extra_draws"].start
+EXTRA_ACTIONS = LAYOUT["extra_actions"].start
+SCORE = LAYOUT["score"].start
+PHASE = LAYOUT["phase"].start
+ROUND = LAYOUT["round"].start
+CURRENT_SEAT = LAYOUT["current_seat"].start
+VIEWER = LAYOUT["viewer"].start
+DECK = LAYOUT["deck"].start
+
+
+def build_static_features() -> np.ndarray:
+    # Everything that never changes (clearing suits); each encode starts from a copy of this
+    static = np.zeros(OBS_SIZE, dtype=OBS_DTYPE)
+    for (clearing_id, suit) in enumerate(AUTUMN_BOARD_SUITS):
+        static[clearing_id * CLEARING_SIZE + CLEARING_LAYOUT["suit"].start + SUIT_INDEX[suit]] = 1
+    return static
+
+
+STATIC_FEATURES = build_static_features()
+
+
+# ----------------------------
+# Encoding
+# ----------------------------
+
+def encode_observation(game: Game, out: np.ndarray | None = None, viewer: int | None = None) -> np.ndarray:
+    """
+    Write `game` into `out` (a float32 vector of OBS_SIZE, allocated if not given) and return it.
+
+    With `viewer` set to a seat, the observation is what that seat may see: other seats' hands
+    are reduced to their sizes. Either board backend can be encoded.
+    """
+    if out is None:
+        out = np.empty(OBS_SIZE, dtype=OBS_DTYPE)
+    out[:] = STATIC_FEATURES
+
+    encode_board(game.board, out)
+
+    for player in game.players:
+        hidden = viewer is not None and player.seat != viewer
+        encode_hand(player.hand, out, HANDS + player.seat * HAND_SIZE, hidden)
+        out[SCORE + player.seat] = player.score
+
+        faction = player.faction
+        if isinstance(faction, MarquiseDeCat):
+            out[MARQUISE_SUPPLY] = faction.warrior_limit - faction.warriors_placed
+            out[MARQUISE_SUPPLY + 1] = faction.wood_limit - faction.wood_placed
+            out[MARQUISE_SUPPLY + 2] = faction.sawmill_limit - faction.sawmills_placed
+            out[MARQUISE_SUPPLY + 3] = faction.workshop_limit - faction.workshops_placed
+            out[MARQUISE_SUPPLY + 4] = faction.recruiter_limit - faction.recruiters_placed
+            out[EXTRA_ACTIONS] = faction.extra_actions_for_turn
+        elif isinstance(faction, EyrieDynasties):
+            encode_eyrie(faction, out)
+        out[EXTRA_DRAWS + FACTION_INDEX[faction.faction_name]] = faction.extra_cards_to_draw
+
+    out[PHASE + PHASE_INDEX[game.current_phase]] = 1
+    out[ROUND] = game.round
+    out[CURRENT_SEAT + game.current_player.seat] = 1
+    if viewer is not None:
+        out[VIEWER + viewer] = 1
+    out[DECK] = len(game.deck.cards)
+    return out
+
+
+def encode_board(board, out: np.ndarray) -> None:
+    for clearing_id in range(NUM_CLEARINGS):
+        base = clearing_id * CLEARING_SIZE
+        for (faction_idx, faction) in enumerate(FACTIONS):
+            warriors = board.get_warrior_count(clearing_id, faction)
+            if warriors:
+                out[base + WARRIORS + faction_idx] = warriors
+            for (token_idx, token) in enumerate(TOKENS):
+                tokens = board.get_token_count_at_clearing(clearing_id, token, faction)
+                if tokens:
+                    out[base + TOKENS_AT + token_idx * len(FACTIONS) + faction_idx] = tokens
+
+        for (building_type, owner, used) in board.get_buildings_at_clearing(clearing_id):
+            out[base + BUILDINGS + (BUILDING_TYPE_INDEX[building_type] * len(FACTIONS) + FACTION_INDEX[owner]) * 2 + used] += 1
+
+        ruler = board.get_clearing_ruler(clearing_id)
+        if ruler in FACTION_INDEX:
+            out[base + RULER + FACTION_INDEX[ruler]] = 1
+
+
+def encode_hand(hand: list[Card], out: np.ndarray, offset: int, hidden: bool) -> None:
+    if not hidden:
+        for card in hand:
+            out[offset + CARD_TYPE_INDEX[type(card)] * len(SUITS) + SUIT_INDEX[card.suit]] += 1
+    out[offset + HAND_SIZE - 1] = len(hand)
+
+
+def encode_eyrie(faction: EyrieDynasties, out: np.ndarray) -> None:
+    for (option_idx, option) in enumerate(DECREE_OPTIONS):
+        for card in faction.decree.get(option, ()):
+            out[DECREE + option_idx * len(SUITS) + SUIT_INDEX[card.suit]] += 1
+        for card in faction.decree_actions_taken.get(option, ()):
+            out[DECREE_RESOLVED + option_idx * len(SUITS) + SUIT_INDEX[card.suit]] += 1
+    if faction.leader is not None:
+        out[LEADER + LEADER_INDEX[faction.leader]] = 1
+    for leader in faction.used_leaders:
+        out[USED_LEADERS + LEADER_INDEX[leader]] = 1
+    out[EYRIE_SUPPLY] = faction.warrior_limit - faction.warriors_placed
+    out[EYRIE_SUPPLY + 1] = faction.roost_limit - faction.roosts_placed
+
+
+def encode_batch(games: Sequence[Game], out: np.ndarray, viewers: Sequence[int | None] | None = None) -> np.ndarray:
+    """
+    Fill row i of `out` (shape (len(games), OBS_SIZE)) from games[i], as seen by viewers[i] if given.
+
+    Nothing is allocated per call, so one buffer can be reused across the steps of a batch.
+    """
+    for (idx, game) in enumerate(games):
+        encode_observation(game, out[idx], viewers[idx] if viewers is not None else None)
+    return out
+
+
+def encode_player_views(game: Game, out: np.ndarray | None = None) -> np.ndarray:
+    # Row s is the observation for seat s
+    if out is None:
+        out = np.empty((len(game.players), OBS_SIZE), dtype=OBS_DTYPE)
+    for player in game.players:
+        encode_observation(game, out[player.seat], viewer=player.seat)
+    return out
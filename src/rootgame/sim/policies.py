@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+from typing import Protocol
+
+from rootgame.engine.game import Game
+from rootgame.engine.actions import Action, EndPhaseAction
+from rootgame.sim.mcts import MCTSPlayer
+
+
+class Policy(Protocol):
+    """Chooses the next action for the current player of a game."""
+
+    def choose_action(self, game: Game) -> Action | None:
+        ...
+
+
+def legal_actions(game: Game) -> list[Action]:
+    return list(game.iter_legal_actions())
+
+
+# ----------------------------
+# Policies
+# ----------------------------
+
+class RandomPolicy:
+    """Picks uniformly among the legal actions."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.rng = random.Random(seed)
+
+    def choose_action(self, game: Game) -> Action | None:
+        actions = legal_actions(game)
+        if not actions:
+            return None
+        return self.rng.choice(actions)
+
+
+class FirstLegalPolicy:
+    """Plays the first legal action found, preferring anything over ending the phase."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        pass
+
+    def choose_action(self, game: Game) -> Action | None:
+        fallback = None
+        for action in game.iter_legal_actions():
+            if not isinstance(action, EndPhaseAction):
+                return action
+            fallback = action
+        return fallback
+
+
+POLICIES: dict[str, type] = {
+    "random": RandomPolicy,
+    "first": FirstLegalPolicy,
+    "mcts": MCTSPlayer,
+}
+
+
+def make_policy(name: str, seed: int | None = None) -> Policy:
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy '{name}'. Choose from: {', '.join(sorted(POLICIES))}")
+    return POLICIES[name](seed=seed)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+from rootgame.engine.binary_log import GameLogWriter
+from rootgame.engine.game import Game
+from rootgame.engine.rng import derive_seed, game_seed
+from rootgame.engine.types import WINNING_SCORE
+from rootgame.sim.policies import POLICIES, make_policy
+
+RECORD_CHECKPOINT_EVERY = 64
+
+
+@dataclass
+class GameResult:
+    game_index: int
+    seed: int
+    scores: dict[str, int] = field(default_factory=dict)
+    winner: str | None = None
+    rounds: int = 0
+    actions: int = 0
+    end_reason: str = ""
+    duration: float = 0.0
+
+
+@dataclass
+class SimulationReport:
+    results: list[GameResult] = field(default_factory=list)
+    workers: int = 1
+    wall_time: float = 0.0
+
+    @property
+    def total_actions(self) -> int:
+        return sum(result.actions for result in self.results)
+
+    @property
+    def games_per_sec(self) -> float:
+        return len(self.results) / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def actions_per_sec(self) -> float:
+        return self.total_actions / self.wall_time if self.wall_time else 0.0
+
+    def wins_by_faction(self) -> dict[str, int]:
+        wins: dict[str, int] = {}
+        for result in self.results:
+            key = result.winner or "draw"
+            wins[key] = wins.get(key, 0) + 1
+        return wins
+
+
+# ----------------------------
+# Single game
+# ----------------------------
+
+def play_game(game_index: int, seed: int, policy_names: tuple[str, ...], max_rounds: int, max_actions: int, record_dir: str | None = None) -> GameResult:
+    """
+    Play one game to completion with the given policies (one per player, in seat order).
+
+    The game and each policy get their own RNG stream derived from `seed`, so the game can be
+    replayed from the seed alone, whichever process or worker plays it. With `record_dir`, the
+    game is also written there as a binary log (see rootgame.engine.replay to verify it).
+    """
+    result = GameResult(game_index=game_index, seed=seed)
+    start = time.perf_counter()
+
+    game = Game(seed=seed)
+    policies = [make_policy(name, seed=derive_seed(seed, seat)) for (seat, name) in enumerate(policy_names)]
+
+    log_file = None
+    log_writer = None
+    if record_dir:
+        log_file = open(os.path.join(record_dir, f"game-{game_index:05d}.rgl"), "wb")
+        log_writer = GameLogWriter(log_file, game, checkpoint_every=RECORD_CHECKPOINT_EVERY)
+
+    while True:
+        if any(player.score >= WINNING_SCORE for player in game.players):
+            result.end_reason = "score"
+            break
+        if game.round >= max_rounds:
+            result.end_reason = "round_limit"
+            break
+        if not game.deck.cards:
+            result.end_reason = "deck_exhausted"
+            break
+        if result.actions >= max_actions:
+            result.end_reason = "action_limit"
+            break
+
+        seat = game.players.index(game.current_player)
+        action = policies[seat].choose_action(game)
+        if action is None:
+            result.end_reason = "no_legal_action"
+            break
+
+        game.apply_action(action)
+        result.actions += 1
+        if log_writer:
+            log_writer.write_action(action)
+
+    if log_writer:
+        log_writer.close()
+        log_file.close()
+
+    result.duration = time.perf_counter() - start
+    result.rounds = game.round
+    result.scores = {player.faction.faction_name.value: player.score for player in game.players}
+
+    best = max(result.scores.values())
+    leaders = [name for (name, score) in result.scores.items() if score == best]
+    result.winner = leaders[0] if len(leaders) == 1 else None
+    return result
+
+
+def _play_game_args(args: tuple) -> GameResult:
+    return play_game(*args)
+
+
+# ----------------------------
+# Parallel driver
+# ----------------------------
+
+def run_jobs(fn, jobs: list, workers: int, on_result=None, chunksize: int = 1) -> list:
+    """
+    fn(job) for each job, in order: in this process with one worker, otherwise across a process pool.
+
+    `on_result` is called with each result as soon as it is available.
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        for result in executor.map(fn, jobs, chunksize=chunksize) if executor is not None else map(fn, jobs):
+            results.append(result)
+            if on_result:
+                on_result(result)
+    return results
+
+
+def run_simulations(
+    num_games: int,
+    policy_names: tuple[str, ...] = ("random", "random"),
+    workers: int | None = None,
+    seed: int = 0,
+    max_rounds: int = 40,
+    max_actions: int = 5000,
+    record_dir: str | None = None,
+    on_result=None,
+) -> SimulationReport:
+    """
+    Play `num_games` games across a process pool (one worker per core by default).
+
+    `on_result` is called with each GameResult as soon as it is available.
+    """
+    workers = workers or os.cpu_count() or 1
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    jobs = [(idx, game_seed(seed, idx), tuple(policy_names), max_rounds, max_actions, record_dir) for idx in range(num_games)]
+    report = SimulationReport(workers=workers)
+
+    start = time.perf_counter()
+    report.results = run_jobs(_play_game_args, jobs, workers, on_result, chunksize=max(1, num_games // (workers * 8)))
+    report.wall_time = time.perf_counter() - start
+
+    return report
+
+
+def format_result(result: GameResult) -> str:
+    scores = " ".join(f"{name}={score}" for (name, score) in result.scores.items())
+    return (f"game {result.game_index:>5} seed={result.seed} winner={result.winner or 'draw'} "
+            f"{scores} rounds={result.rounds} actions={result.actions} "
+            f"end={result.end_reason} time={result.duration * 1000:.1f}ms")
+
+
+def format_report(report: SimulationReport) -> str:
+    wins = ", ".join(f"{name}: {count}" for (name, count) in sorted(report.wins_by_faction().items()))
+    return "\n".join([
+        f"Games:       {len(report.results)} on {report.workers} worker(s)",
+        f"Wall time:   {report.wall_time:.2f}s",
+        f"Games/sec:   {report.games_per_sec:.2f}",
+        f"Actions/sec: {report.actions_per_sec:.1f}",
+        f"Wins:        {wins}",
+    ])
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="rootgame-sim", description="Run headless self-play games in parallel.")
+    parser.add_argument("-n", "--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i is seeded deterministically from it")
+    parser.add_argument("--marquise", choices=sorted(POLICIES), default="random", help="policy for the Marquise de Cat")
+    parser.add_argument("--eyrie", choices=sorted(POLICIES), default="random", help="policy for the Eyrie Dynasties")
+    parser.add_argument("--max-rounds", type=int, default=40, help="end a game after this many turns")
+    parser.add_argument("--max-actions", type=int, default=5000, help="end a game after this many actions")
+    parser.add_argument("--record", metavar="DIR", default=None, help="write each game to DIR as a binary log")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    on_result = None if args.quiet else (lambda result: print(format_result(result), flush=True))
+    report = run_simulations(
+        num_games=args.games,
+        policy_names=(args.marquise, args.eyrie),
+        workers=args.workers,
+        seed=args.seed,
+        max_rounds=args.max_rounds,
+        max_actions=args.max_actions,
+        record_dir=args.record,
+        on_result=on_result,
+    )
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
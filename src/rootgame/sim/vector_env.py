@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import multiprocessing
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Protocol, Sequence
+
+import numpy as np
+
+from rootgame.engine.actions import Action
+from rootgame.engine.game import Game
+from rootgame.engine.rng import derive_seed
+from rootgame.engine.types import WINNING_SCORE
+from rootgame.sim.action_space import DiscreteActionSpace
+from rootgame.sim.observation import NUM_SEATS, OBS_DTYPE, OBS_SIZE, encode_observation
+
+DEFAULT_ACTION_SLOTS = 256
+DEFAULT_MAX_ROUNDS = 40
+DEFAULT_MAX_ACTIONS = 5000
+
+
+# ----------------------------
+# Action spaces
+# ----------------------------
+
+class ActionSpace(Protocol):
+    """Maps action indices to engine actions for one game at a time."""
+    size: int
+
+    def fill_mask(self, game: Game, mask: np.ndarray) -> object:
+        # Set mask[i] for every legal index; the return value is handed back to decode
+        ...
+
+    def decode(self, game: Game, index: int, legal: object) -> Action | None:
+        ...
+
+
+class LegalListActionSpace:
+    """
+    Index i is the i-th legal action in the engine's own enumeration order, for the first `size` of them.
+
+    Cheap and always exact, but an index means something different in every state, and actions
+    enumerated after the first `size` (late marches, mostly) can't be chosen.
+    """
+
+    def __init__(self, size: int = DEFAULT_ACTION_SLOTS) -> None:
+        self.size = size
+
+    def fill_mask(self, game: Game, mask: np.ndarray) -> list[Action]:
+        actions = list(islice(game.iter_legal_actions(), self.size))
+        mask[:] = False
+        mask[:len(actions)] = True
+        return actions
+
+    def decode(self, game: Game, index: int, legal: list[Action]) -> Action | None:
+        return legal[index] if 0 <= index < len(legal) else None
+
+
+# ----------------------------
+# In-process environment
+# ----------------------------
+
+@dataclass
+class EnvBuffers:
+    """The arrays a VectorEnv writes each step; row i belongs to game i."""
+    obs: np.ndarray      # (N, OBS_SIZE) float32, from the point of view of the seat to act
+    rewards: np.ndarray  # (N, NUM_SEATS) float32, VP each seat gained this step
+    dones: np.ndarray    # (N,) bool, the game ended this step (and was replaced by a new one)
+    masks: np.ndarray    # (N, action space size) bool, legal actions for the seat to act
+
+    @classmethod
+    def allocate(cls, num_games: int, action_size: int) -> EnvBuffers:
+        return cls(
+            obs=np.zeros((num_games, OBS_SIZE), dtype=OBS_DTYPE),
+            rewards=np.zeros((num_games, NUM_SEATS), dtype=np.float32),
+            dones=np.zeros(num_games, dtype=bool),
+            masks=np.zeros((num_games, action_size), dtype=bool),
+        )
+
+
+def check_actions(actions: Sequence[int] | np.ndarray, masks: np.ndarray, index_offset: int = 0) -> np.ndarray:
+    # Every game's index against its mask, before any game is stepped, so a bad batch changes nothing
+    indices = np.asarray(actions)
+    if indices.shape != (len(masks),):
+        raise ValueError(f"Expected {len(masks)} action indices, got shape {indices.shape}")
+    in_range = (indices >= 0) & (indices < masks.shape[1])
+    legal = in_range.copy()
+    legal[in_range] = masks[np.flatnonzero(in_range), indices[in_range]]
+    if not legal.all():
+        idx = int(np.flatnonzero(~legal)[0])
+        raise ValueError(f"Action index {indices[idx]} is not legal in game {index_offset + idx}")
+    return indices
+
+
+def is_finished(game: Game, steps: int, max_rounds: int, max_actions: int) -> bool:
+    # Same end conditions as the simulation runner
+    return (any(player.score >= WINNING_SCORE for player in game.players) or not game.deck.cards
+            or game.round >= max_rounds or steps >= max_actions)
+
+
+class VectorEnv:
+    """
+    N games stepped in lockstep from an array of action indices, one per game.
+
+    step() applies each game's action for the seat to act, replaces finished games with fresh
+    ones (seeded from `seed`, the game's index and its episode count) and returns the stacked
+    observations, rewards, done flags and legal-action masks. Indices are in the fixed action
+    space of action_space.py unless another `action_space` is given. The returned arrays are
+    reused by the next step; copy them to keep them. If any index is illegal, step() raises
+    before stepping any game.
+
+    Masks take one bool per game per index: with the fixed space (ACTION_SPACE_SIZE, about 48k
+    indices) that is ~48 KB a game, ~196 MB at N=4096 (in shared memory for ShardedVectorEnv).
+    For large N, LegalListActionSpace needs only DEFAULT_ACTION_SLOTS bools a game.
+    """
+
+    def __init__(
+        self,
+        num_games: int,
+        seed: int = 0,
+        action_space: ActionSpace | None = None,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        max_actions: int = DEFAULT_MAX_ACTIONS,
+        board_factory: Callable | None = None,
+        index_offset: int = 0,
+        buffers: EnvBuffers | None = None,
+    ) -> None:
+        self.num_games = num_games
+        self.seed = seed
+        self.action_space = action_space if action_space is not None else DiscreteActionSpace()
+        self.max_rounds = max_rounds
+        self.max_actions = max_actions
+        self.board_factory = board_factory
+        self.index_offset = index_offset  # global index of game 0, so shards seed like one env
+        self.buffers = buffers if buffers is not None else EnvBuffers.allocate(num_games, self.action_space.size)
+
+        self.games: list[Game] = []
+        self.episodes = [0] * num_games
+        self.steps = [0] * num_games
+        self.legal: list[object] = [None] * num_games
+
+    def new_game(self, idx: int) -> Game:
+        seed = derive_seed(self.seed, self.index_offset + idx, self.episodes[idx])
+        board = self.board_factory() if self.board_factory is not None else None
+        return Game(board=board, seed=seed)
+
+    def observe(self, idx: int) -> None:
+        game = self.games[idx]
+        encode_observation(game, self.buffers.obs[idx], viewer=game.current_player.seat)
+        self.legal[idx] = self.action_space.fill_mask(game, self.buffers.masks[idx])
+
+    def reset(self) -> tuple[np.ndarray, np.ndarray]:
+        self.games = [self.new_game(idx) for idx in range(self.num_games)]
+        self.steps = [0] * self.num_games
+        for idx in range(self.num_games):
+            self.observe(idx)
+        self.buffers.rewards[:] = 0
+        self.buffers.dones[:] = False
+        return (self.buffers.obs, self.buffers.masks)
+
+    def step(self, actions: Sequence[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        buffers = self.buffers
+        rewards = buffers.rewards
+        indices = check_actions(actions, buffers.masks, self.index_offset)
+        decoded = [self.action_space.decode(game, index, legal) for (game, index, legal) in zip(self.games, indices.tolist(), self.legal)]
+        if None in decoded:
+            idx = decoded.index(None)
+            raise ValueError(f"Action index {indices[idx]} is not legal in game {self.index_offset + idx}")
+        for (idx, action) in enumerate(decoded):
+            game = self.games[idx]
+
+            before = [player.score for player in game.players]
+            game.apply_action(action)
+            self.steps[idx] += 1
+            for player in game.players:
+                rewards[idx, player.seat] = player.score - before[player.seat]
+
+            done = is_finished(game, self.steps[idx], self.max_rounds, self.max_actions)
+            if not done:
+                self.observe(idx)
+                done = not buffers.masks[idx].any()
+            if done:
+                self.episodes[idx] += 1
+                self.steps[idx] = 0
+                self.games[idx] = self.new_game(idx)
+                self.observe(idx)
+            buffers.dones[idx] = done
+        return (buffers.obs, rewards, buffers.dones, buffers.masks)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> VectorEnv:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ----------------------------
+# Sharded across processes
+# ----------------------------
+
+BUFFER_FIELDS = ("obs", "rewards", "dones", "masks", "actions")
+
+
+def shared_array(shape: tuple[int, ...], dtype, name: str | None = None) -> tuple[SharedMemory, np.ndarray]:
+    if name is None:
+        shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+    else:
+        shm = SharedMemory(name=name)
+    return (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def shard_worker(conn, specs: dict, start: int, stop: int, env_kwargs: dict) -> None:
+    # Runs a VectorEnv over games [start, stop) that writes straight into the shared buffers
+    arrays = {}
+    segments = []
+    for field in BUFFER_FIELDS:
+        (name, shape, dtype) = specs[field]
+        (shm, array) = shared_array(shape, dtype, name)
+        segments.append(shm)
+        arrays[field] = array[start:stop]
+    buffers = EnvBuffers(arrays["obs"], arrays["rewards"], arrays["dones"], arrays["masks"])
+    env = VectorEnv(stop - start, index_offset=start, buffers=buffers, **env_kwargs)
+    try:
+        while True:
+            command = conn.recv()
+            if command == "close":
+                break
+            try:
+                if command == "reset":
+                    env.reset()
+                elif command == "step":
+                    env.step(arrays["actions"])
+                conn.send(None)
+            except Exception as error:
+                conn.send(error)
+    finally:
+        del arrays, array, buffers, env
+        for shm in segments:
+            shm.close()
+
+
+class ShardedVectorEnv:
+    """
+    VectorEnv split over `num_workers` processes, each stepping a contiguous shard of the games.
+
+    Actions, observations, rewards, dones and masks live in shared memory, so a step only sends
+    a short command to each worker. Game i is seeded exactly as in a single VectorEnv.
+    """
+
+    def __init__(self, num_games: int, num_workers: int, seed: int = 0, action_space: ActionSpace | None = None, **env_kwargs) -> None:
+        action_space = action_space if action_space is not None else DiscreteActionSpace()
+        env_kwargs = dict(env_kwargs, seed=seed, action_space=action_space)
+        self.num_games = num_games
+        shapes = {
+            "obs": ((num_games, OBS_SIZE), OBS_DTYPE),
+            "rewards": ((num_games, NUM_SEATS), np.float32),
+            "dones": ((num_games,), bool),
+            "masks": ((num_games, action_space.size), bool),
+            "actions": ((num_games,), np.int64),
+        }
+        self.segments: list[SharedMemory] = []
+        self.arrays: dict[str, np.ndarray] = {}
+        specs = {}
+        for (field, (shape, dtype)) in shapes.items():
+            (shm, array) = shared_array(shape, dtype)
+            self.segments.append(shm)
+            self.arrays[field] = array
+            specs[field] = (shm.name, shape, dtype)
+
+        num_workers = max(1, min(num_workers, num_games))
+        bounds = [num_games * worker // num_workers for worker in range(num_workers + 1)]
+        self.connections = []
+        self.workers = []
+        for worker in range(num_workers):
+            (parent, child) = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=shard_worker, args=(child, specs, bounds[worker], bounds[worker + 1], env_kwargs), daemon=True)
+            process.start()
+            self.connections.append(parent)
+            self.workers.append(process)
+
+    def broadcast(self, command: str) -> None:
+        for conn in self.connections:
+            conn.send(command)
+        errors = [conn.recv() for conn in self.connections]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def reset(self) -> tuple[np.ndarray, np.ndarray]:
+        self.broadcast("reset")
+        return (self.arrays["obs"], self.arrays["masks"])
+
+    def step(self, actions: Sequence[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Checked here rather than per shard, so one bad index doesn't leave the other shards stepped
+        self.arrays["actions"][:] = check_actions(actions, self.arrays["masks"])
+        self.broadcast("step")
+        return (self.arrays["obs"], self.arrays["rewards"], self.arrays["dones"], self.arrays["masks"])
+
+    def close(self) -> None:
+        for conn in self.connections:
+            conn.send("close")
+        for process in self.workers:
+            process.join()
+        self.connections = []
+        self.workers = []
+        self.arrays = {}
+        for shm in self.segments:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # the caller still holds arrays from the last step; the mapping goes when they do
+            shm.unlink()
+        self.segments = []
+
+    def __enter__(self) -> ShardedVectorEnv:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def make_vector_env(num_games: int, num_workers: int = 1, **kwargs) -> VectorEnv | ShardedVectorEnv:
+    # In-process for one worker, sharded otherwise
+    if num_workers <= 1:
+        return VectorEnv(num_games, **kwargs)
+    return ShardedVectorEnv(num_games, num_workers, **kwargs)